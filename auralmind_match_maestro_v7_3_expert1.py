@@ -60,14 +60,27 @@ Notes
 from __future__ import annotations
 
 import argparse
+import cProfile
+import dataclasses
+import hashlib
 import json
 import logging
 import math
+import multiprocessing
 import os
+import re
+import shutil
+import sys
+import threading
 import time
+import tracemalloc
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, replace
 from functools import lru_cache
-from typing import Optional, Tuple, Dict, Any, Union
+from typing import Optional, Tuple, Dict, Any, Iterator, List, Union
 
 import numpy as np
 import scipy
@@ -85,6 +98,11 @@ try:
 except Exception:
     _HAS_DEMUCS = False
 
+try:
+    import resource  # POSIX only; used as a peak-RSS fallback when /proc is unavailable
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
 
 sci = scipy.ndimage
 
@@ -125,7 +143,261 @@ def next_pow2(n: int) -> int:
 # Module logger + FIR spectrum cache
 # ------------------------------------
 log = logging.getLogger("auralmind")
-_FIR_CACHE: Dict[tuple, np.ndarray] = {}
+# LRU-bounded: a batch worker renders many files, each with its own match-EQ FIR.
+_FIR_CACHE: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+_FIR_CACHE_MAX_ENTRIES = 16
+_FIR_CACHE_STATS: Dict[str, int] = {"hits": 0, "misses": 0}
+_CHECKPOINT_STATS: Dict[str, int] = {"hits": 0, "misses": 0}
+
+# ------------------------------------
+# Structured progress channel
+# ------------------------------------
+
+class ProgressChannel:
+    """
+    Machine-readable progress events, one JSON object per line.
+
+    The channel is a no-op until `open()` is given a file descriptor (the
+    backend passes the write end of a pipe via --progress-fd), so library use
+    of `master()` and plain CLI runs are unaffected.
+    """
+
+    def __init__(self) -> None:
+        self._stream = None
+        self._t0 = time.time()
+
+    def open(self, fd: Optional[int]) -> None:
+        if fd is None:
+            return
+        self._stream = os.fdopen(int(fd), "w", buffering=1, encoding="utf-8")
+        self._t0 = time.time()
+
+    def emit(self, event: str, **fields: Any) -> None:
+        if self._stream is None:
+            return
+        payload = {"event": event, "t": round(time.time() - self._t0, 4), **fields}
+        try:
+            self._stream.write(json.dumps(payload) + "\n")
+        except (OSError, ValueError):
+            # Reader went away: progress is advisory and must never fail a render.
+            self._stream = None
+
+    def detach(self) -> None:
+        """Forget the stream without closing it: forked workers must not write to the parent's channel."""
+        self._stream = None
+
+    @contextmanager
+    def muted(self) -> Iterator[None]:
+        """Drop events inside the block (nested renders whose progress the caller reports itself)."""
+        stream, self._stream = self._stream, None
+        try:
+            yield
+        finally:
+            self._stream = stream
+
+
+_PROGRESS = ProgressChannel()
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process (Linux /proc, else lifetime peak from getrusage)."""
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is not None:
+        peak = int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+        # Linux reports kilobytes, macOS bytes.
+        return peak if sys.platform == "darwin" else peak * 1024
+    return None
+
+
+class RssSampler:
+    """
+    Background thread tracking the peak RSS since the last `reset()`.
+    Stage-level peaks need sampling because the kernel only keeps one
+    lifetime high-water mark per process.
+    """
+
+    def __init__(self, interval_s: float = 0.05) -> None:
+        self.interval_s = float(interval_s)
+        self._peak = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        rss = current_rss_bytes() or 0
+        with self._lock:
+            self._peak = max(self._peak, rss)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self._sample()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._peak = 0
+        self._sample()
+
+    def peak(self) -> int:
+        self._sample()
+        with self._lock:
+            return self._peak
+
+
+class StageProfiler:
+    """
+    Opt-in per-stage profiling (--profile DIR). cProfile gives deterministic
+    call statistics, a stack sampler thread produces stage-rooted collapsed
+    stacks for flame graphs, and tracemalloc records the peak traced
+    allocation plus the top allocation sites of every stage. All three slow
+    the render down, so this is meant for diagnosing one pathological input.
+    """
+
+    PSTATS_NAME = "profile.pstats"
+    COLLAPSED_NAME = "profile.collapsed"
+    MEMORY_NAME = "profile_memory.json"
+
+    def __init__(self, out_dir: str, sample_interval_s: float = 0.005, top_allocations: int = 10) -> None:
+        self.out_dir = out_dir
+        self.sample_interval_s = float(sample_interval_s)
+        self.top_allocations = int(top_allocations)
+        self._profile = cProfile.Profile()
+        self._stacks: Dict[str, int] = {}
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._stage: Optional[str] = None
+        self._target_thread = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample_stacks(self) -> None:
+        while not self._stop.wait(self.sample_interval_s):
+            stage = self._stage
+            frame = sys._current_frames().get(self._target_thread)
+            if stage is None or frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            key = ";".join([stage] + names[::-1])
+            self._stacks[key] = self._stacks.get(key, 0) + 1
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        self._target_thread = threading.get_ident()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._sample_stacks, name="stack-sampler", daemon=True)
+            self._thread.start()
+        self._stage = name
+        self._profile.enable()
+        try:
+            yield
+        finally:
+            self._profile.disable()
+            self._stage = None
+            _, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics("lineno")[: self.top_allocations]
+            entry = self._memory.setdefault(name, {"peak_traced_bytes": 0, "top_allocations": []})
+            if peak - base >= entry["peak_traced_bytes"]:
+                entry["peak_traced_bytes"] = int(max(0, peak - base))
+                entry["top_allocations"] = [
+                    {"site": f"{s.traceback[0].filename}:{s.traceback[0].lineno}", "bytes": int(s.size), "blocks": int(s.count)}
+                    for s in top
+                ]
+
+    def write(self) -> Dict[str, str]:
+        """Stop sampling and write pstats, collapsed stacks and the memory summary."""
+        self._stop.set()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        os.makedirs(self.out_dir, exist_ok=True)
+        paths = {
+            "pstats": os.path.join(self.out_dir, self.PSTATS_NAME),
+            "collapsed": os.path.join(self.out_dir, self.COLLAPSED_NAME),
+            "memory": os.path.join(self.out_dir, self.MEMORY_NAME),
+        }
+        self._profile.dump_stats(paths["pstats"])
+        with open(paths["collapsed"], "w", encoding="utf-8") as f:
+            for stack, count in sorted(self._stacks.items()):
+                f.write(f"{stack} {count}\n")
+        with open(paths["memory"], "w", encoding="utf-8") as f:
+            json.dump(self._memory, f, indent=2)
+        log.info("[profile] wrote %s", ", ".join(paths.values()))
+        return paths
+
+
+class StageClock:
+    """
+    Per-stage bookkeeping that also drives the progress channel: wall time,
+    process CPU time (all threads, so BLAS/FFT workers count), peak RSS and
+    peak allocation (peak RSS above the RSS on entry to the stage).
+    """
+
+    def __init__(self, channel: ProgressChannel = _PROGRESS, profiler: Optional[StageProfiler] = None) -> None:
+        self.channel = channel
+        self.profiler = profiler
+        self.timings: Dict[str, float] = {}
+        self.cpu: Dict[str, float] = {}
+        self.peak_rss: Dict[str, int] = {}
+        self.peak_alloc: Dict[str, int] = {}
+        self._sampler = RssSampler()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        self.channel.emit("stage", stage=name, fraction=0.0)
+        self._sampler.start()
+        self._sampler.reset()
+        base = current_rss_bytes() or 0
+        t = time.time()
+        c = time.process_time()
+        with self.profiler.stage(name) if self.profiler is not None else nullcontext():
+            yield
+        dt = time.time() - t
+        dc = time.process_time() - c
+        peak = self._sampler.peak()
+        alloc = max(0, peak - base)
+        self.timings[name] = self.timings.get(name, 0.0) + dt
+        self.cpu[name] = self.cpu.get(name, 0.0) + dc
+        self.peak_rss[name] = max(self.peak_rss.get(name, 0), peak)
+        self.peak_alloc[name] = max(self.peak_alloc.get(name, 0), alloc)
+        self.channel.emit("stage", stage=name, fraction=1.0, stage_seconds=round(dt, 4),
+                          cpu_seconds=round(dc, 4), peak_rss_bytes=peak, peak_alloc_bytes=alloc)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage figures in execution order, as written to the report's `timings.stages`."""
+        return {
+            name: {
+                "wall_s": round(float(wall), 4),
+                "cpu_s": round(float(self.cpu.get(name, 0.0)), 4),
+                "peak_rss_bytes": int(self.peak_rss.get(name, 0)),
+                "peak_alloc_bytes": int(self.peak_alloc.get(name, 0)),
+            }
+            for name, wall in self.timings.items()
+        }
+
+    def close(self) -> None:
+        self._sampler.stop()
+
+    def progress(self, name: str, fraction: float, **fields: Any) -> None:
+        self.channel.emit("stage", stage=name, fraction=round(clamp(fraction, 0.0, 1.0), 4), **fields)
 
 def smoothstep(x: float, lo: float, hi: float) -> float:
     """0..1 smooth curve between lo and hi."""
@@ -280,6 +552,18 @@ def _k_weighting_filter_cached(sr: int):
 def k_weighting_filter(sr: int):
     return _k_weighting_filter_cached(int(sr))
 
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hit/miss counters for the filter-design, FIR spectrum and stage checkpoint caches (process lifetime)."""
+    stats = {"fir_spectrum": dict(_FIR_CACHE_STATS), "checkpoint": dict(_CHECKPOINT_STATS)}
+    for name, fn in (
+        ("butter_highpass", _butter_highpass_cached),
+        ("butter_bandpass", _butter_bandpass_cached),
+        ("k_weighting", _k_weighting_filter_cached),
+    ):
+        info = fn.cache_info()
+        stats[name] = {"hits": int(info.hits), "misses": int(info.misses)}
+    return stats
+
 def integrated_loudness_lufs(y: np.ndarray, sr: int) -> float:
     """
     Approx integrated loudness:
@@ -1019,8 +1303,14 @@ def apply_fir_streaming_overlap_save(
     key = (taps, N, round(fir_mean, 12), round(fir_rms, 12))
     H = _FIR_CACHE.get(key)
     if H is None:
+        _FIR_CACHE_STATS["misses"] += 1
         H = np.fft.rfft(fir, n=N).astype(np.complex64)
         _FIR_CACHE[key] = H
+        while len(_FIR_CACHE) > _FIR_CACHE_MAX_ENTRIES:
+            _FIR_CACHE.popitem(last=False)
+    else:
+        _FIR_CACHE_STATS["hits"] += 1
+        _FIR_CACHE.move_to_end(key)
 
     out = np.zeros((n, ch), dtype=np.float32)
 
@@ -1100,25 +1390,39 @@ def build_target_curve(freqs: np.ndarray) -> np.ndarray:
 
     return eq
 
+MATCH_EQ_NFFT = 8192
+MATCH_EQ_HOP = 2048
+
+
+def reference_mid_spectrum(reference: np.ndarray) -> np.ndarray:
+    """Average MID magnitude spectrum of a reference, as match_eq_curve measures it."""
+    mid_r, _ = mid_side_encode(ensure_stereo(reference))
+    return windowed_fft_mag(mid_r, n_fft=MATCH_EQ_NFFT, hop=MATCH_EQ_HOP)
+
+
 def match_eq_curve(reference: Optional[np.ndarray], target: np.ndarray, sr: int,
                    max_eq_db: float, eq_smooth_hz: float,
-                   match_strength: float, hi_factor: float) -> Tuple[np.ndarray, np.ndarray]:
+                   match_strength: float, hi_factor: float,
+                   *, reference_mag: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
     """
     Build an EQ delta curve in dB across rfft bins.
     If reference is None: curve-based target (translation curve).
+    `reference_mag` (from a reference profile) stands in for the reference audio.
     """
     target = ensure_stereo(target)
     mid_t, _ = mid_side_encode(target)
-    n_fft = 8192
-    hop = 2048
+    n_fft = MATCH_EQ_NFFT
+    hop = MATCH_EQ_HOP
     mag_t = windowed_fft_mag(mid_t, n_fft=n_fft, hop=hop) + 1e-9
 
     freqs = np.fft.rfftfreq(n_fft, 1.0/sr).astype(np.float32)
 
-    if reference is not None:
-        reference = ensure_stereo(reference)
-        mid_r, _ = mid_side_encode(reference)
-        mag_r = windowed_fft_mag(mid_r, n_fft=n_fft, hop=hop) + 1e-9
+    if reference_mag is None and reference is not None:
+        reference_mag = reference_mid_spectrum(reference)
+    if reference_mag is not None:
+        if reference_mag.shape != mag_t.shape:
+            raise ValueError(f"reference spectrum has {reference_mag.shape[0]} bins, expected {mag_t.shape[0]}")
+        mag_r = reference_mag.astype(np.float32, copy=False) + 1e-9
         delta_db = 20.0 * np.log10(mag_r) - 20.0 * np.log10(mag_t)
     else:
         # Want to steer target toward a translation curve (relative to current)
@@ -1953,6 +2257,9 @@ class Preset:
     governor_gr_limit_db: float = -1.2  # if min gain is <= -1.2 dB, back off target_lufs by step
     governor_step_db: float = -0.6      # reduce loudness target by 0.6 dB per iteration
 
+    # Loudness normalization only: safety HPF, governor, TP limiter and export, streamed (normalize()).
+    normalize_only: bool = False
+
 def get_presets() -> Dict[str, Preset]:
     return {
         "hi_fi_streaming": Preset(
@@ -2087,6 +2394,25 @@ def get_presets() -> Dict[str, Preset]:
             hooklift_mix=0.20,
             governor_gr_limit_db=-1.3,
         ),
+        "normalize": Preset(
+            name="normalize",
+            target_lufs=-14.0,
+            normalize_only=True,
+            enable_masking_eq=False,
+            enable_deess=False,
+            enable_glow=False,
+            enable_mono_sub_v2=False,
+            enable_spatial=False,
+            enable_microshift=False,
+            enable_microdetail=False,
+            enable_stem_separation=False,
+            enable_movement=False,
+            enable_hooklift=False,
+            enable_transient_sculpt=False,
+            # Transparent: no soft clip colouring, the limiter alone holds the ceiling.
+            enable_softclip=False,
+            governor_gr_limit_db=-3.0,
+        ),
         "club_clean": Preset(
             name="club_clean",
             target_lufs=-10.4,
@@ -2120,12 +2446,14 @@ def _pcm_bits_from_subtype(subtype: Optional[str]) -> Optional[int]:
     return None
 
 
-def tpdf_dither(x: np.ndarray, bits: int, *, seed: int = 0) -> np.ndarray:
+def tpdf_dither(x: np.ndarray, bits: int, *, seed: int = 0,
+                rng: Optional[np.random.Generator] = None) -> np.ndarray:
     """
     Add TPDF dither at ~1 LSB before integer PCM quantization.
 
     This is a *sound quality* upgrade when exporting to PCM_16/24:
     it suppresses correlated quantization distortion (especially audible in fades and quiet tails).
+    Chunked exports pass one `rng` for the whole file so the noise does not repeat per chunk.
     """
     x = np.asarray(x, dtype=np.float32)
     bits = int(bits)
@@ -2133,7 +2461,8 @@ def tpdf_dither(x: np.ndarray, bits: int, *, seed: int = 0) -> np.ndarray:
         return x
     # LSB step for signed PCM in [-1,1): step = 2^-(bits-1)
     step = float(2.0 ** (-(bits - 1)))
-    rng = np.random.default_rng(int(seed))
+    if rng is None:
+        rng = np.random.default_rng(int(seed))
     noise = (rng.random(x.shape, dtype=np.float32) - rng.random(x.shape, dtype=np.float32)) * step
     y = (x + noise).astype(np.float32, copy=False)
     return np.clip(y, -1.0, 0.9999999).astype(np.float32, copy=False)
@@ -2170,191 +2499,350 @@ def write_audio(
         else:
             sf.write(path, y, sr)
 
-def master(target_path: str, out_path: str, preset: Preset,
-           reference_path: Optional[str] = None,
-           report_path: Optional[str] = None,
-           *,
-           out_subtype: Optional[str] = None,
-           dither: Optional[bool] = None,
-           dither_seed: int = 0) -> Dict[str, Any]:
-
-    t0 = time.time()
-    _stage_t = time.time()
-
-    log.info("[master] preset=%s  target=%s  reference=%s", preset.name, target_path, reference_path)
+def write_report_markdown(report_path: str, result: Dict[str, Any], preset: Preset) -> None:
+    """Human-readable report with the full result dict appended as JSON."""
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write("# AuralMind Maestro v7.3 expert — Report\n\n")
+        f.write("## Summary\n")
+        f.write(f"- Preset: **{result['preset']}**\n")
+        f.write(f"- Sample rate: **{result['sr']} Hz**\n")
+        f.write(f"- LUFS (pre): **{result['lufs_pre']:.2f}**\n")
+        f.write(f"- LUFS (post): **{result['lufs_post']:.2f}**\n")
+        f.write(f"- True peak (approx): **{result['true_peak_dbfs']:.2f} dBFS**\n")
+        f.write(f"- Limiter min gain (approx GR): **{result['limiter_min_gain_db']:.2f} dB**\n\n")
+        f.write(f"- Effective softclip mix: **{result['softclip_mix_effective']:.3f}**\n\n")
+
+        f.write("## Low-end / music theory anchors\n")
+        f.write(f"- Estimated sub fundamental f0: **{result['sub_f0_hz']} Hz**\n")
+        f.write(f"- Mono-sub v2 cutoff: **{result['mono_sub_cutoff_hz']} Hz**\n")
+        f.write(f"- Mono-sub v2 adaptive mix: **{result['mono_sub_mix']}**\n\n")
+
+        f.write("## Stereo enhancements\n")
+        f.write("- Spatial Realism Enhancer: frequency-dependent width + correlation guard\n")
+        f.write("- NEW CGMS MicroShift: micro-delay applied to SIDE high-band only, correlation-guarded\n\n")
+        f.write(f"- MicroDetail recovery: **{result['microdetail'].get('enabled', False)}**")
+        if result['microdetail'].get('enabled', False):
+            f.write(f" (corr={result['microdetail'].get('corr', None)}, eff_amount={result['microdetail'].get('eff_amount', None)})\n\n")
+        else:
+            f.write("\n\n")
+        f.write("## Movement / HookLift\n")
+        f.write(f"- Movement enabled: **{result['movement'].get('enabled', False)}** (amount={result['movement'].get('amount', None)})\n")
+        f.write(f"- HookLift enabled: **{result['hooklift'].get('enabled', False)}** (mix={result['hooklift'].get('mix', None)})\n")
+        if result['hooklift'].get('auto', False):
+            f.write(f"  - Auto mask percentile: **{result['hooklift'].get('auto_percentile', None)}**\n")
+        f.write("\n")
+
+        f.write("## Stem separation (HT-Demucs)\n")
+        f.write(f"- Enabled: **{result['stems'].get('enabled', False)}**\n")
+        if result['stems'].get('enabled', False):
+            f.write(f"- Model: **{result['stems'].get('model_name', None)}**\n")
+            f.write(f"- Sources: **{result['stems'].get('sources', None)}**\n")
+        else:
+            if 'reason' in result['stems']:
+                f.write(f"- Reason: **{result['stems'].get('reason', None)}**\n")
+            if 'error' in result['stems']:
+                f.write(f"- Error: **{result['stems'].get('error', None)}**\n")
+        f.write("\n")
+
+        f.write("## Loudness Governor\n")
+        f.write(f"- Requested target LUFS: **{preset.target_lufs}**\n")
+        f.write(f"- Governor final target LUFS: **{result['governor_target_lufs']}**\n")
+        f.write(f"- Governor steps: **{result['governor_steps']}** (binary search)\n")
+        f.write(f"- Limiter mode: **{result['limiter_mode']}**\n")
+        if result.get('limiter_avg_gr_db') is not None:
+            f.write(f"- Limiter avg gain (dB): **{result['limiter_avg_gr_db']:.2f}** (closer to 0 = less overall limiting)\n")
+        f.write("  If limiter GR exceeded the ceiling, the governor backed off the LUFS target.\n\n")
+
+        if result.get("deliverables"):
+            f.write("## Deliverables\n")
+            f.write("| Name | Target LUFS | Governor LUFS | LUFS (post) | Ceiling (dBFS) | TP (dBFS) | Subtype | File |\n")
+            f.write("|---|---:|---:|---:|---:|---:|---|---|\n")
+            for d in result["deliverables"]:
+                f.write(f"| {d['name']} | {d['target_lufs_requested']:.1f} | {d['governor_target_lufs']:.2f} | "
+                        f"{d['lufs_post']:.2f} | {d['ceiling_dbfs']:.1f} | {d['true_peak_dbfs']:.2f} | "
+                        f"{d['subtype']} | {os.path.basename(d['out_path'])} |\n")
+            f.write("\n")
 
-    y_t, sr_t = load_audio(target_path)
-    y_t = ensure_stereo(y_t)
-    if sr_t != preset.sr:
-        y_t = resample_audio(y_t, sr_t, preset.sr)
-        sr_t = preset.sr
+        f.write("## Stage timings\n")
+        f.write("| Stage | Wall (s) | CPU (s) | Peak RSS (MiB) | Peak alloc (MiB) |\n")
+        f.write("|---|---:|---:|---:|---:|\n")
+        for stage_name, st in result["timings"]["stages"].items():
+            f.write(f"| {stage_name} | {st['wall_s']:.3f} | {st['cpu_s']:.3f} | "
+                    f"{st['peak_rss_bytes'] / 2**20:.1f} | {st['peak_alloc_bytes'] / 2**20:.1f} |\n")
+        f.write("\n")
+        f.write("Governor candidates:\n")
+        for i, cand in enumerate(result["timings"]["governor_candidates"], 1):
+            f.write(f"- #{i} target {cand['target_lufs']:.2f} LUFS -> {cand['post_lufs']:.2f} LUFS, "
+                    f"TP {cand['tp_dbfs']:.2f} dBFS, {cand['wall_s']:.3f}s"
+                    f"{' (accepted)' if cand.get('accepted') else ''}\n")
+        f.write("\n")
+
+        f.write("## JSON dump\n")
+        f.write("```json\n")
+        f.write(json.dumps(result, indent=2))
+        f.write("\n```\n")
+
+
+def write_report_json(report_path: str, result: Dict[str, Any]) -> None:
+    """Machine-readable report: the result dict, including the `timings` section."""
+    tmp = f"{report_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, default=float)
+    os.replace(tmp, report_path)
+
+
+def load_reference(reference_path: str, sr: int) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Reference audio resampled to the engine rate, plus the native-rate decode (for feature analysis)."""
+    y_native, sr_r = load_audio(reference_path)
+    y_native = ensure_stereo(y_native)
+    y_r = resample_audio(y_native, sr_r, sr) if sr_r != sr else y_native
+    return y_r, y_native, sr_r
 
-    y_r = None
-    if reference_path:
-        y_r, sr_r = load_audio(reference_path)
-        y_r = ensure_stereo(y_r)
-        if sr_r != preset.sr:
-            y_r = resample_audio(y_r, sr_r, preset.sr)
 
-    log.info("[master] audio loaded  sr=%d  dur=%.1fs  (%.3fs)", sr_t, len(y_t) / sr_t, time.time() - _stage_t)
+# ------------------------------------
+# Stage checkpoints (--checkpoint-dir)
+# ------------------------------------
 
-    # Safety HPF (DC + rumble)
-    b, a = butter_highpass(20.0, sr_t, order=2)
-    y = apply_iir(y_t, b, a)
+# Stage boundaries master() can resume from, shallowest first.
+CHECKPOINT_STAGES = ("post_stems", "post_fir", "pre_transient", "pre_governor")
+
+# Preset fields first read after each boundary: changing only these keeps the checkpoint valid.
+# Everything else (including fields added later) is part of the key, so a miss is the safe default.
+_GOVERNOR_FIELDS = frozenset({
+    "target_lufs", "ceiling_dbfs", "limiter_oversample", "limiter_attack_ms", "limiter_release_ms",
+    "limiter_mode", "limiter_lookahead_ms", "limiter_stereo_link", "enable_limiter", "enable_softclip",
+    "softclip_pre_db_below_ceiling", "softclip_drive_db", "softclip_mix", "governor_search_steps",
+    "governor_allow_above_db", "governor_iters", "governor_gr_limit_db", "governor_step_db",
+})
+_TRANSIENT_FIELDS = frozenset({
+    "enable_transient_sculpt", "transient_sculpt_boost_db", "transient_sculpt_mix",
+    "transient_sculpt_crest_guard_db", "transient_sculpt_decay_ms",
+})
+# De-ess and glow settings are absent: the stem pre-pass reads them too.
+_TONE_FIELDS = frozenset({
+    "warmth", "enable_masking_eq", "masking_eq_max_dip_db", "enable_spatial", "width_mid", "width_hi",
+    "enable_microshift", "microshift_ms", "microshift_mix", "enable_microdetail", "microdetail_amount",
+    "microdetail_threshold_db", "microdetail_max_boost_db", "microdetail_band_lo_hz",
+    "microdetail_band_hi_hz", "microdetail_mix", "enable_movement", "movement_amount",
+    "enable_hooklift", "hooklift_auto", "hooklift_auto_percentile", "hooklift_mix",
+})
+_MATCH_FIELDS = frozenset({
+    "enable_mono_sub_v2", "mono_sub_base_mix", "fir_taps", "match_strength", "hi_factor",
+    "max_eq_db", "eq_smooth_hz", "fir_streaming", "fir_block_pow2",
+})
+_CHECKPOINT_DOWNSTREAM = {
+    "post_stems": _GOVERNOR_FIELDS | _TRANSIENT_FIELDS | _TONE_FIELDS | _MATCH_FIELDS,
+    "post_fir": _GOVERNOR_FIELDS | _TRANSIENT_FIELDS | _TONE_FIELDS,
+    "pre_transient": _GOVERNOR_FIELDS | _TRANSIENT_FIELDS,
+    "pre_governor": _GOVERNOR_FIELDS,
+}
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _engine_digest() -> str:
+    # Any change to the engine source invalidates every checkpoint.
+    return _file_sha256(os.path.abspath(__file__))
+
+
+class StageCheckpoints:
+    """
+    Stage-boundary buffers of one render, so a resubmission that changes
+    only late-stage settings (loudness, ceiling, transient sculpt, ...)
+    resumes from the deepest valid boundary instead of starting over.
+
+    Each checkpoint is `<dir>/<key>/audio.npy` (the working buffer, loaded
+    memory-mapped copy-on-write) plus `state.json` (the stage results the
+    report needs). The key hashes the engine source, the target file, the
+    reference and every preset field read before the boundary.
+    """
 
-    # ---------------------------------------------------------------------
-    # HT-Demucs stem separation (EARLY) + stem-aware pre-pass + recombine
-    # ---------------------------------------------------------------------
-    stems_info: Dict[str, Any] = {"enabled": False}
-    if preset.enable_stem_separation:
-        if not _HAS_DEMUCS:
-            stems_info = {"enabled": False, "reason": "demucs_not_installed"}
+    def __init__(self, root: str, target_path: str, preset: Preset,
+                 reference_path: Optional[str] = None,
+                 reference_profile: Optional[Dict[str, Any]] = None) -> None:
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        if reference_profile is not None:
+            reference = hashlib.sha256(np.ascontiguousarray(reference_profile["mid_mag"]).tobytes()).hexdigest()
         else:
+            reference = _file_sha256(reference_path) if reference_path else None
+        source = {"engine": _engine_digest(), "target": _file_sha256(target_path), "reference": reference}
+        fields = {f.name: getattr(preset, f.name) for f in dataclasses.fields(preset) if f.name != "name"}
+        self.keys: Dict[str, str] = {}
+        for stage in CHECKPOINT_STAGES:
+            upstream = {k: v for k, v in fields.items() if k not in _CHECKPOINT_DOWNSTREAM[stage]}
+            # The stem pass does not see the reference.
+            ident = dict(source, reference=None) if stage == "post_stems" else source
+            payload = json.dumps({"stage": stage, "source": ident, "preset": upstream}, sort_keys=True, default=str)
+            self.keys[stage] = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _dir(self, stage: str) -> str:
+        return os.path.join(self.root, self.keys[stage])
+
+    def resume(self) -> Optional[Tuple[str, np.ndarray, Dict[str, Any]]]:
+        """Deepest valid checkpoint as (stage, audio, state), or None."""
+        for stage in reversed(CHECKPOINT_STAGES):
+            path = self._dir(stage)
             try:
-                pre_stem_ref = y.copy()
-                stems, stems_info = demucs_separate_stems(
-                    y, sr_t,
-                    model_name=str(preset.demucs_model),
-                    device=str(preset.demucs_device),
-                    split=bool(preset.demucs_split),
-                    overlap=float(preset.demucs_overlap),
-                    shifts=int(preset.demucs_shifts),
-                )
-
-                stems_pp: Dict[str, np.ndarray] = {}
-                for s_name, s_audio in stems.items():
-                    stems_pp[s_name] = stem_pre_master_pass(s_audio, sr_t, s_name, preset)
-
-                y_stem = np.zeros_like(pre_stem_ref, dtype=np.float32)
-                for s_audio in stems_pp.values():
-                    y_stem += ensure_stereo(s_audio).astype(np.float32)
-
-                y = gain_match_rms(y_stem, pre_stem_ref)
-
-            except Exception as e:
-                stems_info = {"enabled": False, "error": str(e)}
-
-    # Musical analysis: sub f0
-    f0 = estimate_sub_fundamental_hz(y, sr_t)
-
-    # Mono-Sub v2
-    mono_cut = None
-    mono_mix = None
-    if preset.enable_mono_sub_v2:
-        y, mono_cut, mono_mix = mono_sub_v2(y, sr_t, f0, base_mix=preset.mono_sub_base_mix)
-
-    # Match EQ (reference or translation curve)
-    _stage_t = time.time()
-    freqs, eq_db = match_eq_curve(
-        reference=y_r, target=y, sr=sr_t,
-        max_eq_db=preset.max_eq_db,
-        eq_smooth_hz=preset.eq_smooth_hz,
-        match_strength=preset.match_strength,
-        hi_factor=preset.hi_factor
-    )
-    fir = design_fir_from_eq(freqs, eq_db, sr_t, preset.fir_taps)
-    fir_mode = str(getattr(preset, "fir_streaming", "auto")).lower()
-    if fir_mode == "off":
-        out = np.zeros_like(y, dtype=np.float32)
-        for ch in range(2):
-            out[:, ch] = fftconvolve(y[:, ch], fir, mode="same").astype(np.float32)
-        y = out
-    elif fir_mode == "on":
-        y = apply_fir_streaming_overlap_save(y, fir, sr=sr_t, mode="same", block_pow2=int(getattr(preset, "fir_block_pow2", 17)))
-    else:
-        y = apply_fir(y, fir, sr_t, mode="same")
-    log.info("[master] match-EQ + FIR convolution (%s)  (%.3fs)", fir_mode, time.time() - _stage_t)
+                with open(os.path.join(path, "state.json"), "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                y = np.load(os.path.join(path, "audio.npy"), mmap_mode="c")
+                os.utime(path)  # last use, for TTL-based cleanup
+            except (OSError, ValueError):
+                continue
+            _CHECKPOINT_STATS["hits"] += 1
+            return stage, y, state
+        _CHECKPOINT_STATS["misses"] += 1
+        return None
 
+    def save(self, stage: str, y: np.ndarray, state: Dict[str, Any]) -> None:
+        """Write one checkpoint atomically; failures only cost the cache entry."""
+        path = self._dir(stage)
+        if os.path.isdir(path):
+            return
+        tmp = os.path.join(self.root, f".{self.keys[stage]}.{uuid.uuid4().hex}.tmp")
+        try:
+            os.makedirs(tmp)
+            np.save(os.path.join(tmp, "audio.npy"), np.ascontiguousarray(y))
+            # state.json last: its presence marks a complete checkpoint.
+            with open(os.path.join(tmp, "state.json"), "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            if not os.path.isdir(path):  # not a concurrent render of the same stage
+                log.warning("[master] checkpoint %s not written: %s", stage, e)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
 
-    # Analog Warmth
-    if getattr(preset, "warmth", 0.0) > 0.0:
-        y = apply_warmth_tilt(y, sr_t, amount=float(preset.warmth))
 
+# ------------------------------------
+# Preview excerpts (--preview)
+# ------------------------------------
 
+# Audio rendered ahead of the excerpt so filter, dynamics and limiter state has settled.
+PREVIEW_PREROLL_S = 3.0
+# Rate of the energy envelope the excerpt is chosen from.
+PREVIEW_ANALYSIS_SR = 1000
+PREVIEW_FADE_S = 0.01
+# Governor binary-search steps for previews: ~0.06 dB target resolution instead of ~0.001 dB,
+# at less than half the limiter passes.
+PREVIEW_GOVERNOR_STEPS = 5
 
-    # Dynamic masking EQ
-    if preset.enable_masking_eq:
-        y = dynamic_masking_eq(
-            y, sr_t,
-            max_dip_db=float(getattr(preset, "masking_eq_max_dip_db", 1.5)),
-        )
 
-    # De-ess (protect harshness without killing air)
-    if preset.enable_deess:
-        y = de_ess(y, sr_t, threshold_db=preset.deess_threshold_db, ratio=preset.deess_ratio, mix=preset.deess_mix)
+def section_energy_mask(y: np.ndarray, sr: int, percentile: float = 75.0) -> Tuple[np.ndarray, int]:
+    """
+    build_section_lift_mask over the whole track at PREVIEW_ANALYSIS_SR:
+    the mono signal is reduced to a block-RMS envelope first, whose square
+    has the same windowed mean as the audio's. Returns (mask, decimation step).
+    """
+    m = to_mono(y)
+    step = max(1, int(sr) // PREVIEW_ANALYSIS_SR)
+    n = len(m) // step
+    blocks = m[: n * step].reshape(n, step)
+    env = np.sqrt(np.mean(blocks * blocks, axis=1))
+    return build_section_lift_mask(env, int(round(sr / step)), percentile=percentile), step
 
-    # Harmonic glow (midrange polish)
-    if preset.enable_glow:
-        y = harmonic_glow(y, sr_t, drive_db=preset.glow_drive_db, mix=preset.glow_mix)
 
-    # Stereo: spatial realism enhancer
-    _stage_t = time.time()
-    if preset.enable_spatial:
-        y = spatial_realism_enhancer(y, sr_t, width_mid=preset.width_mid, width_hi=preset.width_hi)
+def select_preview_excerpt(y: np.ndarray, sr: int, seconds: float,
+                           percentile: float = 75.0) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """
+    Cut the `seconds` window with the most section-mask energy (the hook),
+    plus up to PREVIEW_PREROLL_S of pre-roll. Returns (excerpt, per-sample
+    section mask for the excerpt, info). The mask is thresholded over the
+    whole track, so HookLift lifts the excerpt as it would in the full render.
+    """
+    mask, step = section_energy_mask(y, sr, percentile=percentile)
+    win = int(round(seconds * sr / step))
+    start = 0
+    if 0 < win < len(mask):
+        csum = np.concatenate(([0.0], np.cumsum(mask, dtype=np.float64)))
+        start = int(np.argmax(csum[win:] - csum[:-win]))
+    start_n = start * step
+    end_n = min(len(y), start_n + int(round(seconds * sr)))
+    preroll = min(start_n, int(round(PREVIEW_PREROLL_S * sr)))
+    lo = start_n - preroll
+    excerpt_mask = np.interp(np.arange(lo, end_n) / float(step), np.arange(len(mask)), mask).astype(np.float32)
+    info = {
+        "enabled": True,
+        "start_s": round(start_n / sr, 3),
+        "end_s": round(end_n / sr, 3),
+        "preroll_s": round(preroll / sr, 3),
+        "source_duration_s": round(len(y) / sr, 3),
+        "preroll_samples": int(preroll),
+    }
+    return y[lo:end_n], excerpt_mask, info
 
-    # Stereo: NEW microshift CGMS
-    if preset.enable_microshift:
-        y = microshift_widen_side(y, sr_t, shift_ms=preset.microshift_ms, mix=preset.microshift_mix)
-    log.info("[master] stereo enhancements  (%.3fs)", time.time() - _stage_t)
 
-    microdetail_info: Dict[str, Any] = {"enabled": False}
-    if getattr(preset, "enable_microdetail", False):
-        _stage_t = time.time()
-        y, md = microdetail_recovery_side_high(
-            y, sr_t,
-            band_lo_hz=float(getattr(preset, "microdetail_band_lo_hz", 2500.0)),
-            band_hi_hz=float(getattr(preset, "microdetail_band_hi_hz", 12000.0)),
-            threshold_db=float(getattr(preset, "microdetail_threshold_db", -34.0)),
-            max_boost_db=float(getattr(preset, "microdetail_max_boost_db", 3.5)),
-            amount=float(getattr(preset, "microdetail_amount", 0.22)),
-            mix=float(getattr(preset, "microdetail_mix", 0.65)),
-        )
-        microdetail_info = md
-        log.info("[master] microdetail recovery  (%.3fs)", time.time() - _stage_t)
+def _fade_edges(y: np.ndarray, sr: int, fade_s: float = PREVIEW_FADE_S) -> np.ndarray:
+    n = min(len(y) // 2, int(round(fade_s * sr)))
+    if n <= 0:
+        return y
+    ramp = (0.5 - 0.5 * np.cos(np.linspace(0.0, np.pi, n))).astype(np.float32)[:, None]
+    y = np.array(y, dtype=np.float32)
+    y[:n] *= ramp
+    y[-n:] *= ramp[::-1]
+    return y
 
-    # ---------------------------------------------------------------------
-    # Movement + HookLift (section-aware)
-    # ---------------------------------------------------------------------
-    movement_info: Dict[str, Any] = {"enabled": False}
-    hooklift_info: Dict[str, Any] = {"enabled": False}
 
-    if preset.enable_movement:
-        y, movement_info = movement_automation(y, sr_t, amount=float(preset.movement_amount))
+# ------------------------------------
+# Loudness governor + delivery targets (--deliverable)
+# ------------------------------------
 
-    if preset.enable_hooklift:
-        if bool(preset.hooklift_auto):
-            mask = build_section_lift_mask(
-                y, sr_t,
-                percentile=float(preset.hooklift_auto_percentile),
-            )
-            lifted, hinfo = hooklift(y, sr_t, mix=float(preset.hooklift_mix))
-            mask_col = mask[:, None]
-            y = (1.0 - mask_col) * y + mask_col * lifted
-            hooklift_info = {**hinfo, "auto": True, "auto_percentile": float(preset.hooklift_auto_percentile)}
-        else:
-            y, hooklift_info = hooklift(y, sr_t, mix=float(preset.hooklift_mix))
+DELIVERABLE_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,31}$")
 
-    # Transient Sculpt (pre-limiter punch preservation)
-    transient_info: Dict[str, Any] = {"enabled": False}
-    if getattr(preset, "enable_transient_sculpt", True):
-        _stage_t = time.time()
-        y, transient_info = transient_sculpt(
-            y, sr_t,
-            boost_db=float(getattr(preset, "transient_sculpt_boost_db", 2.4)),
-            mix=float(getattr(preset, "transient_sculpt_mix", 0.38)),
-            crest_guard_db=float(getattr(preset, "transient_sculpt_crest_guard_db", 17.5)),
-            decay_ms=float(getattr(preset, "transient_sculpt_decay_ms", 5.5)),
-        )
-        log.info("[master] transient sculpt  enabled=%s  (%.3fs)", transient_info.get("enabled", False), time.time() - _stage_t)
 
-    # Loudness Governor v2 (binary search) + final peak control chain (softclip + TP limiter)
-    _stage_t = time.time()
-    pre_lufs = integrated_loudness_lufs(y, sr_t)
+@dataclass(frozen=True)
+class Deliverable:
+    """One delivery master: its own loudness target, ceiling and export subtype."""
+    name: str
+    target_lufs: float
+    ceiling_dbfs: float
+    subtype: Optional[str] = None
+
+
+def parse_deliverable(spec: str) -> Deliverable:
+    """Parse NAME:LUFS:CEILING[:SUBTYPE], e.g. "club:-9:-0.3:PCM_24"."""
+    parts = str(spec).split(":")
+    if len(parts) not in (3, 4) or not DELIVERABLE_NAME_RE.match(parts[0]):
+        raise ValueError(f"invalid deliverable {spec!r}; expected NAME:LUFS:CEILING[:SUBTYPE]")
+    try:
+        target, ceiling = float(parts[1]), float(parts[2])
+    except ValueError:
+        raise ValueError(f"invalid deliverable {spec!r}; LUFS and CEILING must be numbers")
+    subtype = parts[3].upper() if len(parts) == 4 and parts[3] else None
+    if subtype is not None and subtype not in sf.available_subtypes():
+        raise ValueError(f"invalid deliverable {spec!r}; unknown subtype {subtype}")
+    return Deliverable(parts[0], target, ceiling, subtype)
+
+
+def deliverable_path(out_path: str, name: str) -> str:
+    """mastered.wav + "club" -> mastered.club.wav"""
+    base, ext = os.path.splitext(out_path)
+    return f"{base}.{name}{ext or '.wav'}"
+
+
+def loudness_governor(y: np.ndarray, sr: int, preset: Preset, *, pre_lufs: float, steps: int,
+                      on_step=None) -> Tuple[np.ndarray, Dict[str, float], List[Dict[str, Any]]]:
+    """
+    Binary-search the loudest target between the preset's bounds whose
+    peak control chain stays within the GR limit and the ceiling.
+    Returns (audio, stats of the accepted candidate, all candidates).
+    """
+    candidates: List[Dict[str, Any]] = []
 
     def _render_at(target_lufs: float) -> Tuple[np.ndarray, Dict[str, float]]:
-        y_norm, cur_lufs, gain_db = apply_lufs_gain(y, sr_t, target_lufs, cur_lufs=pre_lufs)
-        y_lim, lim_stats = peak_control_chain(y_norm, sr_t, preset)
-        post = integrated_loudness_lufs(y_lim, sr_t)
+        cand_t = time.time()
+        cand_c = time.process_time()
+        y_norm, cur_lufs, gain_db = apply_lufs_gain(y, sr, target_lufs, cur_lufs=pre_lufs)
+        y_lim, lim_stats = peak_control_chain(y_norm, sr, preset)
+        post = integrated_loudness_lufs(y_lim, sr)
         lim_stats = {
             **lim_stats,
             "target_lufs": float(target_lufs),
@@ -2362,6 +2850,14 @@ def master(target_path: str, out_path: str, preset: Preset,
             "post_lufs": float(post),
             "gain_db": float(gain_db),
         }
+        candidates.append({
+            "target_lufs": round(float(target_lufs), 4),
+            "wall_s": round(time.time() - cand_t, 4),
+            "cpu_s": round(time.process_time() - cand_c, 4),
+            "post_lufs": round(float(post), 3),
+            "tp_dbfs": round(float(lim_stats.get("tp_dbfs", 0.0)), 3),
+            "min_gain_db": round(float(lim_stats.get("min_gain_db", 0.0)), 3),
+        })
         return y_lim, lim_stats
 
     allow_above = float(getattr(preset, "governor_allow_above_db", 0.0))
@@ -2373,36 +2869,417 @@ def master(target_path: str, out_path: str, preset: Preset,
     best_audio: Optional[np.ndarray] = None
     best_stats: Optional[Dict[str, float]] = None
     lo, hi = low, high
-    steps = int(getattr(preset, "governor_search_steps", 11))
 
-    for _ in range(steps):
+    for it in range(steps):
         mid = 0.5 * (lo + hi)
         cand_audio, cand_stats = _render_at(mid)
 
         ok_gr = float(cand_stats.get("min_gain_db", -999.0)) > float(preset.governor_gr_limit_db)
         ok_tp = float(cand_stats.get("tp_dbfs", 0.0)) <= float(preset.ceiling_dbfs + 0.10)
 
+        candidates[-1]["accepted"] = bool(ok_gr and ok_tp)
         if ok_gr and ok_tp:
             best_audio, best_stats = cand_audio, cand_stats
             lo = mid  # try louder (closer to high)
         else:
             hi = mid  # back off
+        if on_step is not None:
+            on_step(it, mid)
 
     if best_audio is None or best_stats is None:
         best_audio, best_stats = _render_at(low)
+        candidates[-1]["accepted"] = True
+        candidates[-1]["fallback"] = True
+    return best_audio, best_stats, candidates
+
+
+def render_deliverable(y: np.ndarray, sr: int, preset: Preset, deliverable: Deliverable, out_path: str, *,
+                       pre_lufs: float, steps: int, dither: Optional[bool] = None,
+                       dither_seed: int = 0) -> Dict[str, Any]:
+    """Governor, peak control and export of one deliverable from the shared pre-governor buffer."""
+    t0 = time.time()
+    p = replace(preset, target_lufs=float(deliverable.target_lufs), ceiling_dbfs=float(deliverable.ceiling_dbfs))
+    audio, stats, candidates = loudness_governor(y, sr, p, pre_lufs=pre_lufs, steps=steps)
+    subtype = deliverable.subtype
+    if subtype is None:
+        subtype = "PCM_24" if str(out_path).lower().endswith(".wav") else None
+    write_audio(out_path, audio, sr, subtype=subtype, dither=dither, dither_seed=int(dither_seed))
+    return {
+        "name": deliverable.name,
+        "out_path": out_path,
+        "subtype": subtype,
+        "target_lufs_requested": float(deliverable.target_lufs),
+        "ceiling_dbfs": float(deliverable.ceiling_dbfs),
+        "governor_target_lufs": float(stats.get("target_lufs", deliverable.target_lufs)),
+        "lufs_post": float(stats.get("post_lufs", 0.0)),
+        "true_peak_dbfs": float(stats.get("tp_dbfs", 0.0)),
+        "limiter_min_gain_db": float(stats.get("min_gain_db", 0.0)),
+        "limiter_avg_gr_db": float(stats.get("avg_gr_db", 0.0)),
+        "runtime_sec": round(time.time() - t0, 4),
+        "governor_candidates": candidates,
+    }
+
+
+# Pre-governor buffer for forked delivery workers (inherited copy-on-write, never pickled).
+_DELIVERY_SOURCE: Optional[np.ndarray] = None
+
+
+def _render_forked_deliverable(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    return render_deliverable(_DELIVERY_SOURCE, *args, **kwargs)
+
+
+def render_deliverables(y: np.ndarray, sr: int, preset: Preset, deliverables: List[Deliverable], out_path: str, *,
+                        pre_lufs: float, steps: int, dither: Optional[bool] = None, dither_seed: int = 0,
+                        workers: Optional[int] = None, on_done=None) -> List[Dict[str, Any]]:
+    """
+    Fan the deliverables out over forked worker processes when there is
+    more than one core (the limiter's gain smoother is a Python loop, so
+    threads would serialise on the GIL); sequential otherwise. Results
+    keep the order of `deliverables`.
+    """
+    global _DELIVERY_SOURCE
+    kwargs = {"pre_lufs": pre_lufs, "steps": steps, "dither": dither, "dither_seed": dither_seed}
+    jobs = [(sr, preset, d, deliverable_path(out_path, d.name)) for d in deliverables]
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    if workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+        _DELIVERY_SOURCE = y
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork")) as pool:
+                futures = {pool.submit(_render_forked_deliverable, job, kwargs): i for i, job in enumerate(jobs)}
+                for fut in as_completed(futures):
+                    results[futures[fut]] = fut.result()
+                    if on_done is not None:
+                        on_done(sum(r is not None for r in results), len(jobs))
+        finally:
+            _DELIVERY_SOURCE = None
+    else:
+        for i, job in enumerate(jobs):
+            results[i] = render_deliverable(y, *job, **kwargs)
+            if on_done is not None:
+                on_done(i + 1, len(jobs))
+    return results
+
+
+def master(target_path: str, out_path: str, preset: Preset,
+           reference_path: Optional[str] = None,
+           report_path: Optional[str] = None,
+           *,
+           out_subtype: Optional[str] = None,
+           dither: Optional[bool] = None,
+           dither_seed: int = 0,
+           profiler: Optional[StageProfiler] = None,
+           reference_profile: Optional[Dict[str, Any]] = None,
+           checkpoint_dir: Optional[str] = None,
+           preview_seconds: Optional[float] = None,
+           deliverables: Optional[List[Deliverable]] = None,
+           deliverable_workers: Optional[int] = None) -> Dict[str, Any]:
+
+    if preset.normalize_only:
+        if preview_seconds:
+            raise ValueError(f"preset {preset.name!r} normalizes whole files; it has no preview")
+        if reference_path or reference_profile is not None:
+            log.info("[master] preset=%s does not use a reference; ignoring it", preset.name)
+        return normalize(target_path, out_path, preset, report_path, out_subtype=out_subtype, dither=dither,
+                         dither_seed=dither_seed, profiler=profiler, deliverables=deliverables)
+
+    t0 = time.time()
+    _stage_t = time.time()
+    clock = StageClock(profiler=profiler)
+
+    if reference_profile is not None:
+        # Precomputed reference: no decode, resample or spectrum pass over the reference audio.
+        if int(reference_profile["sr"]) != int(preset.sr):
+            raise ValueError(f"reference profile was built at {reference_profile['sr']} Hz, preset runs at {preset.sr} Hz")
+        reference_path = reference_profile.get("path")
+    log.info("[master] preset=%s  target=%s  reference=%s", preset.name, target_path, reference_path)
+
+    checkpoints = None
+    # Preview buffers are excerpts; they must not be mistaken for full-track checkpoints.
+    if checkpoint_dir and not preview_seconds:
+        checkpoints = StageCheckpoints(checkpoint_dir, target_path, preset,
+                                       reference_path=reference_path, reference_profile=reference_profile)
+    resumed = checkpoints.resume() if checkpoints is not None else None
+    # Index of the boundary we resume from; stages up to it are skipped.
+    depth = CHECKPOINT_STAGES.index(resumed[0]) if resumed is not None else -1
+    state: Dict[str, Any] = dict(resumed[2]) if resumed is not None else {}
+
+    with clock.stage("load"):
+        if resumed is not None:
+            y, sr_t = resumed[1], int(preset.sr)
+        else:
+            y_t, sr_t = load_audio(target_path)
+            y_t = ensure_stereo(y_t)
+            if sr_t != preset.sr:
+                y_t = resample_audio(y_t, sr_t, preset.sr)
+                sr_t = preset.sr
+
+            # Safety HPF (DC + rumble)
+            b, a = butter_highpass(20.0, sr_t, order=2)
+            y = apply_iir(y_t, b, a)
+
+        y_r = None
+        if depth < 1 and reference_path and reference_profile is None:
+            y_r, _, _ = load_reference(reference_path, preset.sr)
+
+    if resumed is not None:
+        log.info("[master] resumed from checkpoint %s", resumed[0])
+        clock.channel.emit("checkpoint", stage=resumed[0])
+    log.info("[master] audio loaded  sr=%d  dur=%.1fs  (%.3fs)", sr_t, len(y) / sr_t, time.time() - _stage_t)
+    clock.channel.emit("audio", sr=int(sr_t), duration_s=round(len(y) / sr_t, 3))
+
+    # ---------------------------------------------------------------------
+    # HT-Demucs stem separation (EARLY) + stem-aware pre-pass + recombine
+    # ---------------------------------------------------------------------
+    stems_info: Dict[str, Any] = state.get("stems", {"enabled": False})
+    if preview_seconds:
+        stems_info = {"enabled": False, "reason": "preview"}
+    elif depth < 0 and preset.enable_stem_separation:
+        if not _HAS_DEMUCS:
+            stems_info = {"enabled": False, "reason": "demucs_not_installed"}
+        else:
+            with clock.stage("stems"):
+                try:
+                    pre_stem_ref = y.copy()
+                    stems, stems_info = demucs_separate_stems(
+                        y, sr_t,
+                        model_name=str(preset.demucs_model),
+                        device=str(preset.demucs_device),
+                        split=bool(preset.demucs_split),
+                        overlap=float(preset.demucs_overlap),
+                        shifts=int(preset.demucs_shifts),
+                    )
+
+                    stems_pp: Dict[str, np.ndarray] = {}
+                    for s_name, s_audio in stems.items():
+                        stems_pp[s_name] = stem_pre_master_pass(s_audio, sr_t, s_name, preset)
+
+                    y_stem = np.zeros_like(pre_stem_ref, dtype=np.float32)
+                    for s_audio in stems_pp.values():
+                        y_stem += ensure_stereo(s_audio).astype(np.float32)
+
+                    y = gain_match_rms(y_stem, pre_stem_ref)
+
+                except Exception as e:
+                    stems_info = {"enabled": False, "error": str(e)}
+    if checkpoints is not None and depth < 0 and stems_info.get("enabled"):
+        # Without stems the first boundary is only decode + HPF; not worth the disk.
+        checkpoints.save("post_stems", y, {"stems": stems_info})
+
+    # Musical analysis: sub f0 + Mono-Sub v2
+    mono_cut = state.get("mono_sub_cutoff_hz")
+    mono_mix = state.get("mono_sub_mix")
+    f0 = state.get("sub_f0_hz")
+    preview_info: Dict[str, Any] = {"enabled": False}
+    hook_mask: Optional[np.ndarray] = None
+    lufs_offset = 0.0
+    if depth < 1:
+        with clock.stage("f0"):
+            f0 = estimate_sub_fundamental_hz(y, sr_t)
+        if preset.enable_mono_sub_v2:
+            with clock.stage("mono_sub"):
+                y, mono_cut, mono_mix = mono_sub_v2(y, sr_t, f0, base_mix=preset.mono_sub_base_mix)
+
+        # Preview: everything up to here (and the match-EQ curve) sees the whole track;
+        # the stages below only render the hook excerpt.
+        y_full = y
+        if preview_seconds:
+            with clock.stage("preview"):
+                y, hook_mask, preview_info = select_preview_excerpt(
+                    y, sr_t, float(preview_seconds), percentile=float(preset.hooklift_auto_percentile),
+                )
+                lufs_offset = (integrated_loudness_lufs(y_full, sr_t)
+                               - integrated_loudness_lufs(y[preview_info["preroll_samples"]:], sr_t))
+                preview_info["lufs_offset_db"] = round(float(lufs_offset), 4)
+            log.info("[master] preview excerpt  %.1f-%.1fs of %.1fs  (pre-roll %.1fs)",
+                     preview_info["start_s"], preview_info["end_s"], preview_info["source_duration_s"],
+                     preview_info["preroll_s"])
+
+        # Match EQ (reference or translation curve)
+        _stage_t = time.time()
+        with clock.stage("match_eq"):
+            freqs, eq_db = match_eq_curve(
+                reference=y_r, target=y_full, sr=sr_t,
+                max_eq_db=preset.max_eq_db,
+                eq_smooth_hz=preset.eq_smooth_hz,
+                match_strength=preset.match_strength,
+                hi_factor=preset.hi_factor,
+                reference_mag=reference_profile["mid_mag"] if reference_profile is not None else None,
+            )
+            fir = design_fir_from_eq(freqs, eq_db, sr_t, preset.fir_taps)
+            fir_mode = str(getattr(preset, "fir_streaming", "auto")).lower()
+            if fir_mode == "off":
+                out = np.zeros_like(y, dtype=np.float32)
+                for ch in range(2):
+                    out[:, ch] = fftconvolve(y[:, ch], fir, mode="same").astype(np.float32)
+                y = out
+            elif fir_mode == "on":
+                y = apply_fir_streaming_overlap_save(y, fir, sr=sr_t, mode="same", block_pow2=int(getattr(preset, "fir_block_pow2", 17)))
+            else:
+                y = apply_fir(y, fir, sr_t, mode="same")
+        log.info("[master] match-EQ + FIR convolution (%s)  (%.3fs)", fir_mode, time.time() - _stage_t)
+        if checkpoints is not None:
+            state.update(
+                stems=stems_info,
+                sub_f0_hz=float(f0) if f0 is not None else None,
+                mono_sub_cutoff_hz=float(mono_cut) if mono_cut is not None else None,
+                mono_sub_mix=float(mono_mix) if mono_mix is not None else None,
+            )
+            checkpoints.save("post_fir", y, state)
+
+    microdetail_info: Dict[str, Any] = state.get("microdetail", {"enabled": False})
+    movement_info: Dict[str, Any] = state.get("movement", {"enabled": False})
+    hooklift_info: Dict[str, Any] = state.get("hooklift", {"enabled": False})
+    if depth < 2:
+        # Analog Warmth
+        if getattr(preset, "warmth", 0.0) > 0.0:
+            with clock.stage("warmth"):
+                y = apply_warmth_tilt(y, sr_t, amount=float(preset.warmth))
+
+        # Dynamic masking EQ
+        if preset.enable_masking_eq:
+            with clock.stage("masking_eq"):
+                y = dynamic_masking_eq(
+                    y, sr_t,
+                    max_dip_db=float(getattr(preset, "masking_eq_max_dip_db", 1.5)),
+                )
+
+        # De-ess (protect harshness without killing air)
+        if preset.enable_deess:
+            with clock.stage("deess"):
+                y = de_ess(y, sr_t, threshold_db=preset.deess_threshold_db, ratio=preset.deess_ratio, mix=preset.deess_mix)
+
+        # Harmonic glow (midrange polish)
+        if preset.enable_glow:
+            with clock.stage("glow"):
+                y = harmonic_glow(y, sr_t, drive_db=preset.glow_drive_db, mix=preset.glow_mix)
+
+        _stage_t = time.time()
+        # Stereo: spatial realism enhancer
+        if preset.enable_spatial:
+            with clock.stage("spatial"):
+                y = spatial_realism_enhancer(y, sr_t, width_mid=preset.width_mid, width_hi=preset.width_hi)
+
+        # Stereo: NEW microshift CGMS
+        if preset.enable_microshift:
+            with clock.stage("microshift"):
+                y = microshift_widen_side(y, sr_t, shift_ms=preset.microshift_ms, mix=preset.microshift_mix)
+        log.info("[master] stereo enhancements  (%.3fs)", time.time() - _stage_t)
+
+        if getattr(preset, "enable_microdetail", False):
+            _stage_t = time.time()
+            with clock.stage("microdetail"):
+                y, md = microdetail_recovery_side_high(
+                    y, sr_t,
+                    band_lo_hz=float(getattr(preset, "microdetail_band_lo_hz", 2500.0)),
+                    band_hi_hz=float(getattr(preset, "microdetail_band_hi_hz", 12000.0)),
+                    threshold_db=float(getattr(preset, "microdetail_threshold_db", -34.0)),
+                    max_boost_db=float(getattr(preset, "microdetail_max_boost_db", 3.5)),
+                    amount=float(getattr(preset, "microdetail_amount", 0.22)),
+                    mix=float(getattr(preset, "microdetail_mix", 0.65)),
+                )
+            microdetail_info = md
+            log.info("[master] microdetail recovery  (%.3fs)", time.time() - _stage_t)
+
+        # ---------------------------------------------------------------------
+        # Movement + HookLift (section-aware)
+        # ---------------------------------------------------------------------
+        if preset.enable_movement:
+            with clock.stage("movement"):
+                y, movement_info = movement_automation(y, sr_t, amount=float(preset.movement_amount))
+
+        if preset.enable_hooklift:
+            with clock.stage("hooklift"):
+                if bool(preset.hooklift_auto):
+                    if hook_mask is not None:
+                        mask = hook_mask
+                    else:
+                        mask = build_section_lift_mask(
+                            y, sr_t,
+                            percentile=float(preset.hooklift_auto_percentile),
+                        )
+                    lifted, hinfo = hooklift(y, sr_t, mix=float(preset.hooklift_mix))
+                    mask_col = mask[:, None]
+                    y = (1.0 - mask_col) * y + mask_col * lifted
+                    hooklift_info = {**hinfo, "auto": True, "auto_percentile": float(preset.hooklift_auto_percentile)}
+                else:
+                    y, hooklift_info = hooklift(y, sr_t, mix=float(preset.hooklift_mix))
+        if checkpoints is not None:
+            state.update(microdetail=microdetail_info, movement=movement_info, hooklift=hooklift_info)
+            checkpoints.save("pre_transient", y, state)
+
+    # Transient Sculpt (pre-limiter punch preservation)
+    transient_info: Dict[str, Any] = state.get("transient_sculpt", {"enabled": False})
+    if depth < 3 and getattr(preset, "enable_transient_sculpt", True):
+        _stage_t = time.time()
+        with clock.stage("transient"):
+            y, transient_info = transient_sculpt(
+                y, sr_t,
+                boost_db=float(getattr(preset, "transient_sculpt_boost_db", 2.4)),
+                mix=float(getattr(preset, "transient_sculpt_mix", 0.38)),
+                crest_guard_db=float(getattr(preset, "transient_sculpt_crest_guard_db", 17.5)),
+                decay_ms=float(getattr(preset, "transient_sculpt_decay_ms", 5.5)),
+            )
+        log.info("[master] transient sculpt  enabled=%s  (%.3fs)", transient_info.get("enabled", False), time.time() - _stage_t)
+    if checkpoints is not None and depth < 3:
+        state["transient_sculpt"] = transient_info
+        checkpoints.save("pre_governor", y, state)
+
+    # Loudness Governor v2 (binary search) + final peak control chain (softclip + TP limiter)
+    _stage_t = time.time()
+    steps = int(getattr(preset, "governor_search_steps", 11))
+    if preview_info["enabled"]:
+        steps = min(steps, PREVIEW_GOVERNOR_STEPS)
+    with clock.stage("governor"):
+        if preview_info["enabled"]:
+            # Gain the full render would apply: the excerpt body's loudness shifted by the whole-track offset.
+            pre_lufs = integrated_loudness_lufs(y[preview_info["preroll_samples"]:], sr_t) + lufs_offset
+        else:
+            pre_lufs = integrated_loudness_lufs(y, sr_t)
+        best_audio, best_stats, governor_candidates = loudness_governor(
+            y, sr_t, preset, pre_lufs=pre_lufs, steps=steps,
+            on_step=lambda it, mid: clock.progress("governor", (it + 1) / max(1, steps), governor_iter=it + 1,
+                                                   governor_steps=steps, target_lufs=round(mid, 3)),
+        )
+
+    if out_subtype is None:
+        out_subtype = "PCM_24" if str(out_path).lower().endswith(".wav") else None
+    deliverable_results: List[Dict[str, Any]] = []
+    if deliverables:
+        # Everything upstream is shared; only governor, peak control and export run per target.
+        _deliver_t = time.time()
+        with clock.stage("deliver"):
+            deliverable_results = render_deliverables(
+                y, sr_t, preset, [d if d.subtype else replace(d, subtype=out_subtype) for d in deliverables], out_path,
+                pre_lufs=pre_lufs, steps=steps, dither=dither, dither_seed=int(dither_seed),
+                workers=1 if profiler is not None else deliverable_workers,
+                on_done=lambda done, total: clock.progress("deliver", done / total, deliverables_done=done,
+                                                           deliverables_total=total),
+            )
+        log.info("[master] deliverables  %s  (%.3fs)",
+                 "  ".join(f"{r['name']}={r['lufs_post']:.1f} LUFS/{r['true_peak_dbfs']:.2f} dBTP"
+                           for r in deliverable_results),
+                 time.time() - _deliver_t)
 
     y = best_audio
     governor_target = float(best_stats.get("target_lufs", preset.target_lufs))
     final_gr_db = float(best_stats.get("min_gain_db", 0.0))
     post_lufs = float(best_stats.get("post_lufs", integrated_loudness_lufs(y, sr_t)))
+    if preview_info["enabled"]:
+        y = _fade_edges(y[preview_info["preroll_samples"]:], sr_t)
+        post_lufs = integrated_loudness_lufs(y, sr_t)
     tp = float(best_stats.get("tp_dbfs", lin_to_db(true_peak_estimate(y, sr_t, oversample=preset.limiter_oversample) + 1e-12)))
 
-    if out_subtype is None:
-        out_subtype = "PCM_24" if str(out_path).lower().endswith(".wav") else None
-    write_audio(out_path, y, sr_t, subtype=out_subtype, dither=dither, dither_seed=int(dither_seed))
+    with clock.stage("write"):
+        write_audio(out_path, y, sr_t, subtype=out_subtype, dither=dither, dither_seed=int(dither_seed))
     log.info("[master] governor + limiter + write  LUFS=%.1f  TP=%.2f dBFS  GR=%.2f dB  (%.3fs)",
              post_lufs, tp, final_gr_db, time.time() - _stage_t)
     log.info("[master] TOTAL runtime=%.2fs  out=%s", time.time() - t0, out_path)
+    clock.channel.emit("cache", caches=cache_stats())
+    clock.close()
+    clock.channel.emit("done", runtime_s=round(time.time() - t0, 4), stage_seconds=clock.timings,
+                       stages=clock.summary())
 
     result = {
         "preset": preset.name,
@@ -2418,6 +3295,8 @@ def master(target_path: str, out_path: str, preset: Preset,
         "limiter_min_gain_db": float(final_gr_db),
         "limiter_avg_gr_db": float(best_stats.get("avg_gr_db", 0.0)) if "best_stats" in locals() and best_stats is not None else None,
         "softclip_mix_effective": float(best_stats.get("softclip_mix_effective", getattr(preset, "softclip_mix", 0.0))),
+        "reference_profile": reference_profile.get("path") if reference_profile is not None else None,
+        "reference_selection": reference_profile.get("selection") if reference_profile is not None else None,
         "sub_f0_hz": float(f0) if f0 is not None else None,
         "mono_sub_cutoff_hz": float(mono_cut) if mono_cut is not None else None,
         "mono_sub_mix": float(mono_mix) if mono_mix is not None else None,
@@ -2427,77 +3306,1498 @@ def master(target_path: str, out_path: str, preset: Preset,
         "hooklift": hooklift_info,
         "stems": stems_info,
         "transient_sculpt": transient_info,
+        "preview": preview_info,
+        "deliverables": [{k: v for k, v in r.items() if k != "governor_candidates"} for r in deliverable_results],
+        "checkpoint_resumed_from": resumed[0] if resumed is not None else None,
         "runtime_sec": float(time.time() - t0),
+        "timings": {
+            "total_s": round(time.time() - t0, 4),
+            "stages": clock.summary(),
+            "governor_candidates": governor_candidates,
+            "deliverable_governor_candidates": {r["name"]: r["governor_candidates"] for r in deliverable_results},
+        },
         "out_path": out_path,
     }
 
     if report_path:
         os.makedirs(os.path.dirname(os.path.abspath(report_path)) or ".", exist_ok=True)
-        with open(report_path, "w", encoding="utf-8") as f:
-            f.write("# AuralMind Maestro v7.3 expert — Report\n\n")
-            f.write("## Summary\n")
-            f.write(f"- Preset: **{result['preset']}**\n")
-            f.write(f"- Sample rate: **{result['sr']} Hz**\n")
-            f.write(f"- LUFS (pre): **{result['lufs_pre']:.2f}**\n")
-            f.write(f"- LUFS (post): **{result['lufs_post']:.2f}**\n")
-            f.write(f"- True peak (approx): **{result['true_peak_dbfs']:.2f} dBFS**\n")
-            f.write(f"- Limiter min gain (approx GR): **{result['limiter_min_gain_db']:.2f} dB**\n\n")
-            f.write(f"- Effective softclip mix: **{result['softclip_mix_effective']:.3f}**\n\n")
-
-            f.write("## Low-end / music theory anchors\n")
-            f.write(f"- Estimated sub fundamental f0: **{result['sub_f0_hz']} Hz**\n")
-            f.write(f"- Mono-sub v2 cutoff: **{result['mono_sub_cutoff_hz']} Hz**\n")
-            f.write(f"- Mono-sub v2 adaptive mix: **{result['mono_sub_mix']}**\n\n")
-
-            f.write("## Stereo enhancements\n")
-            f.write("- Spatial Realism Enhancer: frequency-dependent width + correlation guard\n")
-            f.write("- NEW CGMS MicroShift: micro-delay applied to SIDE high-band only, correlation-guarded\n\n")
-            f.write(f"- MicroDetail recovery: **{result['microdetail'].get('enabled', False)}**")
-            if result['microdetail'].get('enabled', False):
-                f.write(f" (corr={result['microdetail'].get('corr', None)}, eff_amount={result['microdetail'].get('eff_amount', None)})\n\n")
-            else:
-                f.write("\n\n")
-            f.write("## Movement / HookLift\n")
-            f.write(f"- Movement enabled: **{result['movement'].get('enabled', False)}** (amount={result['movement'].get('amount', None)})\n")
-            f.write(f"- HookLift enabled: **{result['hooklift'].get('enabled', False)}** (mix={result['hooklift'].get('mix', None)})\n")
-            if result['hooklift'].get('auto', False):
-                f.write(f"  - Auto mask percentile: **{result['hooklift'].get('auto_percentile', None)}**\n")
-            f.write("\n")
+        if str(report_path).lower().endswith(".json"):
+            write_report_json(report_path, result)
+        else:
+            write_report_markdown(report_path, result, preset)
+    return result
 
-            f.write("## Stem separation (HT-Demucs)\n")
-            f.write(f"- Enabled: **{result['stems'].get('enabled', False)}**\n")
-            if result['stems'].get('enabled', False):
-                f.write(f"- Model: **{result['stems'].get('model_name', None)}**\n")
-                f.write(f"- Sources: **{result['stems'].get('sources', None)}**\n")
-            else:
-                if 'reason' in result['stems']:
-                    f.write(f"- Reason: **{result['stems'].get('reason', None)}**\n")
-                if 'error' in result['stems']:
-                    f.write(f"- Error: **{result['stems'].get('error', None)}**\n")
-            f.write("\n")
 
-            f.write("## Loudness Governor\n")
-            f.write(f"- Requested target LUFS: **{preset.target_lufs}**\n")
-            f.write(f"- Governor final target LUFS: **{result['governor_target_lufs']}**\n")
-            f.write(f"- Governor steps: **{result['governor_steps']}** (binary search)\n")
-            f.write(f"- Limiter mode: **{result['limiter_mode']}**\n")
-            if result.get('limiter_avg_gr_db') is not None:
-                f.write(f"- Limiter avg gain (dB): **{result['limiter_avg_gr_db']:.2f}** (closer to 0 = less overall limiting)\n")
-            f.write("  If limiter GR exceeded the ceiling, the governor backed off the LUFS target.\n\n")
+# ------------------------------------
+# Preset comparison (--compare)
+# ------------------------------------
+
+# Octave-band centres of the comparison report's spectral summary.
+COMPARE_BANDS_HZ = (31.5, 63.0, 125.0, 250.0, 500.0, 1000.0, 2000.0, 4000.0, 8000.0, 16000.0)
+
+
+def octave_band_levels(y: np.ndarray, sr: int) -> List[float]:
+    """Power per octave band in dB (mono fold-down, Welch PSD), for comparing tonal balance."""
+    f, pxx = sps.welch(to_mono(y), fs=sr, nperseg=min(8192, max(256, len(y))))
+    levels = []
+    for fc in COMPARE_BANDS_HZ:
+        band = (f >= fc / math.sqrt(2.0)) & (f < fc * math.sqrt(2.0))
+        levels.append(round(float(10.0 * np.log10(np.sum(pxx[band]) + 1e-20)), 2))
+    return levels
+
+
+def load_compare_spec(path: str) -> List[Dict[str, Any]]:
+    """{"variants": [{"name": ..., "args": [engine flags]}, ...]}, at least two, unique names."""
+    with open(path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    variants = spec.get("variants") if isinstance(spec, dict) else None
+    if not isinstance(variants, list) or len(variants) < 2:
+        raise ValueError("compare spec needs at least two variants")
+    names = set()
+    for v in variants:
+        name = v.get("name") if isinstance(v, dict) else None
+        if not isinstance(name, str) or not DELIVERABLE_NAME_RE.match(name) or name in names:
+            raise ValueError(f"invalid or duplicate variant name {name!r}")
+        if not isinstance(v.get("args", []), list):
+            raise ValueError(f"variant {name!r}: args must be a list of engine flags")
+        names.add(name)
+    return variants
+
+
+def _render_variant(target_path: str, out_path: str, preset: Preset, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    # Each variant is a complete master() run; the comparison reports progress per variant instead.
+    with _PROGRESS.muted():
+        return master(target_path, out_path, preset, **kwargs)
+
+
+def compare_presets(target_path: str, out_path: str, variants: List[Tuple[str, Preset]], *,
+                    reference_path: Optional[str] = None,
+                    reference_profile: Optional[Dict[str, Any]] = None,
+                    checkpoint_dir: Optional[str] = None,
+                    workers: int = 1,
+                    out_subtype: Optional[str] = None,
+                    dither: Optional[bool] = None,
+                    dither_seed: int = 0) -> Dict[str, Any]:
+    """
+    Render several presets of one target for A/B listening.
+
+    Upstream work is shared through stage checkpoints: a first wave renders
+    one variant per distinct post-stems key (decode, resample, stems and
+    every later stage its settings share with the others are computed once
+    and checkpointed), then the remaining variants resume from the deepest
+    checkpoint their settings allow. Each wave runs on up to `workers`
+    forked processes. Every master is written to <out>.NAME<ext>, plus a
+    copy attenuated to the quietest variant's loudness (<out>.NAME.matched<ext>)
+    so the comparison is not decided by level.
+    """
+    import tempfile
+
+    t0 = time.time()
+    clock = StageClock()
+    info = sf.info(target_path)
+    clock.channel.emit("audio", sr=int(info.samplerate), duration_s=round(info.frames / info.samplerate, 3))
+    own_dir = checkpoint_dir is None
+    root = tempfile.mkdtemp(prefix="auralmind-compare-") if own_dir else checkpoint_dir
+    if out_subtype is None:
+        out_subtype = "PCM_24" if str(out_path).lower().endswith(".wav") else None
+    kwargs = {
+        "reference_path": reference_path,
+        "reference_profile": reference_profile,
+        "checkpoint_dir": root,
+        "out_subtype": out_subtype,
+        "dither": dither,
+        "dither_seed": int(dither_seed),
+    }
+    results: List[Optional[Dict[str, Any]]] = [None] * len(variants)
+    try:
+        leaders: Dict[str, int] = {}
+        for i, (_, preset) in enumerate(variants):
+            keys = StageCheckpoints(root, target_path, preset, reference_path=reference_path,
+                                    reference_profile=reference_profile).keys
+            leaders.setdefault(keys["post_stems"], i)
+        waves = [sorted(leaders.values()), [i for i in range(len(variants)) if i not in leaders.values()]]
+        jobs = [(target_path, deliverable_path(out_path, name), preset, kwargs) for name, preset in variants]
+        done = 0
+        with clock.stage("compare"):
+            pool = None
+            if workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+                pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"))
+            try:
+                for wave in waves:
+                    if pool is None:
+                        finished = ((i, _render_variant(*jobs[i])) for i in wave)
+                    else:
+                        futures = {pool.submit(_render_variant, *jobs[i]): i for i in wave}
+                        finished = ((futures[fut], fut.result()) for fut in as_completed(futures))
+                    for i, res in finished:
+                        results[i] = res
+                        done += 1
+                        clock.progress("compare", done / len(variants), variants_done=done,
+                                       variants_total=len(variants), variant=variants[i][0])
+            finally:
+                if pool is not None:
+                    pool.shutdown()
+    finally:
+        if own_dir:
+            shutil.rmtree(root, ignore_errors=True)
+
+    rows: List[Dict[str, Any]] = []
+    with clock.stage("loudness_match"):
+        match_lufs = min(float(r["lufs_post"]) for r in results)
+        base_bands: Optional[List[float]] = None
+        for (name, preset), res in zip(variants, results):
+            y, sr = sf.read(res["out_path"], dtype="float32", always_2d=True)
+            gain_db = match_lufs - float(res["lufs_post"])
+            matched = (y * db_to_lin(gain_db)).astype(np.float32)
+            matched_path = deliverable_path(out_path, f"{name}.matched")
+            write_audio(matched_path, matched, sr, subtype=out_subtype, dither=dither, dither_seed=int(dither_seed))
+            bands = octave_band_levels(matched, sr)
+            base_bands = bands if base_bands is None else base_bands
+            rows.append({
+                "name": name,
+                "preset": preset.name,
+                "out_path": res["out_path"],
+                "matched_path": matched_path,
+                "matched_gain_db": round(gain_db, 3),
+                "lufs_post": float(res["lufs_post"]),
+                "true_peak_dbfs": float(res["true_peak_dbfs"]),
+                "limiter_min_gain_db": float(res["limiter_min_gain_db"]),
+                "governor_target_lufs": float(res["governor_target_lufs"]),
+                "stems": bool(res["stems"].get("enabled", False)),
+                "checkpoint_resumed_from": res["checkpoint_resumed_from"],
+                "runtime_sec": float(res["runtime_sec"]),
+                "band_levels_db": bands,
+                "band_delta_db": [round(b - a, 2) for a, b in zip(base_bands, bands)],
+                "report": res,
+            })
+    clock.close()
+    clock.channel.emit("done", runtime_s=round(time.time() - t0, 4), stage_seconds=clock.timings,
+                       stages=clock.summary())
+    log.info("[compare] %d variants  workers=%d  matched to %.2f LUFS  (%.2fs)",
+             len(variants), workers, match_lufs, time.time() - t0)
+    return {
+        "mode": "compare",
+        "match_lufs": float(match_lufs),
+        "bands_hz": list(COMPARE_BANDS_HZ),
+        "waves": [[variants[i][0] for i in wave] for wave in waves],
+        "workers": int(workers),
+        "variants": rows,
+        "runtime_sec": float(time.time() - t0),
+        "timings": {"total_s": round(time.time() - t0, 4), "stages": clock.summary()},
+    }
+
+
+def write_compare_report_markdown(report_path: str, result: Dict[str, Any]) -> None:
+    """Side-by-side summary of a --compare run with the full result appended as JSON."""
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write("# AuralMind Maestro v7.3 expert — Preset comparison\n\n")
+        f.write(f"Loudness-matched copies are attenuated to **{result['match_lufs']:.2f} LUFS**.\n\n")
+        f.write("| Variant | Preset | LUFS (post) | TP (dBFS) | Limiter GR (dB) | Match gain (dB) | Resumed from | Runtime (s) |\n")
+        f.write("|---|---|---:|---:|---:|---:|---|---:|\n")
+        for v in result["variants"]:
+            f.write(f"| {v['name']} | {v['preset']} | {v['lufs_post']:.2f} | {v['true_peak_dbfs']:.2f} | "
+                    f"{v['limiter_min_gain_db']:.2f} | {v['matched_gain_db']:.2f} | "
+                    f"{v['checkpoint_resumed_from'] or '-'} | {v['runtime_sec']:.1f} |\n")
+        f.write("\n## Octave bands after loudness matching (dB relative to the first variant)\n")
+        f.write("| Variant | " + " | ".join(f"{hz:g} Hz" for hz in result["bands_hz"]) + " |\n")
+        f.write("|---|" + "---:|" * len(result["bands_hz"]) + "\n")
+        for v in result["variants"]:
+            f.write(f"| {v['name']} | " + " | ".join(f"{d:+.2f}" for d in v["band_delta_db"]) + " |\n")
+        f.write("\n## JSON dump\n")
+        f.write("```json\n")
+        f.write(json.dumps(result, indent=2))
+        f.write("\n```\n")
+
+
+# ------------------------------------
+# Batch mode (--batch): catalog re-masters
+# ------------------------------------
+BATCH_AUDIO_EXTENSIONS = (".wav", ".flac", ".aiff", ".aif", ".ogg", ".mp3")
+BATCH_JOURNAL = "batch_journal.jsonl"
+BATCH_REFERENCE_PROFILE = "batch_reference_profile.npz"
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    """One file of a batch: where it comes from, where it goes and its own preset flags (if any)."""
+    key: str
+    target: str
+    out: str
+    report: str
+    args: Optional[Tuple[str, ...]] = None
+
+
+def _batch_outputs(out_dir: str, rel: str) -> Tuple[str, str]:
+    base = os.path.join(out_dir, os.path.splitext(rel)[0])
+    return f"{base}.wav", f"{base}.json"
+
 
-            f.write("## JSON dump\n")
-            f.write("```json\n")
-            f.write(json.dumps(result, indent=2))
-            f.write("\n```\n")
+def load_batch_items(source: str, out_dir: str, *, render: bool = True) -> List[BatchItem]:
+    """
+    Files of a batch, in a stable order. SOURCE is a directory (audio files
+    found recursively, mirrored under OUT_DIR as .wav) or a JSON-lines
+    manifest of {"target": path, "out": path?, "id": key?, "args": [flags]?};
+    relative manifest paths are taken from the manifest's directory. Keys
+    must be unique, and so must outputs when the batch renders.
+    """
+    items: List[BatchItem] = []
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() not in BATCH_AUDIO_EXTENSIONS:
+                    continue
+                rel = os.path.relpath(os.path.join(root, name), source)
+                out, report = _batch_outputs(out_dir, rel)
+                items.append(BatchItem(key=rel, target=os.path.join(root, name), out=out, report=report))
+    else:
+        base_dir = os.path.dirname(os.path.abspath(source))
+        with open(source, "r", encoding="utf-8") as f:
+            for lineno, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    target = str(entry["target"])
+                except (ValueError, KeyError, TypeError):
+                    raise ValueError(f"{source}:{lineno}: expected a JSON object with a \"target\"")
+                args = entry.get("args")
+                if args is not None and not isinstance(args, list):
+                    raise ValueError(f"{source}:{lineno}: \"args\" must be a list of flags")
+                out, report = _batch_outputs(out_dir, os.path.basename(target))
+                if entry.get("out"):
+                    out = os.path.join(out_dir, str(entry["out"]))
+                    report = f"{os.path.splitext(out)[0]}.json"
+                items.append(BatchItem(
+                    key=str(entry.get("id") or target),
+                    target=os.path.join(base_dir, target),
+                    out=out,
+                    report=report,
+                    args=tuple(str(a) for a in args) if args is not None else None,
+                ))
+    if len({i.key for i in items}) != len(items):
+        raise ValueError("batch items must have unique ids")
+    if render and len({i.out for i in items}) != len(items):
+        raise ValueError("batch items must have unique outputs")
+    return items
+
+
+def load_batch_journal(path: str) -> Dict[str, Dict[str, Any]]:
+    """Latest journal record per item key (a torn last line from an interruption is ignored)."""
+    records: Dict[str, Dict[str, Any]] = {}
+    if not os.path.isfile(path):
+        return records
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                records[str(record["key"])] = record
+            except (ValueError, KeyError, TypeError):
+                continue
+    return records
+
+
+# Set once per worker process by _batch_worker_init; shared by every file that worker renders.
+_BATCH_CONTEXT: Dict[str, Any] = {}
+
+
+def _batch_worker_init(context: Dict[str, Any]) -> None:
+    global _BATCH_CONTEXT
+    _BATCH_CONTEXT = context
+    _PROGRESS.detach()
+
+
+def _batch_render(item: BatchItem, args: argparse.Namespace) -> Dict[str, Any]:
+    """Master one batch file; failures are returned as a record, never raised."""
+    ctx = _BATCH_CONTEXT
+    t0 = time.time()
+    record: Dict[str, Any] = {"key": item.key, "target": item.target, "out": item.out, "report": item.report}
+    try:
+        preset = resolve_preset(args, reference_features=ctx["reference_features"])
+        offset = float(args.target_lufs_offset)
+        deliverables = [replace(d, target_lufs=d.target_lufs + offset) for d in map(parse_deliverable, args.deliverable)]
+        os.makedirs(os.path.dirname(os.path.abspath(item.out)) or ".", exist_ok=True)
+        with _PROGRESS.muted():
+            res = master(
+                item.target,
+                item.out,
+                preset,
+                report_path=item.report,
+                out_subtype=args.out_subtype,
+                dither=False if bool(args.no_dither) else None,
+                dither_seed=int(args.dither_seed),
+                reference_profile=ctx["reference_profile"],
+                checkpoint_dir=ctx["checkpoint_dir"],
+                deliverables=deliverables,
+                # The batch pool already has a process per core.
+                deliverable_workers=1 if ctx["workers"] > 1 else None,
+            )
+        record.update(status="ok", preset=preset.name, lufs_post=res.get("lufs_post"),
+                      true_peak_dbfs=res.get("true_peak_dbfs"))
+    except Exception as e:
+        log.exception("[batch] %s failed", item.target)
+        record.update(status="failed", error=f"{type(e).__name__}: {e}")
+    record["runtime_s"] = round(time.time() - t0, 3)
+    record["pid"] = os.getpid()
+    return record
+
+
+def run_batch(items: List[BatchItem], item_args: List[argparse.Namespace], out_dir: str, *,
+              reference_profile: Optional[Dict[str, Any]] = None, checkpoint_dir: Optional[str] = None,
+              workers: int = 1) -> Dict[str, Any]:
+    """
+    Master every item not already done according to OUT_DIR's journal.
+
+    Workers are started once and render file after file, so imports, filter
+    designs, K-weighting and cached FIR spectra stay warm, and the reference
+    is profiled once for the whole batch. Each finished file appends one
+    line to the journal; rerunning the same command after an interruption
+    skips what is done and retries what failed.
+    """
+    global _BATCH_CONTEXT
+    t0 = time.time()
+    journal_path = os.path.join(out_dir, BATCH_JOURNAL)
+    done = load_batch_journal(journal_path)
+    pending = [(item, a) for item, a in zip(items, item_args)
+               if not (done.get(item.key, {}).get("status") == "ok" and os.path.isfile(item.out))]
+    skipped = len(items) - len(pending)
+    log.info("[batch] %d files  pending=%d  skipped=%d  workers=%d", len(items), len(pending), skipped, workers)
+    context = {
+        "reference_profile": reference_profile,
+        "reference_features": reference_profile["features"] if reference_profile is not None else None,
+        "checkpoint_dir": checkpoint_dir,
+        "workers": workers,
+    }
+    counts = {"ok": 0, "failed": 0}
+    failed: List[str] = []
+    _PROGRESS.emit("stage", stage="batch", fraction=0.0, files_done=0, files_total=len(pending))
+
+    with open(journal_path, "a", encoding="utf-8") as journal:
+        def _record(record: Dict[str, Any]) -> None:
+            record["at"] = round(time.time(), 1)
+            journal.write(json.dumps(record, default=float) + "\n")
+            journal.flush()
+            counts[record["status"]] += 1
+            if record["status"] == "failed":
+                failed.append(record["key"])
+            finished = counts["ok"] + counts["failed"]
+            log.info("[batch] %d/%d  %s  %s  (%.1fs)", finished, len(pending), record["status"],
+                     record["key"], record["runtime_s"])
+            _PROGRESS.emit("stage", stage="batch", fraction=round(finished / max(1, len(pending)), 4),
+                           files_done=finished, files_total=len(pending), file=record["key"])
+
+        if workers > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_batch_worker_init,
+                                     initargs=(context,)) as pool:
+                futures = [pool.submit(_batch_render, item, a) for item, a in pending]
+                for fut in as_completed(futures):
+                    _record(fut.result())
+        else:
+            _BATCH_CONTEXT = context
+            for item, a in pending:
+                _record(_batch_render(item, a))
+
+    return {
+        "mode": "batch",
+        "files": len(items),
+        "skipped": skipped,
+        "ok": counts["ok"],
+        "failed": counts["failed"],
+        "failed_keys": failed,
+        "workers": workers,
+        "journal": journal_path,
+        "runtime_sec": round(time.time() - t0, 3),
+    }
+
+
+# ------------------------------------
+# Analysis-only mode (--analyze)
+# ------------------------------------
+ANALYZE_CHUNK_SECONDS = 10.0
+ANALYZE_TIMELINE_HOP_S = 1.0
+ANALYZE_SHORT_TERM_S = 3.0
+# Rate of the band-limited copy used for the low-band correlation and the sub f0.
+ANALYZE_LOW_RATE_HZ = 4000.0
+# Input samples of context on each side of an oversampled true-peak chunk (the polyphase filter spans ~20).
+_TP_CONTEXT = 64
+# Decimated samples per averaged sub spectrum (~0.25 Hz bins at ANALYZE_LOW_RATE_HZ).
+_F0_SEGMENT = 16384
+
+
+def _band_sums() -> Dict[str, float]:
+    return {"n": 0.0, "l": 0.0, "r": 0.0, "ll": 0.0, "rr": 0.0, "lr": 0.0}
+
+
+def _add_band_sums(acc: Dict[str, float], x: np.ndarray) -> None:
+    L = x[:, 0].astype(np.float64)
+    R = x[:, 1].astype(np.float64)
+    acc["n"] += len(L)
+    acc["l"] += float(np.sum(L))
+    acc["r"] += float(np.sum(R))
+    acc["ll"] += float(L @ L)
+    acc["rr"] += float(R @ R)
+    acc["lr"] += float(L @ R)
+
+
+def _band_corr(acc: Dict[str, float]) -> float:
+    """corrcoef_band from running sums (same silence rule: either side under 1e-6 RMS -> 0)."""
+    n = acc["n"]
+    if n < 2 or math.sqrt(acc["ll"] / n) < 1e-6 or math.sqrt(acc["rr"] / n) < 1e-6:
+        return 0.0
+    cov = acc["lr"] - acc["l"] * acc["r"] / n
+    var_l = acc["ll"] - acc["l"] ** 2 / n
+    var_r = acc["rr"] - acc["r"] ** 2 / n
+    if var_l <= 0.0 or var_r <= 0.0:
+        return 0.0
+    return float(cov / math.sqrt(var_l * var_r))
+
+
+def _lfilter_chunk(b, a, x: np.ndarray, zi: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """lfilter along axis 0 continuing from `zi` (zeros on the first chunk)."""
+    if zi is None:
+        zi = np.zeros((max(len(a), len(b)) - 1,) + x.shape[1:])
+    return sps.lfilter(b, a, x, axis=0, zi=zi)
+
+
+def _sosfilt_chunk(sos: np.ndarray, x: np.ndarray, zi: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """sosfilt along axis 0 continuing from `zi` (zeros on the first chunk)."""
+    if zi is None:
+        zi = np.zeros((sos.shape[0], 2) + x.shape[1:])
+    return sps.sosfilt(sos, x, axis=0, zi=zi)
+
+
+class StreamingLoudness:
+    """
+    integrated_loudness_lufs over consecutive chunks: the K-weighting filters
+    carry their state and the channel-mean energy is summed per 100 ms
+    sub-block, from which 400 ms gating blocks (and short-term windows) are
+    rebuilt at the end.
+    """
+
+    def __init__(self, sr: int) -> None:
+        self.sr = int(sr)
+        self.n = 0
+        self.hop = int(0.100 * sr)
+        self.block = int(0.400 * sr)
+        self._filters = k_weighting_filter(sr)
+        self._zi: List[Optional[np.ndarray]] = [None, None]
+        self._carry = np.zeros(0, dtype=np.float64)
+        self._sub_energy: List[float] = []
+
+    def push(self, y: np.ndarray) -> None:
+        self.n += y.shape[0]
+        yk = y
+        for i, (b, a) in enumerate(self._filters):
+            yk, self._zi[i] = _lfilter_chunk(b, a, yk, self._zi[i])
+            yk = yk.astype(np.float32)
+        mono_k = np.concatenate([self._carry, np.mean(yk, axis=1, dtype=np.float64)])
+        full = (len(mono_k) // self.hop) * self.hop
+        if full:
+            self._sub_energy.extend(np.sum(np.square(mono_k[:full].reshape(-1, self.hop)), axis=1).tolist())
+        self._carry = mono_k[full:]
+
+    def sub_energies(self) -> np.ndarray:
+        """K-weighted energy per 100 ms sub-block, the last one partial."""
+        energies = list(self._sub_energy)
+        if len(self._carry):
+            energies.append(float(np.sum(np.square(self._carry))))
+        return np.asarray(energies, dtype=np.float64)
+
+    def integrated(self, energies: Optional[np.ndarray] = None) -> Tuple[float, Optional[float]]:
+        """(integrated LUFS, momentary max) as integrated_loudness_lufs: 400 ms blocks every 100 ms, two gates."""
+        S = self.sub_energies() if energies is None else energies
+        cumsum = np.concatenate([[0.0], np.cumsum(S)])
+        n_blocks = len(range(0, max(1, self.n - self.block), self.hop)) if self.block > 0 and self.n else 0
+        k = np.arange(n_blocks)
+        block_energy = (cumsum[np.minimum(k + 4, len(S))] - cumsum[np.minimum(k, len(S))]) / max(1, self.block)
+        lufs = -100.0
+        momentary_max = None
+        if block_energy.size:
+            blocks = -0.691 + 10.0 * np.log10(np.maximum(block_energy, 1e-12))
+            momentary_max = float(np.max(blocks))
+            keep_abs = blocks > -70.0
+            if np.any(keep_abs):
+                lufs = float(np.mean(blocks[keep_abs]))
+                keep_rel = blocks > (lufs - 10.0)
+                if np.any(keep_rel):
+                    lufs = float(np.mean(blocks[keep_rel]))
+        return lufs, momentary_max
+
+
+@lru_cache(maxsize=8)
+def _polyphase_kernels(oversample: int) -> Tuple[Tuple[np.ndarray, int], ...]:
+    """
+    resample_poly(x, oversample, 1) as one short FIR per output phase: the
+    (kernel, lead) pairs such that phase p of the upsampled signal at input
+    position m is full-mode convolve(x, kernel)[m + lead].
+    """
+    impulse = np.zeros(2 * _TP_CONTEXT + 1)
+    impulse[_TP_CONTEXT] = 1.0
+    response = sps.resample_poly(impulse, up=int(oversample), down=1)
+    kernels = []
+    for phase in range(int(oversample)):
+        taps = response[phase::int(oversample)]
+        nz = np.flatnonzero(np.abs(taps) > 1e-12)
+        kernels.append((taps[nz[0]:nz[-1] + 1].astype(np.float32), int(_TP_CONTEXT - nz[0])))
+    return tuple(kernels)
+
+
+def _oversampled_peak(x: np.ndarray, start: int, stop: int, oversample: int) -> float:
+    """max |resample_poly(x, oversample, 1)[start * oversample:stop * oversample]| without the upsampled buffer."""
+    value = 0.0
+    for kernel, lead in _polyphase_kernels(oversample):
+        if len(kernel) == 1:
+            # The on-sample phase is (up to rounding) the input itself.
+            phase = x[start:stop] * kernel[0]
+        else:
+            phase = sps.oaconvolve(x, kernel[:, None], mode="full", axes=0)[start + lead:stop + lead]
+        value = max(value, float(np.max(np.abs(phase))))
+    return value
+
+
+class StreamingTruePeak:
+    """true_peak_estimate over consecutive chunks; the oversampler sees _TP_CONTEXT samples on each side."""
+
+    def __init__(self, oversample: int = 4) -> None:
+        self.oversample = int(oversample)
+        self.value = 0.0
+        self._tail: Optional[np.ndarray] = None
+        self._start = 0
+
+    def push(self, y: np.ndarray, final: bool = False) -> None:
+        if self.oversample <= 1:
+            if y.shape[0]:
+                self.value = max(self.value, peak(y))
+            return
+        buf = y if self._tail is None else np.concatenate([self._tail, y])
+        # Evaluate from the first sample not yet covered up to _TP_CONTEXT before the end (the rest next time).
+        start = self._start
+        stop = len(buf) if final else len(buf) - _TP_CONTEXT
+        if stop <= start:
+            self._tail = buf
+            return
+        self.value = max(self.value, _oversampled_peak(buf, start, stop, self.oversample))
+        cut = max(0, stop - _TP_CONTEXT)
+        self._tail = buf[cut:]
+        self._start = stop - cut
+
+    def finish(self) -> float:
+        if self._tail is not None:
+            self.push(self._tail[:0], final=True)
+        return self.value
+
+
+class StreamingAnalyzer:
+    """
+    analyze_track_features, the sub f0 and a short-term loudness timeline in
+    one pass over fixed-size chunks, so memory does not grow with the file.
+
+    Filters carry their state across chunks and the true-peak oversampler
+    sees _TP_CONTEXT samples on each side, so loudness, peaks, RMS, the
+    high-band correlation and the centroid match the whole-file functions up
+    to float rounding. The low-band correlation and f0 run on a copy
+    decimated to ~ANALYZE_LOW_RATE_HZ (nothing of interest lives above
+    200 Hz there); f0 averages sub spectra over the whole track instead of
+    reading the first ~5 s.
+    """
+
+    def __init__(self, sr: int) -> None:
+        self.sr = int(sr)
+        self.n = 0
+        self.channels = 2
+        self._loudness = StreamingLoudness(sr)
+        self._sum_sq = 0.0
+        self._peak = 0.0
+        self._tp = StreamingTruePeak(oversample=4)
+        self._hi_ba = butter_bandpass(2000.0, 12000.0, sr, order=2)
+        self._hi_zi: Optional[np.ndarray] = None
+        self._hi = _band_sums()
+        self._centroid_buf: List[np.ndarray] = []
+        self._centroid_n = 0
+        self._centroid_cap = int(sr * 8)
+        self.decim = max(1, int(self.sr // ANALYZE_LOW_RATE_HZ))
+        self.low_sr = self.sr / float(self.decim)
+        self._aa_sos = sps.butter(8, 0.4 * self.low_sr, btype="lowpass", fs=self.sr, output="sos")
+        self._aa_zi: Optional[np.ndarray] = None
+        self._decim_phase = 0
+        self._lo_sos = sps.butter(2, [20.0, 200.0], btype="bandpass", fs=self.low_sr, output="sos")
+        self._lo_zi: Optional[np.ndarray] = None
+        self._lo = _band_sums()
+        self._sub_sos = sps.butter(2, [28.0, 110.0], btype="bandpass", fs=self.low_sr, output="sos")
+        self._sub_zi: Optional[np.ndarray] = None
+        self._sub_buf = np.zeros(0, dtype=np.float32)
+        self._sub_power: Optional[np.ndarray] = None
+        self._sub_segments = 0
+
+    def push(self, chunk: np.ndarray) -> None:
+        y = ensure_stereo(np.asarray(chunk, dtype=np.float32))
+        if y.shape[0] == 0:
+            return
+        self.n += y.shape[0]
+        self.channels = y.shape[1]
+
+        # Level: sample peak, RMS and true peak (oversampled with context carried over).
+        self._peak = max(self._peak, float(np.max(np.abs(y))))
+        self._sum_sq += float(np.sum(np.square(y, dtype=np.float64)))
+        self._tp.push(y)
+        self._loudness.push(y)
+
+        hi, self._hi_zi = _lfilter_chunk(self._hi_ba[0], self._hi_ba[1], y, self._hi_zi)
+        _add_band_sums(self._hi, hi.astype(np.float32))
+
+        if self._centroid_n < self._centroid_cap:
+            take = np.mean(y[: self._centroid_cap - self._centroid_n], axis=1).astype(np.float32)
+            self._centroid_buf.append(take)
+            self._centroid_n += len(take)
+
+        # Low band on the decimated copy.
+        aa, self._aa_zi = _sosfilt_chunk(self._aa_sos, y, self._aa_zi)
+        low = aa[self._decim_phase::self.decim]
+        self._decim_phase = (self._decim_phase - y.shape[0]) % self.decim
+        if low.shape[0] == 0:
+            return
+        lo, self._lo_zi = _sosfilt_chunk(self._lo_sos, low, self._lo_zi)
+        _add_band_sums(self._lo, lo.astype(np.float32))
+        mid = 0.5 * (low[:, 0] + low[:, 1])
+        sub, self._sub_zi = _sosfilt_chunk(self._sub_sos, mid, self._sub_zi)
+        self._sub_buf = np.concatenate([self._sub_buf, sub.astype(np.float32)])
+        while len(self._sub_buf) >= _F0_SEGMENT:
+            self._add_sub_segment(self._sub_buf[:_F0_SEGMENT])
+            self._sub_buf = self._sub_buf[_F0_SEGMENT:]
+
+    def _add_sub_segment(self, seg: np.ndarray) -> None:
+        win = np.hanning(len(seg)).astype(np.float32)
+        power = np.abs(np.fft.rfft(seg * win, n=_F0_SEGMENT)) ** 2
+        self._sub_power = power if self._sub_power is None else self._sub_power + power
+        self._sub_segments += 1
+
+    def _short_term(self, ends: np.ndarray, cumsum: np.ndarray, window: int) -> np.ndarray:
+        if ends.size == 0:
+            return np.zeros(0)
+        starts = np.maximum(0, ends - window)
+        energy = (cumsum[ends] - cumsum[starts]) / ((ends - starts) * float(self._loudness.hop))
+        return -0.691 + 10.0 * np.log10(np.maximum(energy, 1e-12))
+
+    def finish(self) -> Dict[str, Any]:
+        tp = self._tp.finish()
+        S = self._loudness.sub_energies()
+        cumsum = np.concatenate([[0.0], np.cumsum(S)])
+        lufs, momentary_max = self._loudness.integrated(S)
+
+        # Short-term loudness (3 s windows): every second for the timeline, every 100 ms for the loudness range.
+        window = int(round(ANALYZE_SHORT_TERM_S / 0.1))
+        step = int(round(ANALYZE_TIMELINE_HOP_S / 0.1))
+        timeline = self._short_term(np.arange(step, len(S) + 1, step), cumsum, window)
+        full_windows = self._short_term(np.arange(window, len(S) + 1), cumsum, window)
+        lra = None
+        gated = full_windows[full_windows > -70.0]
+        if gated.size:
+            # EBU Tech 3342: relative gate 20 LU under the power mean, then the 10th..95th percentile spread.
+            rel = -0.691 + 10.0 * np.log10(np.mean(10.0 ** ((gated + 0.691) / 10.0)))
+            gated = gated[gated > rel - 20.0]
+            lra = float(np.percentile(gated, 95) - np.percentile(gated, 10))
+
+        rms_db = float(lin_to_db(math.sqrt(self._sum_sq / max(1, self.n * self.channels)) + 1e-12))
+        peak_db = float(lin_to_db(self._peak + 1e-12))
+
+        centroid = 0.0
+        mono = np.concatenate(self._centroid_buf) if self._centroid_buf else np.zeros(0, dtype=np.float32)
+        if len(mono) >= 2048:
+            x = mono * np.hanning(len(mono)).astype(np.float32)
+            mag = np.abs(np.fft.rfft(x))
+            freqs = np.fft.rfftfreq(len(mono), d=1.0 / self.sr)
+            centroid = float((freqs @ mag) / (np.sum(mag) + 1e-12))
+
+        if self._sub_segments == 0 and len(self._sub_buf) >= 1024:
+            self._add_sub_segment(self._sub_buf)
+        f0 = None
+        if self._sub_power is not None:
+            freqs = np.fft.rfftfreq(_F0_SEGMENT, d=1.0 / self.low_sr)
+            mask = (freqs >= 28.0) & (freqs <= 110.0)
+            if np.any(mask):
+                f0 = float(freqs[mask][int(np.argmax(self._sub_power[mask]))])
+
+        return {
+            "features": {
+                "lufs": lufs,
+                "tp_dbfs": float(lin_to_db(tp + 1e-12)),
+                "peak_dbfs": peak_db,
+                "rms_dbfs": rms_db,
+                "crest_db": float(peak_db - rms_db),
+                "corr_hi": _band_corr(self._hi),
+                "corr_lo": _band_corr(self._lo),
+                "centroid_hz": centroid,
+            },
+            "f0_hz": f0,
+            "loudness": {
+                "integrated_lufs": lufs,
+                "momentary_max_lufs": momentary_max,
+                "short_term_max_lufs": float(np.max(timeline)) if timeline.size else None,
+                "loudness_range_lu": lra,
+                "timeline_hop_s": ANALYZE_TIMELINE_HOP_S,
+                "short_term_window_s": ANALYZE_SHORT_TERM_S,
+                "short_term_lufs": [round(float(v), 2) for v in timeline],
+            },
+        }
+
+
+def analyze_file(path: str) -> Dict[str, Any]:
+    """Measure one file without rendering: features, sub f0 and loudness timeline (chunked reads)."""
+    t0 = time.time()
+    with sf.SoundFile(path) as f:
+        analyzer = StreamingAnalyzer(f.samplerate)
+        for block in f.blocks(blocksize=int(ANALYZE_CHUNK_SECONDS * f.samplerate), dtype="float32", always_2d=True):
+            analyzer.push(block)
+        source = {"sr": int(f.samplerate), "channels": int(f.channels), "format": f.format, "subtype": f.subtype}
+    result = analyzer.finish()
+    return {
+        "target": os.path.basename(path),
+        **source,
+        "duration_s": round(analyzer.n / float(analyzer.sr), 3),
+        **result,
+        "analysis_seconds": round(time.time() - t0, 4),
+    }
+
+
+def _analysis_worker_init() -> None:
+    _PROGRESS.detach()
+
+
+def _analyze_record(item: BatchItem) -> Dict[str, Any]:
+    record: Dict[str, Any] = {"key": item.key, "target": item.target}
+    try:
+        record.update(status="ok", **analyze_file(item.target))
+        record["target"] = item.target
+    except Exception as e:
+        record.update(status="failed", error=f"{type(e).__name__}: {e}")
+    return record
+
+
+def analyze_batch(items: List[BatchItem], out_path: str, *, workers: int = 1) -> Dict[str, Any]:
+    """
+    Analyse every item into OUT_PATH, one JSON line per file as it finishes.
+    Lines already there with status "ok" are skipped, so an interrupted scan
+    resumes where it stopped; failed files are retried.
+    """
+    t0 = time.time()
+    done = load_batch_journal(out_path)
+    pending = [item for item in items if done.get(item.key, {}).get("status") != "ok"]
+    skipped = len(items) - len(pending)
+    log.info("[analyze] %d files  pending=%d  skipped=%d  workers=%d", len(items), len(pending), skipped, workers)
+    counts = {"ok": 0, "failed": 0}
+    failed: List[str] = []
+    audio_s = 0.0
+    _PROGRESS.emit("stage", stage="analyze", fraction=0.0, files_done=0, files_total=len(pending))
+
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)) or ".", exist_ok=True)
+    with open(out_path, "a", encoding="utf-8") as out:
+        def _record(record: Dict[str, Any]) -> None:
+            nonlocal audio_s
+            out.write(json.dumps(record, default=float) + "\n")
+            out.flush()
+            counts[record["status"]] += 1
+            if record["status"] == "failed":
+                failed.append(record["key"])
+                log.warning("[analyze] %s failed: %s", record["key"], record["error"])
+            audio_s += float(record.get("duration_s") or 0.0)
+            finished = counts["ok"] + counts["failed"]
+            _PROGRESS.emit("stage", stage="analyze", fraction=round(finished / max(1, len(pending)), 4),
+                           files_done=finished, files_total=len(pending), file=record["key"])
+
+        if workers > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_analysis_worker_init) as pool:
+                for fut in as_completed([pool.submit(_analyze_record, item) for item in pending]):
+                    _record(fut.result())
+        else:
+            for item in pending:
+                _record(_analyze_record(item))
+
+    runtime = time.time() - t0
+    log.info("[analyze] %d ok  %d failed  %.1fs audio in %.2fs", counts["ok"], counts["failed"], audio_s, runtime)
+    return {
+        "mode": "analyze",
+        "files": len(items),
+        "skipped": skipped,
+        "ok": counts["ok"],
+        "failed": counts["failed"],
+        "failed_keys": failed,
+        "workers": workers,
+        "out": out_path,
+        "audio_seconds": round(audio_s, 3),
+        "runtime_sec": round(runtime, 3),
+    }
+
+
+# ------------------------------------
+# Loudness normalization (normalize preset)
+# ------------------------------------
+NORMALIZE_CHUNK_SECONDS = 10.0
+
+
+def limiter_smooth_gain_runs(raw: np.ndarray, g: Optional[float], attack: int,
+                             release: int) -> Tuple[np.ndarray, float]:
+    """
+    limiter_smooth_gain for one chunk, resumable: `g` is the smoother state
+    after the previous chunk (None on the first, which starts at raw[0]).
+    Only samples under reduction (raw < 1) run the per-sample recurrence;
+    between them the target is 1, so release has the closed form
+    1 - (1 - g) * q**k with q = 1 - 1/release. Returns (gains, state).
+    """
+    n = len(raw)
+    out = np.empty(n, dtype=np.float32)
+    if n == 0:
+        return out, (1.0 if g is None else g)
+    g = float(raw[0]) if g is None else float(g)
+    q = 1.0 - 1.0 / release
+    under = raw < 1.0
+    edges = np.flatnonzero(np.diff(under.astype(np.int8))) + 1
+    bounds = np.concatenate([[0], edges, [n]])
+    for s, e in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        if under[s]:
+            vals = raw[s:e].tolist()
+            run = [0.0] * len(vals)
+            for i, x in enumerate(vals):
+                if x < g:
+                    g = g + (x - g) / attack
+                else:
+                    g = g + (x - g) / release
+                run[i] = g
+            out[s:e] = run
+        else:
+            tail = (1.0 - g) * q ** np.arange(1, e - s + 1, dtype=np.float64)
+            out[s:e] = 1.0 - tail
+            g = 1.0 - float(tail[-1])
+    return out, g
+
+
+def limiter_detector(y: np.ndarray, stereo_link: float) -> np.ndarray:
+    """true_peak_limiter_v2's linked level: max(|L|, |R|) blended with |mid|."""
+    inst_max = np.maximum(np.abs(y[:, 0]), np.abs(y[:, 1]))
+    mid = np.abs(0.5 * (y[:, 0] + y[:, 1]))
+    return (stereo_link * inst_max + (1.0 - stereo_link) * mid).astype(np.float32)
+
+
+class StreamingLimiter:
+    """
+    true_peak_limiter_v2 over consecutive chunks, without its ISP correction
+    (the caller measures the true peak of the whole output and corrects
+    once). The centred lookahead window needs `ahead` samples past each
+    output sample, so output lags input by that much until flush().
+    """
+
+    def __init__(self, sr: int, ceiling_dbfs: float, *, lookahead_ms: float = 3.0, attack_ms: float = 0.6,
+                 release_ms: float = 80.0, stereo_link: float = 0.92) -> None:
+        self.ceiling = float(db_to_lin(ceiling_dbfs))
+        self.stereo_link = float(stereo_link)
+        self.win = max(16, int(sr * (lookahead_ms / 1000.0)))
+        self.behind = self.win // 2
+        self.ahead = (self.win - 1) // 2
+        self.attack = max(1, int(sr * attack_ms / 1000.0))
+        self.release = max(1, int(sr * release_ms / 1000.0))
+        self.min_gain = 1.0
+        self.gain_sum = 0.0
+        self.n = 0
+        self._g: Optional[float] = None
+        self._levels: Optional[np.ndarray] = None
+        self._audio = np.zeros((0, 2), dtype=np.float32)
+
+    def push(self, y: np.ndarray, final: bool = False) -> np.ndarray:
+        """Limit a stereo chunk; returns the output that is complete so far."""
+        new = limiter_detector(y, self.stereo_link)
+        if self._levels is None:
+            if not len(new):
+                return y[:0]
+            # maximum_filter1d(mode="nearest") repeats the first level before the start.
+            self._levels = np.full(self.behind, new[0], dtype=np.float32)
+        levels = np.concatenate([self._levels, new])
+        audio = np.concatenate([self._audio, y]) if len(self._audio) else y
+        if final:
+            levels = np.concatenate([levels, np.full(self.ahead, levels[-1], dtype=np.float32)])
+            m = len(audio)
+        else:
+            m = max(0, len(audio) - self.ahead)
+        env = maximum_filter1d(levels, size=self.win, mode="nearest")[self.behind:self.behind + m]
+        raw = np.minimum(1.0, self.ceiling / np.maximum(env, 1e-9)).astype(np.float32)
+        g, self._g = limiter_smooth_gain_runs(raw, self._g, self.attack, self.release)
+        if m:
+            self.min_gain = min(self.min_gain, float(np.min(g)))
+            self.gain_sum += float(np.sum(g, dtype=np.float64))
+            self.n += m
+        self._levels = levels[m:self.behind + len(audio)]
+        self._audio = audio[m:]
+        return (audio[:m] * g[:, None]).astype(np.float32)
+
+    def flush(self) -> np.ndarray:
+        return self.push(np.zeros((0, 2), dtype=np.float32), final=True)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "min_gain_db": float(lin_to_db(self.min_gain)),
+            "avg_gr_db": float(lin_to_db(self.gain_sum / max(1, self.n) + 1e-12)),
+        }
+
+
+def _highpassed_blocks(path: str, blocksize: int) -> Iterator[np.ndarray]:
+    """Stereo float32 chunks of `path` through master()'s safety HPF (20 Hz, state carried)."""
+    with sf.SoundFile(path) as f:
+        b, a = butter_highpass(20.0, f.samplerate, order=2)
+        zi = None
+        for block in f.blocks(blocksize=blocksize, dtype="float32", always_2d=True):
+            y, zi = _lfilter_chunk(b, a, ensure_stereo(block), zi)
+            yield y.astype(np.float32)
+
+
+def normalize_governor(preset: Preset, *, pre_lufs: float, detector_peak: float, true_peak: float,
+                       steps: int) -> Tuple[float, List[Dict[str, Any]]]:
+    """
+    loudness_governor's binary search without rendering candidates. With
+    the gain fixed, the limiter's deepest reduction is set by the loudest
+    detector level, min(1, ceiling / (gain * peak)), and the limiter holds
+    the ceiling; without a limiter the true peak scales with the gain.
+    Returns the accepted target and the (predicted) candidates.
+    """
+    candidates: List[Dict[str, Any]] = []
+    ceiling = float(db_to_lin(preset.ceiling_dbfs))
+    limiter = bool(getattr(preset, "enable_limiter", True))
+
+    def _predict(target_lufs: float) -> Tuple[bool, Dict[str, Any]]:
+        gain = float(db_to_lin(target_lufs - pre_lufs))
+        min_gain_db = float(lin_to_db(min(1.0, ceiling / max(gain * detector_peak, 1e-9)))) if limiter else 0.0
+        tp_dbfs = float(preset.ceiling_dbfs) if limiter else float(lin_to_db(gain * true_peak + 1e-12))
+        ok = min_gain_db > float(preset.governor_gr_limit_db) and tp_dbfs <= float(preset.ceiling_dbfs + 0.10)
+        candidates.append({
+            "target_lufs": round(float(target_lufs), 4),
+            "post_lufs": round(float(target_lufs), 3),
+            "tp_dbfs": round(tp_dbfs, 3),
+            "min_gain_db": round(min_gain_db, 3),
+            "predicted": True,
+            "accepted": ok,
+        })
+        return ok, candidates[-1]
+
+    allow_above = float(getattr(preset, "governor_allow_above_db", 0.0))
+    high = float(preset.target_lufs + allow_above)
+    low = float(preset.target_lufs + preset.governor_step_db * max(1, int(preset.governor_iters)))
+    if low > high:
+        low, high = high, low
+
+    best: Optional[float] = None
+    lo, hi = low, high
+    for _ in range(steps):
+        mid = 0.5 * (lo + hi)
+        ok, _cand = _predict(mid)
+        if ok:
+            best, lo = mid, mid
+        else:
+            hi = mid
+    if best is None:
+        _ok, cand = _predict(low)
+        cand["accepted"] = True
+        cand["fallback"] = True
+        best = low
+    return best, candidates
+
+
+def _normalize_render(target_path: str, out_path: str, preset: Preset, *, sr: int, frames: int, pre_lufs: float,
+                      target_lufs: float, subtype: Optional[str], dither: Optional[bool], dither_seed: int,
+                      clock: StageClock, deliverable: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+    """
+    Gain to `target_lufs`, limit and export one file in two streamed passes:
+    HPF + gain + StreamingLimiter into a float32 scratch file while the true
+    peak and loudness are measured, then the ISP correction (one gain for
+    the whole file, as true_peak_limiter_v2 does), dither and write.
+    Deliverable `(index, count)` renders report inside the "deliver" stage.
+    """
+    def _stage(name: str):
+        return clock.stage(name) if deliverable is None else nullcontext()
+
+    def _progress(name: str, phase: int, fraction: float) -> None:
+        if deliverable is None:
+            clock.progress(name, fraction)
+        else:
+            clock.progress("deliver", (deliverable[0] + 0.5 * (phase + fraction)) / deliverable[1])
+
+    blocksize = int(NORMALIZE_CHUNK_SECONDS * sr)
+    gain = float(db_to_lin(target_lufs - pre_lufs))
+    ceiling = float(db_to_lin(preset.ceiling_dbfs))
+    limiter = StreamingLimiter(
+        sr, preset.ceiling_dbfs,
+        lookahead_ms=float(getattr(preset, "limiter_lookahead_ms", 3.0)),
+        attack_ms=float(preset.limiter_attack_ms),
+        release_ms=float(preset.limiter_release_ms),
+        stereo_link=float(getattr(preset, "limiter_stereo_link", 0.92)),
+    ) if getattr(preset, "enable_limiter", True) else None
+    tp_meter = StreamingTruePeak(int(preset.limiter_oversample))
+    loudness = StreamingLoudness(sr)
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)) or ".", exist_ok=True)
+    scratch = os.path.join(os.path.dirname(os.path.abspath(out_path)), f".normalize-{uuid.uuid4().hex}.f32")
+    try:
+        with _stage("normalize_limit"):
+            with open(scratch, "wb") as fh:
+                done = 0
+
+                def _emit(chunk: np.ndarray) -> None:
+                    if len(chunk):
+                        tp_meter.push(chunk)
+                        loudness.push(chunk)
+                        chunk.tofile(fh)
+
+                for y in _highpassed_blocks(target_path, blocksize):
+                    y = (y * gain).astype(np.float32)
+                    _emit(limiter.push(y) if limiter is not None else y)
+                    done += len(y)
+                    _progress("normalize_limit", 0, done / max(1, frames))
+                if limiter is not None:
+                    _emit(limiter.flush())
+            tp_lin = tp_meter.finish()
+            lufs_limited, _ = loudness.integrated()
+
+        corr = 1.0
+        if limiter is not None and tp_lin > ceiling:
+            corr = ceiling / max(tp_lin, 1e-9)
+        bits = _pcm_bits_from_subtype(subtype)
+        rng = np.random.default_rng(int(dither_seed)) if bits is not None and dither is not False else None
+        with _stage("normalize_write"):
+            with open(scratch, "rb") as fh, sf.SoundFile(out_path, "w", samplerate=sr, channels=2,
+                                                         subtype=subtype) as out:
+                done = 0
+                while True:
+                    y = np.fromfile(fh, dtype=np.float32, count=2 * blocksize).reshape(-1, 2)
+                    if not len(y):
+                        break
+                    if corr != 1.0:
+                        y *= np.float32(corr)
+                    out.write(tpdf_dither(y, bits, rng=rng) if rng is not None else y)
+                    done += len(y)
+                    _progress("normalize_write", 1, done / max(1, frames))
+    finally:
+        if os.path.exists(scratch):
+            os.remove(scratch)
+
+    stats = limiter.stats() if limiter is not None else {"min_gain_db": 0.0, "avg_gr_db": 0.0}
+    corr_db = float(lin_to_db(corr))
+    return {
+        "out_path": out_path,
+        "subtype": subtype,
+        "gain_db": float(target_lufs - pre_lufs),
+        # A constant gain moves every gating block by the same amount (the -70 LUFS gate aside).
+        "lufs_post": float(lufs_limited + corr_db) if lufs_limited > -100.0 else float(lufs_limited),
+        "true_peak_dbfs": float(lin_to_db(tp_lin * corr + 1e-12)),
+        "limiter_min_gain_db": float(stats["min_gain_db"] + corr_db),
+        "limiter_avg_gr_db": float(stats["avg_gr_db"] + corr_db),
+        "isp_correction_db": corr_db,
+    }
+
+
+def normalize(target_path: str, out_path: str, preset: Preset, report_path: Optional[str] = None, *,
+              out_subtype: Optional[str] = None, dither: Optional[bool] = None, dither_seed: int = 0,
+              profiler: Optional[StageProfiler] = None,
+              deliverables: Optional[List[Deliverable]] = None) -> Dict[str, Any]:
+    """
+    The normalize preset: master()'s safety HPF, loudness governor, TP
+    limiter and export, and nothing else, streamed in NORMALIZE_CHUNK_SECONDS
+    chunks at the source rate so memory does not grow with the file.
+
+    One scan measures the loudness and the limiter's detector peak; the
+    governor predicts each candidate from those instead of rendering it
+    (normalize_governor), and each output (the main one, then every
+    deliverable) costs one limiting and one writing pass.
+    """
+    t0 = time.time()
+    clock = StageClock(profiler=profiler)
+    log.info("[normalize] preset=%s  target=%s", preset.name, target_path)
+    with sf.SoundFile(target_path) as f:
+        sr, frames = int(f.samplerate), int(f.frames)
+    clock.channel.emit("audio", sr=sr, duration_s=round(frames / sr, 3))
+    blocksize = int(NORMALIZE_CHUNK_SECONDS * sr)
+    limiter_on = bool(getattr(preset, "enable_limiter", True))
+    link = float(getattr(preset, "limiter_stereo_link", 0.92))
+
+    with clock.stage("normalize_scan"):
+        loudness = StreamingLoudness(sr)
+        tp_meter = StreamingTruePeak(int(preset.limiter_oversample)) if not limiter_on else None
+        detector_peak = 0.0
+        for y in _highpassed_blocks(target_path, blocksize):
+            loudness.push(y)
+            if tp_meter is not None:
+                tp_meter.push(y)
+            elif len(y):
+                detector_peak = max(detector_peak, float(np.max(limiter_detector(y, link))))
+            clock.progress("normalize_scan", loudness.n / max(1, frames))
+        pre_lufs, _ = loudness.integrated()
+        source_tp = tp_meter.finish() if tp_meter is not None else 0.0
+    log.info("[normalize] scan  LUFS=%.2f  %s=%.2f dBFS  (%.3fs)", pre_lufs,
+             "detector peak" if limiter_on else "true peak",
+             lin_to_db((detector_peak if limiter_on else source_tp) + 1e-12), time.time() - t0)
+
+    steps = int(getattr(preset, "governor_search_steps", 11))
+
+    def _render(p: Preset, path: str, subtype: Optional[str],
+                deliverable: Optional[Tuple[int, int]] = None) -> Tuple[Dict[str, Any], float, List]:
+        target, candidates = normalize_governor(p, pre_lufs=pre_lufs, detector_peak=detector_peak,
+                                                true_peak=source_tp, steps=steps)
+        res = _normalize_render(target_path, path, p, sr=sr, frames=frames, pre_lufs=pre_lufs, target_lufs=target,
+                                subtype=subtype, dither=dither, dither_seed=dither_seed, clock=clock,
+                                deliverable=deliverable)
+        return res, target, candidates
+
+    if out_subtype is None:
+        out_subtype = "PCM_24" if str(out_path).lower().endswith(".wav") else None
+    main, governor_target, governor_candidates = _render(preset, out_path, out_subtype)
+    log.info("[normalize] %s  LUFS=%.2f  TP=%.2f dBTP  GR=%.2f dB  ISP=%.2f dB",
+             out_path, main["lufs_post"], main["true_peak_dbfs"], main["limiter_min_gain_db"],
+             main["isp_correction_db"])
+
+    deliverable_results: List[Dict[str, Any]] = []
+    if deliverables:
+        with clock.stage("deliver"):
+            for i, d in enumerate(deliverables):
+                d_t = time.time()
+                p = replace(preset, target_lufs=float(d.target_lufs), ceiling_dbfs=float(d.ceiling_dbfs))
+                res, target, candidates = _render(p, deliverable_path(out_path, d.name), d.subtype or out_subtype,
+                                                  (i, len(deliverables)))
+                deliverable_results.append({
+                    "name": d.name,
+                    "out_path": res["out_path"],
+                    "subtype": res["subtype"],
+                    "target_lufs_requested": float(d.target_lufs),
+                    "ceiling_dbfs": float(d.ceiling_dbfs),
+                    "governor_target_lufs": float(target),
+                    "lufs_post": res["lufs_post"],
+                    "true_peak_dbfs": res["true_peak_dbfs"],
+                    "limiter_min_gain_db": res["limiter_min_gain_db"],
+                    "limiter_avg_gr_db": res["limiter_avg_gr_db"],
+                    "runtime_sec": round(time.time() - d_t, 4),
+                    "governor_candidates": candidates,
+                })
+                clock.progress("deliver", (i + 1) / len(deliverables), deliverables_done=i + 1,
+                               deliverables_total=len(deliverables))
+        log.info("[normalize] deliverables  %s",
+                 "  ".join(f"{r['name']}={r['lufs_post']:.1f} LUFS/{r['true_peak_dbfs']:.2f} dBTP"
+                           for r in deliverable_results))
+
+    runtime = time.time() - t0
+    log.info("[normalize] TOTAL runtime=%.2fs  (%.1fx realtime)  out=%s",
+             runtime, (frames / sr) / max(runtime, 1e-9), out_path)
+    clock.close()
+    clock.channel.emit("done", runtime_s=round(runtime, 4), stage_seconds=clock.timings, stages=clock.summary())
+
+    result = {
+        "preset": preset.name,
+        "mode": "normalize",
+        "sr": sr,
+        "target_lufs_requested": preset.target_lufs,
+        "governor_target_lufs": float(governor_target),
+        "governor_steps": int(steps),
+        "governor_gr_limit_db": float(preset.governor_gr_limit_db),
+        "lufs_pre": float(pre_lufs),
+        "lufs_post": main["lufs_post"],
+        "true_peak_dbfs": main["true_peak_dbfs"],
+        "limiter_mode": "v2-streaming" if limiter_on else "off",
+        "limiter_min_gain_db": main["limiter_min_gain_db"],
+        "limiter_avg_gr_db": main["limiter_avg_gr_db"],
+        "isp_correction_db": main["isp_correction_db"],
+        "softclip_mix_effective": 0.0,
+        "stems": {"enabled": False},
+        "deliverables": [{k: v for k, v in r.items() if k != "governor_candidates"} for r in deliverable_results],
+        "checkpoint_resumed_from": None,
+        "runtime_sec": float(runtime),
+        "timings": {
+            "total_s": round(runtime, 4),
+            "stages": clock.summary(),
+            "governor_candidates": governor_candidates,
+            "deliverable_governor_candidates": {r["name"]: r["governor_candidates"] for r in deliverable_results},
+        },
+        "out_path": out_path,
+    }
 
+    if report_path:
+        os.makedirs(os.path.dirname(os.path.abspath(report_path)) or ".", exist_ok=True)
+        if str(report_path).lower().endswith(".json"):
+            write_report_json(report_path, result)
+        else:
+            write_normalize_report_markdown(report_path, result)
     return result
 
 
+def write_normalize_report_markdown(report_path: str, result: Dict[str, Any]) -> None:
+    """Summary of a normalize run with the full result appended as JSON."""
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write("# AuralMind Maestro v7.3 expert — Loudness normalization\n\n")
+        f.write(f"- Preset: **{result['preset']}**  (sample rate {result['sr']} Hz)\n")
+        f.write(f"- Loudness: {result['lufs_pre']:.2f} → **{result['lufs_post']:.2f} LUFS** "
+                f"(requested {result['target_lufs_requested']:.2f}, governor {result['governor_target_lufs']:.2f})\n")
+        f.write(f"- True peak: **{result['true_peak_dbfs']:.2f} dBTP**  (ISP correction {result['isp_correction_db']:.2f} dB)\n")
+        f.write(f"- Limiter: min gain {result['limiter_min_gain_db']:.2f} dB, "
+                f"average {result['limiter_avg_gr_db']:.2f} dB\n")
+        f.write(f"- Runtime: {result['runtime_sec']:.2f} s\n")
+        if result["deliverables"]:
+            f.write("\n## Deliverables\n")
+            f.write("| Name | Target (LUFS) | LUFS (post) | TP (dBFS) | Limiter GR (dB) | File |\n")
+            f.write("|---|---:|---:|---:|---:|---|\n")
+            for d in result["deliverables"]:
+                f.write(f"| {d['name']} | {d['target_lufs_requested']:.1f} | {d['lufs_post']:.2f} | "
+                        f"{d['true_peak_dbfs']:.2f} | {d['limiter_min_gain_db']:.2f} | "
+                        f"{os.path.basename(d['out_path'])} |\n")
+        f.write("\n## JSON dump\n")
+        f.write("```json\n")
+        f.write(json.dumps(result, indent=2))
+        f.write("\n```\n")
+
+
+# ------------------------------------
+# Host calibration (--calibrate)
+# ------------------------------------
+
+def _calibration_signal(duration_s: float, sr: int, seed: int = 0) -> np.ndarray:
+    """Deterministic stereo test mix (kick, sub, noise bursts, pad) for timing runs."""
+    rng = np.random.default_rng(seed)
+    n = int(round(duration_s * sr))
+    t = np.arange(n) / sr
+    beat = (t * 2.0) % 1.0  # 120 BPM
+    kick = np.sin(2 * np.pi * (50.0 + 80.0 * np.exp(-beat / 0.03)) * t) * np.exp(-beat / 0.12)
+    sub = 0.4 * np.tanh(2.0 * np.sin(2 * np.pi * 41.2 * t))
+    hiss = 0.15 * rng.standard_normal((n, 2)) * (np.sin(2 * np.pi * 1.5 * t) > 0.9)[:, None]
+    pad = 0.1 * np.stack([np.sin(2 * np.pi * 196.0 * t), np.sin(2 * np.pi * 246.9 * t + 0.7)], axis=1)
+    y = pad + hiss + (0.8 * kick + sub)[:, None]
+    return (0.7 * y / (np.max(np.abs(y)) + 1e-12)).astype(np.float32)
+
+
+def calibrate(out_path: str, preset: Preset, durations: List[float]) -> Dict[str, Any]:
+    """
+    Time `master()` on this machine and write observations for the backend
+    cost model (runtime, peak RSS and per-stage seconds vs. duration, input
+    sample rate and features). Each duration is rendered at 44.1 kHz, at
+    48 kHz and at 44.1 kHz with a reference.
+    """
+    import platform
+    import tempfile
+
+    sampler = RssSampler()
+    sampler.start()
+    observations: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="auralmind-calibrate-") as tmp:
+        for duration in durations:
+            for sr_in, with_reference in ((44100, False), (48000, False), (44100, True)):
+                target = os.path.join(tmp, f"target_{duration:g}_{sr_in}.wav")
+                sf.write(target, _calibration_signal(duration, sr_in, seed=1), sr_in, subtype="PCM_24")
+                reference = None
+                if with_reference:
+                    reference = os.path.join(tmp, f"reference_{duration:g}.wav")
+                    sf.write(reference, _calibration_signal(duration, 44100, seed=2), 44100, subtype="PCM_24")
+                sampler.reset()
+                t0 = time.time()
+                res = master(target, os.path.join(tmp, "out.wav"), preset, reference_path=reference)
+                runtime = time.time() - t0
+                stems_on = bool((res.get("stems") or {}).get("enabled", False))
+                observations.append({
+                    "duration_s": float(duration),
+                    "sr": int(sr_in),
+                    # Same keys as backend/costmodel.py FEATURES.
+                    "features": {
+                        "stems": stems_on,
+                        "stems_auto": False,
+                        "reference": with_reference and not preset.normalize_only,
+                        "hooklift": bool(preset.enable_hooklift),
+                        "transient": bool(getattr(preset, "enable_transient_sculpt", True)) and preset.transient_sculpt_mix > 0,
+                        "resample": sr_in != 48000 and not preset.normalize_only,
+                        "deliverables": 0,
+                        "normalize": bool(preset.normalize_only),
+                    },
+                    "runtime_s": round(runtime, 3),
+                    "peak_rss_bytes": int(sampler.peak()),
+                    "stages": {name: s["wall_s"] for name, s in res["timings"]["stages"].items()},
+                })
+                log.info("[calibrate] dur=%.0fs  sr=%d  reference=%s  runtime=%.2fs  (%.3f x realtime)",
+                         duration, sr_in, with_reference, runtime, runtime / duration)
+    sampler.stop()
+
+    payload = {
+        "kind": "auralmind-calibration",
+        "host": platform.node(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "preset": preset.name,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "observations": observations,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    write_report_json(out_path, payload)
+    return payload
+
+
+# ------------------------------------
+# Reference profiles (--build-reference-profile / --reference-profile)
+# ------------------------------------
+
+REFERENCE_PROFILE_VERSION = 1
+
+
+def build_reference_profile(reference_path: str, out_path: str, sr: int = 48000) -> Dict[str, Any]:
+    """
+    Precompute what a job needs from a reference: the MID spectrum that
+    match_eq_curve compares against, the --auto features and the sub f0.
+    Written as a small .npz (spectrum array + JSON metadata) so repeated
+    jobs against the same reference skip decoding and analysing it.
+    """
+    t0 = time.time()
+    y_r, y_native, sr_r = load_reference(reference_path, sr)
+    mid_mag = reference_mid_spectrum(y_r)
+    f0 = estimate_sub_fundamental_hz(y_r, sr)
+    meta = {
+        "version": REFERENCE_PROFILE_VERSION,
+        "sr": int(sr),
+        "source_sr": int(sr_r),
+        "duration_s": round(y_native.shape[0] / float(sr_r), 3),
+        "n_fft": MATCH_EQ_NFFT,
+        "hop": MATCH_EQ_HOP,
+        "features": analyze_track_features(y_native, sr_r),
+        "f0_hz": float(f0) if f0 is not None else None,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, "wb") as f:
+        np.savez(f, mid_mag=mid_mag.astype(np.float32), meta=np.array(json.dumps(meta)))
+    log.info("[profile] reference=%s  dur=%.1fs  LUFS=%.1f  (%.3fs)",
+             reference_path, meta["duration_s"], meta["features"]["lufs"], time.time() - t0)
+    return meta
+
+
+def load_reference_profile(path: str) -> Dict[str, Any]:
+    """Read a profile written by build_reference_profile (metadata plus `mid_mag` and `path`)."""
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data["meta"]))
+        mid_mag = np.asarray(data["mid_mag"], dtype=np.float32)
+    if meta.get("version") != REFERENCE_PROFILE_VERSION:
+        raise ValueError(f"unsupported reference profile version {meta.get('version')!r} in {path}")
+    if meta.get("n_fft") != MATCH_EQ_NFFT or meta.get("hop") != MATCH_EQ_HOP:
+        raise ValueError(f"reference profile {path} uses a different match-EQ analysis size")
+    meta["mid_mag"] = mid_mag
+    meta["path"] = path
+    return meta
+
+
+# Reference index: one unit vector per stored profile, searched by cosine similarity.
+REFERENCE_ENVELOPE_BANDS = np.geomspace(30.0, 16000.0, 25)
+REFERENCE_VECTOR_DIMS = len(REFERENCE_ENVELOPE_BANDS) - 1 + 4
+
+
+def reference_vector(mid_mag: np.ndarray, sr: int, features: Dict[str, float]) -> np.ndarray:
+    """
+    Similarity vector for a track: its log-band MID spectral envelope
+    (level removed, so only tonal shape counts) followed by crest, LUFS and
+    the low/high band stereo correlations, each scaled to a comparable
+    range. Returned unit-length so a dot product is the cosine similarity.
+    """
+    mag = np.asarray(mid_mag, dtype=np.float64)
+    freqs = np.linspace(0.0, sr / 2.0, mag.shape[0])
+    power = mag * mag
+    env = np.empty(len(REFERENCE_ENVELOPE_BANDS) - 1)
+    for i, (lo, hi) in enumerate(zip(REFERENCE_ENVELOPE_BANDS[:-1], REFERENCE_ENVELOPE_BANDS[1:])):
+        band = power[(freqs >= lo) & (freqs < hi)]
+        env[i] = 10.0 * np.log10(float(np.mean(band)) + 1e-20) if band.size else -200.0
+    env = np.maximum(env, env.max() - 80.0)
+    env = (env - env.mean()) / 6.0
+    scalars = np.array([
+        (float(features.get("crest_db", 10.0)) - 10.0) / 3.0,
+        (float(features.get("lufs", -14.0)) + 14.0) / 4.0,
+        float(features.get("corr_lo", 1.0)) * 2.0,
+        float(features.get("corr_hi", 0.5)) * 2.0,
+    ])
+    vec = np.concatenate([env, scalars])
+    return (vec / max(float(np.linalg.norm(vec)), 1e-9)).astype(np.float32)
+
+
+def build_reference_index(library_dir: str) -> Dict[str, Any]:
+    """
+    Index every `<id>/profile.npz` under `library_dir` into `index.npy`
+    (N x REFERENCE_VECTOR_DIMS, unit rows) plus `index.json` (ids and
+    profile paths). Only profiles are read, never reference audio.
+    """
+    rows: List[np.ndarray] = []
+    ids: List[str] = []
+    profiles: List[str] = []
+    for name in sorted(os.listdir(library_dir)):
+        path = os.path.join(library_dir, name, "profile.npz")
+        if not os.path.isfile(path):
+            continue
+        try:
+            prof = load_reference_profile(path)
+        except (OSError, ValueError, KeyError):
+            log.warning("[index] skipping unreadable profile %s", path)
+            continue
+        rows.append(reference_vector(prof["mid_mag"], int(prof["sr"]), prof.get("features") or {}))
+        ids.append(name)
+        profiles.append(os.path.join(name, "profile.npz"))
+    matrix = np.stack(rows) if rows else np.zeros((0, REFERENCE_VECTOR_DIMS), dtype=np.float32)
+    # Matrix first: readers trust index.json, so a row count mismatch means a rebuild is in flight.
+    for final, write in (
+        ("index.npy", lambda f: np.save(f, matrix)),
+        ("index.json", lambda f: f.write(json.dumps(
+            {"version": 1, "dims": REFERENCE_VECTOR_DIMS, "ids": ids, "profiles": profiles}
+        ).encode("utf-8"))),
+    ):
+        tmp = os.path.join(library_dir, final + ".tmp")
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, os.path.join(library_dir, final))
+    log.info("[index] %d reference profile(s) indexed in %s", len(ids), library_dir)
+    return {"references": len(ids), "dims": REFERENCE_VECTOR_DIMS}
+
+
+def nearest_references(index_dir: str, vector: np.ndarray, k: int = 3) -> List[Dict[str, Any]]:
+    """Top-k stored references by cosine similarity; the matrix is memory-mapped, not read."""
+    with open(os.path.join(index_dir, "index.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("dims") != REFERENCE_VECTOR_DIMS:
+        raise ValueError(f"reference index in {index_dir} has {meta.get('dims')} dims, expected {REFERENCE_VECTOR_DIMS}")
+    matrix = np.load(os.path.join(index_dir, "index.npy"), mmap_mode="r")
+    ids = meta.get("ids") or []
+    if matrix.shape[0] != len(ids):
+        raise ValueError(f"reference index in {index_dir} is being rebuilt")
+    if not ids:
+        return []
+    scores = np.asarray(matrix @ np.asarray(vector, dtype=np.float32))
+    k = max(1, min(int(k), len(ids)))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return [
+        {"id": ids[i], "score": round(float(scores[i]), 4), "profile": os.path.join(index_dir, meta["profiles"][i])}
+        for i in top
+    ]
+
+
+def select_reference(index_dir: str, y: np.ndarray, sr: int, features: Dict[str, float]) -> Optional[Dict[str, Any]]:
+    """Load the stored reference profile closest to a target (None when the index is empty)."""
+    t0 = time.time()
+    mid, _ = mid_side_encode(ensure_stereo(y))
+    vec = reference_vector(windowed_fft_mag(mid, n_fft=MATCH_EQ_NFFT, hop=MATCH_EQ_HOP), sr, features)
+    matches = nearest_references(index_dir, vec)
+    if not matches:
+        log.info("[master] reference index %s is empty; using the translation curve", index_dir)
+        return None
+    profile = load_reference_profile(matches[0]["profile"])
+    profile["selection"] = {"id": matches[0]["id"], "score": matches[0]["score"], "candidates": matches}
+    log.info("[master] reference auto-selected  id=%s  cosine=%.3f  (%.3fs)",
+             matches[0]["id"], matches[0]["score"], time.time() - t0)
+    return profile
+
+
 def build_arg_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(description="AuralMind Maestro v7.3 expert — Expert-tier mastering script")
-    p.add_argument("--target", required=True, help="Path to target audio (wav/flac/aiff/ogg).")
+    p.add_argument("--target", default=None, help="Path to target audio (wav/flac/aiff/ogg). Required unless --calibrate.")
     p.add_argument("--reference", default=None, help="Optional reference audio for match EQ.")
-    p.add_argument("--out", required=True, help="Output mastered wav path.")
+    p.add_argument("--reference-profile", default=None,
+                   help="Precomputed reference profile (.npz) to match against instead of --reference audio.")
+    p.add_argument("--build-reference-profile", default=None, metavar="OUT_NPZ",
+                   help="Analyse --reference once and write its profile to OUT_NPZ instead of mastering.")
+    p.add_argument("--reference-index", default=None, metavar="DIR",
+                   help="Reference library (<id>/profile.npz + index). Without --reference/--reference-profile, "
+                        "match against the stored reference closest to the target.")
+    p.add_argument("--build-reference-index", default=None, metavar="DIR",
+                   help="(Re)build the nearest-neighbour index over DIR/<id>/profile.npz instead of mastering.")
+    p.add_argument("--out", default=None,
+                   help="Output mastered wav path (with --batch: the output directory). Required unless --calibrate.")
     p.add_argument("--out-subtype", default=None,
                    help="Optional libsndfile subtype (e.g., PCM_24, PCM_16, FLOAT). "
                         "Default: WAV -> PCM_24, otherwise libsndfile default.")
@@ -2506,7 +4806,44 @@ def build_arg_parser() -> argparse.ArgumentParser:
     p.add_argument("--dither-seed", type=int, default=0,
                    help="RNG seed for dither (reproducible exports).")
 
-    p.add_argument("--report", default=None, help="Optional report markdown output.")
+    p.add_argument("--report", default=None,
+                   help="Report output path; a .json path writes the machine-readable report, anything else Markdown.")
+    p.add_argument("--progress-fd", type=int, default=None,
+                   help="Write JSON-lines progress events (stage, fraction, timings) to this file descriptor.")
+    p.add_argument("--calibrate", default=None, metavar="OUT_JSON",
+                   help="Benchmark master() on synthetic audio on this host and write cost-model "
+                        "observations (for the backend's COST_MODEL_CALIBRATION) instead of mastering.")
+    p.add_argument("--calibrate-durations", default="10,30",
+                   help="Comma-separated test durations in seconds for --calibrate.")
+    p.add_argument("--analyze", default=None, metavar="OUT_JSON",
+                   help="Measure the target (loudness, true/sample peak, RMS, crest, band correlations, centroid, "
+                        "sub f0, short-term loudness timeline and range) in one chunked pass and write OUT_JSON "
+                        "instead of mastering. With --batch: one JSON line per file, resumable, over --jobs workers.")
+    p.add_argument("--preview", type=float, default=None, metavar="SECONDS",
+                   help="Render only a SECONDS-long excerpt around the hook (no stems), with match EQ, "
+                        "loudness and section threshold measured on the whole track.")
+    p.add_argument("--deliverable", action="append", default=[], metavar="NAME:LUFS:CEILING[:SUBTYPE]",
+                   help="Also export a delivery master with its own loudness target, ceiling and subtype "
+                        "(e.g. club:-9:-0.3:PCM_24) to <out>.NAME<ext>. Repeatable; everything up to the "
+                        "governor is rendered once and shared.")
+    p.add_argument("--compare", default=None, metavar="SPEC_JSON",
+                   help='Render several variants of the target for A/B listening instead of one master. SPEC_JSON is '
+                        '{"variants": [{"name": ..., "args": [preset flags]}, ...]}; outputs go to <out>.NAME<ext> '
+                        "and loudness-matched copies to <out>.NAME.matched<ext>.")
+    p.add_argument("--compare-jobs", type=int, default=1, metavar="N",
+                   help="Variants rendered concurrently by --compare (forked processes).")
+    p.add_argument("--batch", default=None, metavar="DIR|MANIFEST",
+                   help="Master many files: every audio file under DIR, or each line of a JSON-lines manifest "
+                        '({"target": ..., "out": ..., "id": ..., "args": [preset flags]}). Outputs and per-file '
+                        "JSON reports go under --out, progress to --out/" + BATCH_JOURNAL + "; rerunning resumes.")
+    p.add_argument("--jobs", type=int, default=1, metavar="N",
+                   help="Worker processes for --batch; each stays up for many files.")
+    p.add_argument("--checkpoint-dir", default=None, metavar="DIR",
+                   help="Cache stage-boundary buffers (post-stems, post-FIR, pre-transient, pre-governor) in DIR "
+                        "and resume from the deepest one still valid for this input and these settings.")
+    p.add_argument("--profile", default=None, metavar="DIR",
+                   help="Profile every stage (cProfile, stack sampling, tracemalloc) and write "
+                        "profile.pstats, profile.collapsed and profile_memory.json into DIR. Slow.")
     p.add_argument("--preset", default="hi_fi_streaming", choices=list(get_presets().keys()), help="Preset name.")
     p.add_argument("--no-stems", action="store_true", help="Disable HT-Demucs stem separation (otherwise enabled by preset).")
     p.add_argument("--stems", action="store_true", help="Force-enable HT-Demucs stem separation (overrides preset).")
@@ -2545,6 +4882,9 @@ def build_arg_parser() -> argparse.ArgumentParser:
                    help="Analyze the target (and reference if provided) and auto-tune preset + safe mastering parameters.")
     p.add_argument("--target-lufs", type=float, default=None,
                    help="Override preset target LUFS (integrated). Example: -12.0")
+    p.add_argument("--target-lufs-offset", type=float, default=0.0, metavar="DB",
+                   help="Shift the loudness target (and every --deliverable target) by DB after all other "
+                        "overrides; used to keep a set of tracks at album-consistent relative levels.")
     p.add_argument("--ceiling", type=float, default=None,
                    help="Override limiter ceiling (dBFS). Example: -1.0 (recommended for streaming)")
     p.add_argument("--limiter", choices=["v1", "v2"], default="v2",
@@ -2564,37 +4904,32 @@ def build_arg_parser() -> argparse.ArgumentParser:
 
     return p
 
-def _default_report_path(out_path: str) -> str:
-    base, _ = os.path.splitext(out_path)
-    if not base:
-        return "report.md"
-    return f"{base}.md"
-
-def main():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s  %(name)s  %(levelname)s  %(message)s",
-        datefmt="%H:%M:%S",
-    )
-    args = build_arg_parser().parse_args()
-    if args.report is None:
-        args.report = _default_report_path(args.out)
+def resolve_preset(args: argparse.Namespace, *, target_features: Optional[Dict[str, float]] = None,
+                   reference_features: Optional[Dict[str, float]] = None) -> Preset:
+    """
+    The preset a command line asks for: --preset, auto-tuned under --auto
+    (target features are measured here unless given), then the explicit
+    overrides and --target-lufs-offset.
+    """
     presets = get_presets()
     preset = presets[args.preset]
-
-    # Auto-tune (expert): pick preset + safe loudness/GR constraints from audio features
-    auto_info: Dict[str, Any] = {"enabled": False}
     if args.auto:
-        y_t, sr_t = load_audio(args.target)
-        tf = analyze_track_features(y_t, sr_t)
-        rf = None
-        if args.reference:
-            y_r, sr_r = load_audio(args.reference)
-            rf = analyze_track_features(y_r, sr_r)
-        name = auto_select_preset_name(tf)
-        preset = presets.get(name, preset)
-        preset, auto_info = auto_tune_preset(preset, tf, rf)
+        tf = target_features
+        if tf is None:
+            y_t, sr_t = load_audio(args.target)
+            tf = analyze_track_features(y_t, sr_t)
+        preset = presets.get(auto_select_preset_name(tf), preset)
+        preset, _auto_info = auto_tune_preset(preset, tf, reference_features)
+    updates = preset_overrides(args)
+    if updates:
+        preset = replace(preset, **updates)
+    if args.target_lufs_offset:
+        preset = replace(preset, target_lufs=float(preset.target_lufs) + float(args.target_lufs_offset))
+    return preset
+
 
+def preset_overrides(args: argparse.Namespace) -> Dict[str, Any]:
+    """Preset field updates requested by the command-line flags."""
     updates: Dict[str, Any] = {}
 
     # Stem separation overrides
@@ -2669,22 +5004,197 @@ def main():
 
     if args.warmth is not None:
         updates["warmth"] = float(args.warmth)
+    return updates
 
+def _default_report_path(out_path: str) -> str:
+    base, _ = os.path.splitext(out_path)
+    if not base:
+        return "report.md"
+    return f"{base}.md"
 
-    if updates:
-        preset = replace(preset, **updates)
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s  %(name)s  %(levelname)s  %(message)s",
+        datefmt="%H:%M:%S",
+    )
+    parser = build_arg_parser()
+    args = parser.parse_args()
+    if args.build_reference_profile is not None and not args.reference:
+        parser.error("--build-reference-profile needs --reference")
+    if args.analyze is not None and not args.target and args.batch is None:
+        parser.error("--analyze needs --target or --batch")
+    maintenance = (args.calibrate, args.build_reference_profile, args.build_reference_index, args.analyze, args.batch)
+    if all(flag is None for flag in maintenance) and (not args.target or not args.out):
+        parser.error("--target and --out are required (unless --calibrate, --analyze, --batch or --build-reference-* is given)")
+    if args.batch is not None:
+        if not args.out and args.analyze is None:
+            parser.error("--batch needs --out (the output directory) or --analyze")
+        others = (args.target, args.compare, args.preview, args.profile, args.calibrate,
+                  args.build_reference_profile, args.build_reference_index, args.reference_index, args.report)
+        if any(flag is not None for flag in others):
+            parser.error("--batch cannot be combined with --target, --compare, --preview, --profile, "
+                         "--calibrate, --build-reference-*, --reference-index or --report")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.reference and args.reference_profile:
+        parser.error("--reference and --reference-profile are mutually exclusive")
+    if args.preview is not None and args.preview <= 0:
+        parser.error("--preview must be a positive number of seconds")
+    try:
+        deliverables = [parse_deliverable(spec) for spec in args.deliverable]
+    except ValueError as e:
+        parser.error(str(e))
+    if len({d.name for d in deliverables}) != len(deliverables):
+        parser.error("--deliverable names must be unique")
+    if deliverables and args.preview is not None:
+        parser.error("--deliverable cannot be combined with --preview")
+    if args.compare is not None and (deliverables or args.preview is not None or args.profile or args.auto):
+        parser.error("--compare cannot be combined with --deliverable, --preview, --profile or --auto")
+    if args.compare_jobs < 1:
+        parser.error("--compare-jobs must be at least 1")
+    if get_presets()[args.preset].normalize_only and (args.preview is not None or args.reference or args.reference_profile
+                                                      or args.reference_index or args.auto):
+        parser.error(f"--preset {args.preset} cannot be combined with --preview, --reference, "
+                     "--reference-profile, --reference-index or --auto")
+    _PROGRESS.open(args.progress_fd)
+    if args.report is None and args.out and args.batch is None:
+        args.report = _default_report_path(args.out)
+    presets = get_presets()
+    preset = presets[args.preset]
+
+    if args.build_reference_profile is not None:
+        meta = build_reference_profile(args.reference, args.build_reference_profile, sr=preset.sr)
+        print(json.dumps(meta, indent=2))
+        return
+    if args.build_reference_index is not None:
+        print(json.dumps(build_reference_index(args.build_reference_index), indent=2))
+        return
+    if args.analyze is not None and args.batch is not None:
+        try:
+            items = load_batch_items(args.batch, os.path.dirname(os.path.abspath(args.analyze)), render=False)
+        except (OSError, ValueError) as e:
+            parser.error(f"--batch: {e}")
+        res = analyze_batch(items, args.analyze, workers=int(args.jobs))
+        print(json.dumps(res, indent=2))
+        if res["failed"]:
+            raise SystemExit(1)
+        return
+    if args.analyze is not None:
+        payload = analyze_file(args.target)
+        os.makedirs(os.path.dirname(os.path.abspath(args.analyze)) or ".", exist_ok=True)
+        write_report_json(args.analyze, payload)
+        print(json.dumps({k: v for k, v in payload.items() if k != "loudness"}, indent=2))
+        return
+    ref_profile = load_reference_profile(args.reference_profile) if args.reference_profile else None
+
+    if args.batch is not None:
+        try:
+            items = load_batch_items(args.batch, args.out)
+        except (OSError, ValueError) as e:
+            parser.error(f"--batch: {e}")
+        # Manifest "args" replace the batch's preset flags for that file, like --compare variants.
+        item_args = [
+            argparse.Namespace(**{**vars(args), "target": item.target, "out": item.out}) if item.args is None
+            else parser.parse_args([*item.args, "--target", item.target, "--out", item.out])
+            for item in items
+        ]
+        os.makedirs(args.out, exist_ok=True)
+        if args.reference:
+            # Profiled once here; no worker decodes or analyses the reference again.
+            profile_path = os.path.join(args.out, BATCH_REFERENCE_PROFILE)
+            build_reference_profile(args.reference, profile_path, sr=preset.sr)
+            ref_profile = load_reference_profile(profile_path)
+        res = run_batch(items, item_args, args.out, reference_profile=ref_profile,
+                        checkpoint_dir=args.checkpoint_dir, workers=int(args.jobs))
+        print(json.dumps(res, indent=2))
+        if res["failed"]:
+            raise SystemExit(1)
+        return
+
+    tf = None
+    if args.reference_index and not args.reference and ref_profile is None:
+        y_t, sr_t = load_audio(args.target)
+        tf = analyze_track_features(y_t, sr_t)
+        ref_profile = select_reference(args.reference_index, y_t, sr_t, tf)
+
+    if args.compare is not None:
+        try:
+            specs = load_compare_spec(args.compare)
+        except (OSError, ValueError) as e:
+            parser.error(f"--compare: {e}")
+        variants: List[Tuple[str, Preset]] = []
+        for spec in specs:
+            vargs = parser.parse_args([*map(str, spec.get("args", [])), "--target", args.target, "--out", args.out])
+            if vargs.auto:
+                parser.error(f"--compare: variant {spec['name']!r} cannot use --auto")
+            vupdates = preset_overrides(vargs)
+            vpreset = presets[vargs.preset]
+            variants.append((spec["name"], replace(vpreset, **vupdates) if vupdates else vpreset))
+        res = compare_presets(
+            args.target,
+            args.out,
+            variants,
+            reference_path=args.reference,
+            reference_profile=ref_profile,
+            checkpoint_dir=args.checkpoint_dir,
+            workers=int(args.compare_jobs),
+            out_subtype=args.out_subtype,
+            dither=False if bool(args.no_dither) else None,
+            dither_seed=int(args.dither_seed),
+        )
+        if args.report:
+            os.makedirs(os.path.dirname(os.path.abspath(args.report)) or ".", exist_ok=True)
+            if str(args.report).lower().endswith(".json"):
+                write_report_json(args.report, res)
+            else:
+                write_compare_report_markdown(args.report, res)
+        print(json.dumps({k: v for k, v in res.items() if k != "variants"}, indent=2))
+        return
+
+    # Auto-tune (expert): pick preset + safe loudness/GR constraints from audio features
+    rf = None
+    if args.auto:
+        if ref_profile is not None:
+            rf = ref_profile["features"]
+        elif args.reference:
+            y_r, sr_r = load_audio(args.reference)
+            rf = analyze_track_features(y_r, sr_r)
+    preset = resolve_preset(args, target_features=tf, reference_features=rf)
+    if args.target_lufs_offset:
+        offset = float(args.target_lufs_offset)
+        deliverables = [replace(d, target_lufs=d.target_lufs + offset) for d in deliverables]
+
+    if args.calibrate is not None:
+        durations = [float(d) for d in str(args.calibrate_durations).split(",") if d.strip()]
+        payload = calibrate(args.calibrate, preset, durations)
+        print(json.dumps(payload, indent=2))
+        return
 
     dither_flag = False if bool(args.no_dither) else None
-    res = master(
-        args.target,
-        args.out,
-        preset,
-        reference_path=args.reference,
-        report_path=args.report,
-        out_subtype=args.out_subtype,
-        dither=dither_flag,
-        dither_seed=int(args.dither_seed),
-    )
+
+    profiler = StageProfiler(args.profile) if args.profile else None
+    try:
+        res = master(
+            args.target,
+            args.out,
+            preset,
+            reference_path=args.reference,
+            report_path=args.report,
+            out_subtype=args.out_subtype,
+            dither=dither_flag,
+            dither_seed=int(args.dither_seed),
+            profiler=profiler,
+            reference_profile=ref_profile,
+            checkpoint_dir=args.checkpoint_dir,
+            preview_seconds=args.preview,
+            deliverables=deliverables,
+        )
+    finally:
+        # Written even when the render fails: that is often the run worth profiling.
+        if profiler is not None:
+            profiler.write()
+
     print(json.dumps(res, indent=2))
 
 if __name__ == "__main__":
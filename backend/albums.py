@@ -0,0 +1,267 @@
+"""
+Album jobs: many targets mastered against one reference as a set.
+
+An album is a thin coordinator over ordinary jobs, one per track, so the
+tracks keep the job executor, progress channel, janitor and per-track
+downloads. On top of that it
+
+1. profiles the reference once: the upload goes through the reference
+   library (or is named by `reference_id`) and every track links the same
+   profile, so no track decodes or analyses the reference;
+2. measures all targets in one engine `--batch --analyze` run on the
+   analysis lane (chunked loudness and features, no rendering), so the
+   measurement never holds a mastering worker;
+3. derives album-consistent loudness targets: each track's governor target
+   moves by `loudness_spread` times its distance below the loudest track
+   (1 keeps the sources' relative levels, like album gain; 0 masters every
+   track to the same target), passed as `--target-lufs-offset`;
+4. queues the renders on the job executor, so MAX_CONCURRENT_JOBS is the
+   album's core budget, shared with single jobs in submission order.
+
+Albums live in memory, like jobs.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import io
+import logging
+import re
+import shutil
+import threading
+import uuid
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .analysis import ANALYSIS_DIR, AnalysisError, run_analysis
+    from .config import settings
+    from .jobs import TERMINAL_STATUSES, Job, JobManager, job_manager
+    from .schemas import JobSettings
+except ImportError:  # pragma: no cover - supports direct module execution
+    from analysis import ANALYSIS_DIR, AnalysisError, run_analysis
+    from config import settings
+    from jobs import TERMINAL_STATUSES, Job, JobManager, job_manager
+    from schemas import JobSettings
+
+logger = logging.getLogger("auralmind.albums")
+
+# Share of album progress spent measuring the targets before any render starts.
+_ANALYSIS_SHARE = 5.0
+_ARCHIVE_CHUNK_BYTES = 1024 * 1024
+_UNSAFE_NAME_RE = re.compile(r"[^A-Za-z0-9._ -]+")
+
+
+@dataclass
+class AlbumTrack:
+    """One target of an album and the job that masters it."""
+
+    job: Job
+    filename: str
+    source_lufs: Optional[float] = None
+    duration_s: Optional[float] = None
+
+    @property
+    def archive_stem(self) -> str:
+        stem = _UNSAFE_NAME_RE.sub("_", Path(self.filename).stem).strip(" .") or "track"
+        return stem[:80]
+
+
+@dataclass
+class Album:
+    """A set of tracks mastered against one reference with a shared loudness plan."""
+
+    id: str
+    settings: JobSettings
+    loudness_spread: float
+    reference_id: Optional[str] = None
+    created_at: dt.datetime = field(default_factory=lambda: dt.datetime.utcnow())
+    tracks: List[AlbumTrack] = field(default_factory=list)
+    analyzing: bool = True
+    cancelled: bool = False
+
+    @property
+    def jobs(self) -> List[Job]:
+        return [t.job for t in self.tracks]
+
+    @property
+    def status(self) -> str:
+        """analyzing, processing, then completed / failed (some track failed) / cancelled."""
+        statuses = [j.status for j in self.jobs]
+        if self.cancelled and all(s in TERMINAL_STATUSES for s in statuses):
+            return "cancelled"
+        if self.analyzing:
+            return "analyzing"
+        if any(s not in TERMINAL_STATUSES for s in statuses):
+            return "processing"
+        return "completed" if all(s == "completed" for s in statuses) else "failed"
+
+    @property
+    def progress(self) -> float:
+        """Duration-weighted track progress after the analysis share."""
+        if self.analyzing:
+            done = sum(t.source_lufs is not None or t.job.status in TERMINAL_STATUSES for t in self.tracks)
+            return _ANALYSIS_SHARE * done / max(1, len(self.tracks))
+        weights = [t.duration_s or 1.0 for t in self.tracks]
+        rendered = sum(w * t.job.progress for w, t in zip(weights, self.tracks)) / max(1e-9, sum(weights))
+        return round(_ANALYSIS_SHARE + (100.0 - _ANALYSIS_SHARE) * rendered / 100.0, 2)
+
+    @property
+    def finished_at(self) -> Optional[dt.datetime]:
+        if self.status in ("analyzing", "processing"):
+            return None
+        return max((j.finished_at for j in self.jobs if j.finished_at), default=None)
+
+    def eta_seconds(self, workers: int) -> Optional[int]:
+        """Remaining predicted render time spread over the executor's workers."""
+        if self.analyzing:
+            return None
+        remaining = 0.0
+        for job in self.jobs:
+            if job.status == "processing":
+                remaining += float(job.eta_seconds or 0)
+            elif job.status == "queued":
+                if job.estimated_runtime_seconds is None:
+                    return None
+                remaining += float(job.estimated_runtime_seconds)
+        return int(round(remaining / max(1, workers)))
+
+    def archive_entries(self) -> List[Tuple[str, Path]]:
+        """(name in archive, path) of every master of the completed tracks, in upload order."""
+        entries: List[Tuple[str, Path]] = []
+        for index, track in enumerate(self.tracks, start=1):
+            job = track.job
+            if job.status != "completed":
+                continue
+            prefix = f"{index:02d}-{track.archive_stem}"
+            entries.append((f"{prefix}{job.output_path.suffix}", job.output_path))
+            for name in job.variant_names():
+                path = job.variant_path(name)
+                entries.append((f"{prefix}.{name}{path.suffix}", path))
+        return entries
+
+
+def loudness_offsets(lufs: List[float], spread: float) -> List[float]:
+    """Per-track target shifts: `spread` times each track's distance below the loudest."""
+    if not lufs:
+        return []
+    loudest = max(lufs)
+    return [round(float(spread) * (value - loudest), 3) for value in lufs]
+
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable write target collecting what zipfile writes until the generator yields it."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> Iterator[bytes]:
+        chunks, self._chunks = self._chunks, []
+        return iter(chunks)
+
+
+def iter_archive(entries: List[Tuple[str, Path]]) -> Iterator[bytes]:
+    """
+    Stream a ZIP of `entries` without staging it on disk. Masters are WAV, so
+    entries are stored rather than deflated; zipfile writes data descriptors
+    because the sink cannot seek.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for arcname, path in entries:
+            with open(path, "rb") as src, archive.open(arcname, "w", force_zip64=True) as dst:
+                while True:
+                    chunk = src.read(_ARCHIVE_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                    yield from sink.drain()
+            yield from sink.drain()
+    yield from sink.drain()
+
+
+class AlbumManager:
+    """Registry of albums; analysis and scheduling run on a coordinator thread per album."""
+
+    def __init__(self, manager: JobManager) -> None:
+        self.manager = manager
+        self.albums: Dict[str, Album] = {}
+        self._lock = threading.Lock()
+
+    def create_album(self, settings_obj: JobSettings, loudness_spread: float,
+                     reference_id: Optional[str] = None) -> Album:
+        album = Album(id=uuid.uuid4().hex, settings=settings_obj, loudness_spread=float(loudness_spread),
+                      reference_id=reference_id)
+        with self._lock:
+            self.albums[album.id] = album
+        return album
+
+    def add_track(self, album: Album, job: Job, filename: str) -> AlbumTrack:
+        track = AlbumTrack(job=job, filename=filename)
+        album.tracks.append(track)
+        self.manager.hold_job(job, "Waiting for album analysis", f"Track {len(album.tracks)} of the album")
+        return track
+
+    def start(self, album: Album) -> None:
+        """Analyse and schedule the album in the background."""
+        threading.Thread(target=self._run, args=(album,), name=f"album-{album.id[:8]}", daemon=True).start()
+
+    def cancel(self, album: Album) -> bool:
+        if album.status not in ("analyzing", "processing"):
+            return False
+        album.cancelled = True
+        for job in album.jobs:
+            if job.status in ("queued", "processing"):
+                self.manager.cancel_job(job.id)
+        return True
+
+    def _run(self, album: Album) -> None:
+        for track in album.tracks:
+            self.manager.hold_job(track.job, "Album analysis", "Measuring loudness for the album plan")
+        workdir = self.manager.data_dir / ANALYSIS_DIR / album.id
+        try:
+            future = self.manager.analysis_executor.submit(
+                run_analysis, [(t.job.id, t.job.target_path) for t in album.tracks], workdir,
+                settings.ANALYZE_WORKERS,
+            )
+            records = future.result()
+        except Exception as exc:
+            logger.warning("Album %s: analysis failed: %s", album.id, exc)
+            error = str(exc) if isinstance(exc, AnalysisError) else f"{type(exc).__name__}: {exc}"
+            records = {t.job.id: {"status": "failed", "error": error} for t in album.tracks}
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        measured: List[AlbumTrack] = []
+        for track in album.tracks:
+            record = records[track.job.id]
+            if record.get("status") != "ok":
+                logger.warning("Album %s: analysis of %s failed: %s", album.id, track.filename, record.get("error"))
+                if track.job.status == "queued":
+                    self.manager.fail_job(track.job, f"Album analysis failed: {record.get('error')}")
+                continue
+            track.source_lufs = float(record["features"]["lufs"])
+            track.duration_s = float(record["duration_s"])
+            measured.append(track)
+
+        offsets = loudness_offsets([t.source_lufs for t in measured], album.loudness_spread)
+        for track, offset in zip(measured, offsets):
+            track.job.loudness_offset_db = offset
+        album.analyzing = False
+        for track in measured:
+            # Cancelled tracks (or a cancelled album) are never scheduled.
+            if track.job.status == "queued" and not album.cancelled:
+                self.manager.hold_job(track.job, "Queued", "Waiting for an available worker")
+                self.manager.run_job(track.job.id)
+
+
+album_manager = AlbumManager(job_manager)
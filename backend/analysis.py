@@ -0,0 +1,75 @@
+"""
+Analysis-only engine runs: loudness and feature scans without rendering.
+
+Files are measured by the engine's `--batch MANIFEST --analyze OUT.jsonl`
+(one chunked pass per file: loudness, true/sample peak, RMS, crest, band
+correlations, centroid, sub f0 and a short-term loudness timeline), one
+subprocess per request whose `--jobs` worker processes stay warm across
+its files. Callers run this on JobManager's analysis lane
+(ANALYZE_CONCURRENT_JOBS), so scans never hold a mastering worker.
+
+Used by `POST /api/analyze` and by album planning.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+try:
+    from .config import settings
+except ImportError:  # pragma: no cover - supports direct module execution
+    from config import settings
+
+# Scratch space under DATA_DIR; the janitor only sweeps job directories.
+ANALYSIS_DIR = "_analysis"
+
+
+class AnalysisError(Exception):
+    """Raised when the engine produced no analysis at all (crash, timeout)."""
+
+
+def run_analysis(files: List[Tuple[str, Path]], workdir: Path, workers: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Analyse `(key, path)` pairs; returns the engine record per key. A file the
+    engine could not read gets `{"status": "failed", "error": ...}`; keys
+    missing from the output (engine died mid-scan) get the same. Blocking.
+    """
+    workdir.mkdir(parents=True, exist_ok=True)
+    manifest = workdir / "manifest.jsonl"
+    out_path = workdir / "analysis.jsonl"
+    manifest.write_text(
+        "".join(json.dumps({"id": key, "target": str(path)}) + "\n" for key, path in files),
+        encoding="utf-8",
+    )
+    cmd = [sys.executable, settings.AURALMIND_SCRIPT_PATH, "--batch", str(manifest), "--analyze", str(out_path),
+           "--jobs", str(max(1, min(int(workers), len(files))))]
+    try:
+        proc = subprocess.run(
+            cmd,
+            cwd=str(workdir),
+            capture_output=True,
+            text=True,
+            timeout=settings.JOB_TIMEOUT_SEC,
+            env=dict(os.environ, PYTHONUNBUFFERED="1"),
+        )
+    except subprocess.TimeoutExpired:
+        raise AnalysisError("Engine timed out")
+    records: Dict[str, Dict[str, Any]] = {}
+    if out_path.is_file():
+        for line in out_path.read_text(encoding="utf-8").splitlines():
+            try:
+                record = json.loads(line)
+                records[str(record["key"])] = record
+            except (ValueError, KeyError, TypeError):
+                continue
+    if not records and proc.returncode != 0:
+        tail = (proc.stderr or proc.stdout or "").strip().splitlines()[-1:] or [""]
+        raise AnalysisError(f"Engine exited with code {proc.returncode}: {tail[0]}")
+    for key, _path in files:
+        records.setdefault(key, {"key": key, "status": "failed", "error": "Engine returned no analysis"})
+    return records
@@ -0,0 +1,158 @@
+"""
+Content-addressed store for uploaded audio.
+
+Uploads are streamed into `DATA_DIR/_blobs` while being hashed (SHA-256),
+so a file is written to disk once however many jobs submit it. Job
+workdirs get a hard link to the blob under their usual `input/` name,
+which keeps the engine command line and the janitor's per-job deletion
+unchanged.
+
+The reference count of a blob is its link count: the store holds one
+link, and each workdir that still has the input holds another. Deleting
+a job's inputs (janitor TTL, quota eviction) therefore releases its
+references without any bookkeeping that could drift. Blobs that are only
+held by the store are kept for `BLOB_UNREFERENCED_TTL_SEC` (counted from
+the last link change, which is the inode's ctime) so a re-upload of a
+popular reference still deduplicates, then collected by the janitor.
+
+When hard links are not possible (DATA_DIR spanning filesystems), the
+blob is copied into the workdir instead; deduplication is lost for that
+job but nothing else changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import stat
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+_CHUNK_BYTES = 1024 * 1024
+# Partial uploads older than this are debris from a crashed process.
+_TMP_MAX_AGE_SEC = 3600.0
+
+
+class UploadTooLarge(Exception):
+    """Raised when a streamed upload exceeds the configured byte limit."""
+
+
+class BlobStore:
+    """SHA-256 keyed blob directory with link-count reference counting."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.tmp_dir = self.root / "tmp"
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        # Serializes "blob exists -> link it" against garbage collection.
+        self._lock = threading.Lock()
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def refcount(self, digest: str) -> int:
+        """Number of workdirs linking the blob (0 when unreferenced or missing)."""
+        try:
+            return max(0, os.stat(self.path_for(digest)).st_nlink - 1)
+        except OSError:
+            return 0
+
+    async def ingest(self, upload: Any, dest: Path, max_bytes: int) -> Tuple[str, int, bool]:
+        """
+        Stream an UploadFile into the store and link it to `dest`.
+
+        Returns (sha256 hex digest, size in bytes, whether the blob already
+        existed). Raises UploadTooLarge once more than `max_bytes` arrive.
+        """
+        tmp = self.tmp_dir / uuid.uuid4().hex
+        hasher = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp, "wb") as out_f:
+                while True:
+                    chunk = await upload.read(_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise UploadTooLarge(f"upload exceeds {max_bytes} bytes")
+                    hasher.update(chunk)
+                    out_f.write(chunk)
+            digest = hasher.hexdigest()
+            existed = self._commit(tmp, digest, dest)
+        finally:
+            try:
+                tmp.unlink()
+            except FileNotFoundError:
+                pass
+        return digest, size, existed
+
+    def _commit(self, tmp: Path, digest: str, dest: Path) -> bool:
+        blob = self.path_for(digest)
+        with self._lock:
+            existed = blob.is_file()
+            if not existed:
+                blob.parent.mkdir(exist_ok=True)
+                # Read-only: a workdir link must never be able to modify the shared content.
+                os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+                os.replace(tmp, blob)
+            self._link(blob, dest)
+        return existed
+
+    @staticmethod
+    def _link(blob: Path, dest: Path) -> None:
+        try:
+            os.link(blob, dest)
+        except OSError:
+            shutil.copyfile(blob, dest)
+
+    def collect(self, unreferenced_ttl_sec: float, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Delete blobs nobody links to that have been idle past the TTL, plus
+        stale partial uploads. Returns byte counts for the sweep report.
+        """
+        now = time.time() if now is None else now
+        stats = {"blob_bytes": 0, "blobs": 0, "unreferenced_bytes": 0, "deleted_bytes": 0, "deleted_blobs": 0}
+        for shard in self._iter_dirs():
+            for entry in os.scandir(shard):
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if not stat.S_ISREG(st.st_mode):
+                    continue
+                if st.st_nlink <= 1 and now - st.st_ctime > unreferenced_ttl_sec:
+                    with self._lock:
+                        try:
+                            # Re-check under the lock; an upload may have linked it meanwhile.
+                            if os.stat(entry.path).st_nlink <= 1:
+                                os.unlink(entry.path)
+                                stats["deleted_bytes"] += st.st_size
+                                stats["deleted_blobs"] += 1
+                                continue
+                        except OSError:
+                            continue
+                stats["blob_bytes"] += st.st_size
+                stats["blobs"] += 1
+                if st.st_nlink <= 1:
+                    stats["unreferenced_bytes"] += st.st_size
+        for entry in os.scandir(self.tmp_dir):
+            try:
+                if now - entry.stat(follow_symlinks=False).st_mtime > _TMP_MAX_AGE_SEC:
+                    os.unlink(entry.path)
+            except OSError:
+                pass
+        return stats
+
+    def _iter_dirs(self):
+        try:
+            entries = list(os.scandir(self.root))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False) and len(entry.name) == 2:
+                yield entry.path
@@ -80,6 +80,49 @@ class Settings:
     ALLOWED_ORIGIN_REGEX: Optional[str] = get_optional(os.getenv("ALLOWED_ORIGIN_REGEX"))
     MAX_UPLOAD_MB: int = int(os.getenv("MAX_UPLOAD_MB", "200"))
     JOB_TIMEOUT_SEC: int = int(os.getenv("JOB_TIMEOUT_SEC", "3600"))
+    MAX_CONCURRENT_JOBS: int = max(1, int(os.getenv("MAX_CONCURRENT_JOBS", "2")))
+    # Preview jobs (JobSettings.preview) run on their own worker slots so they never queue behind full renders.
+    PREVIEW_CONCURRENT_JOBS: int = max(1, int(os.getenv("PREVIEW_CONCURRENT_JOBS", "1")))
+    PREVIEW_SECONDS: float = float(os.getenv("PREVIEW_SECONDS", "20"))
+    # Normalize-only jobs (preset "normalize") are streamed at ~50x real time on their own lane.
+    NORMALIZE_CONCURRENT_JOBS: int = max(1, int(os.getenv("NORMALIZE_CONCURRENT_JOBS", "1")))
+    # Comparison jobs (JobSettings.variants) render variants concurrently while their predicted peak memory fits.
+    COMPARE_MEMORY_BUDGET_MB: int = int(os.getenv("COMPARE_MEMORY_BUDGET_MB", "4096"))
+    # Album jobs (POST /api/albums): tracks per album; their renders share the MAX_CONCURRENT_JOBS workers.
+    ALBUM_MAX_TRACKS: int = max(2, int(os.getenv("ALBUM_MAX_TRACKS", "24")))
+    # Analysis-only requests (POST /api/analyze, album planning) run on their own lane of engine processes,
+    # each fanning its files out over ANALYZE_WORKERS processes.
+    ANALYZE_CONCURRENT_JOBS: int = max(1, int(os.getenv("ANALYZE_CONCURRENT_JOBS", "1")))
+    ANALYZE_WORKERS: int = max(1, int(os.getenv("ANALYZE_WORKERS", str(os.cpu_count() or 1))))
+    ANALYZE_MAX_FILES: int = max(1, int(os.getenv("ANALYZE_MAX_FILES", "100")))
+    # Readiness thresholds: /api/ready returns 503 when any is crossed.
+    READY_MAX_QUEUE: int = int(os.getenv("READY_MAX_QUEUE", "8"))
+    READY_MIN_FREE_DISK_MB: int = int(os.getenv("READY_MIN_FREE_DISK_MB", "2048"))
+    READY_MIN_FREE_MEM_MB: int = int(os.getenv("READY_MIN_FREE_MEM_MB", "1024"))
+    STATUS_MAX_WAIT_SEC: int = int(os.getenv("STATUS_MAX_WAIT_SEC", "60"))
+    # Janitor: per-artifact TTLs after a job finishes (0 keeps forever) and a byte quota for DATA_DIR.
+    JANITOR_INTERVAL_SEC: int = int(os.getenv("JANITOR_INTERVAL_SEC", "300"))
+    JANITOR_INPUT_TTL_SEC: int = int(os.getenv("JANITOR_INPUT_TTL_SEC", str(6 * 3600)))
+    JANITOR_INTERMEDIATE_TTL_SEC: int = int(os.getenv("JANITOR_INTERMEDIATE_TTL_SEC", "3600"))
+    JANITOR_OUTPUT_TTL_SEC: int = int(os.getenv("JANITOR_OUTPUT_TTL_SEC", str(7 * 86400)))
+    JANITOR_LOG_TTL_SEC: int = int(os.getenv("JANITOR_LOG_TTL_SEC", str(7 * 86400)))
+    JANITOR_MAX_DELETIONS: int = int(os.getenv("JANITOR_MAX_DELETIONS", "200"))
+    JANITOR_PIN_MAX_SEC: int = int(os.getenv("JANITOR_PIN_MAX_SEC", "3600"))
+    STORAGE_QUOTA_MB: int = int(os.getenv("STORAGE_QUOTA_MB", "0"))
+    # Uploads are deduplicated in DATA_DIR/_blobs; blobs no job links to are kept this long.
+    BLOB_UNREFERENCED_TTL_SEC: int = int(os.getenv("BLOB_UNREFERENCED_TTL_SEC", str(24 * 3600)))
+    # Engine stage checkpoints (DATA_DIR/_checkpoints) are kept this long after last use; 0 disables them.
+    CHECKPOINT_TTL_SEC: int = int(os.getenv("CHECKPOINT_TTL_SEC", str(6 * 3600)))
+
+    WEBHOOK_SECRET: Optional[str] = get_optional(os.getenv("WEBHOOK_SECRET"))
+    WEBHOOK_MAX_ATTEMPTS: int = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "5"))
+    WEBHOOK_TIMEOUT_SEC: float = float(os.getenv("WEBHOOK_TIMEOUT_SEC", "10"))
+    WEBHOOK_BACKOFF_SEC: float = float(os.getenv("WEBHOOK_BACKOFF_SEC", "2"))
+    # Hosts callback_url may name; empty allows any host that resolves only to public addresses.
+    CALLBACK_ALLOWED_HOSTS: List[str] = [h.lower() for h in get_list(os.getenv("CALLBACK_ALLOWED_HOSTS"))]
+
+    # Shared secret for admin-only features (job profiling); unset disables them.
+    ADMIN_TOKEN: Optional[str] = get_optional(os.getenv("ADMIN_TOKEN"))
     AURALMIND_SCRIPT_PATH: str = os.getenv(
         "AURALMIND_SCRIPT_PATH",
         os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "auralmind_match_maestro_v7_3_expert1.py")),
@@ -87,6 +130,11 @@ class Settings:
     DATA_DIR: str = os.getenv(
         "DATA_DIR", os.path.abspath(os.path.join(os.path.dirname(__file__), "data", "jobs"))
     )
+    # Learned runtime/memory model; defaults to DATA_DIR/costmodel-<hostname>.json.
+    COST_MODEL_PATH: Optional[str] = get_optional(os.getenv("COST_MODEL_PATH"))
+    # Optional output of `auralmind_match_maestro_v7_3_expert1.py --calibrate` used as extra observations.
+    COST_MODEL_CALIBRATION: Optional[str] = get_optional(os.getenv("COST_MODEL_CALIBRATION"))
+    COST_MODEL_PRIOR_WEIGHT: float = float(os.getenv("COST_MODEL_PRIOR_WEIGHT", "3"))
 
 
 settings = Settings()
@@ -0,0 +1,198 @@
+"""
+Per-host runtime and peak-memory model for mastering jobs.
+
+Both quantities are modelled as linear in the audio duration, with one
+per-second coefficient per enabled feature:
+
+    cost = base + duration * (rate + sum(feature_rate * feature))
+
+Coefficients are fitted by ridge regression towards a prior (the fixed
+real-time factors the service used before), so a fresh host starts from
+the old behaviour and converges to its own numbers as jobs complete.
+Observations come from finished jobs on this host and, optionally, from
+an engine `--calibrate` run; job observations are persisted so the model
+survives restarts.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+
+# Features known at submission time; the engine's --calibrate output uses the same keys.
+# All are 0/1 flags except "deliverables", the number of extra delivery masters. "normalize" (the
+# streamed normalize-only preset) replaces the whole mastering chain, so it goes with no other flag.
+FEATURES = ("stems", "stems_auto", "reference", "hooklift", "transient", "resample", "deliverables", "normalize")
+COEFFICIENTS = ("base", "per_second") + tuple(f"{name}_per_second" for name in FEATURES)
+ENGINE_SAMPLE_RATE = 48000
+_MIB = 1024.0 * 1024.0
+
+# Priors, in COEFFICIENTS order: seconds and bytes.
+_RUNTIME_PRIOR = (6.0, 0.16, 0.55, 0.0, 0.04, 0.05, 0.03, 0.0, 0.12, -0.14)
+_MEMORY_PRIOR = (250 * _MIB, 16 * _MIB, 24 * _MIB, 0.0, 4 * _MIB, 0.0, 0.0, 1 * _MIB, 4 * _MIB, -15 * _MIB)
+
+
+def _design_row(duration_s: float, features: Mapping[str, Any]) -> np.ndarray:
+    d = float(duration_s)
+    return np.array([1.0, d] + [d * float(features.get(name) or 0) for name in FEATURES], dtype=np.float64)
+
+
+def _ridge(x: np.ndarray, y: np.ndarray, prior: np.ndarray, weight: float) -> np.ndarray:
+    """
+    Least squares shrunk towards `prior`. Each coefficient's penalty is
+    scaled by its column's mean square, so `weight` reads as "the prior is
+    worth this many observations"; unseen features keep their prior.
+    """
+    scale = np.mean(x * x, axis=0) if x.shape[0] else np.zeros(x.shape[1])
+    lam = weight * np.maximum(scale, 1e-9)
+    lhs = x.T @ x + np.diag(lam)
+    rhs = x.T @ y + lam * prior
+    return np.linalg.solve(lhs, rhs)
+
+
+class CostModel:
+    """Thread-safe observation store plus fitted runtime/memory coefficients."""
+
+    def __init__(
+        self,
+        path: Optional[Path],
+        calibration_path: Optional[Path] = None,
+        max_observations: int = 500,
+        prior_weight: float = 3.0,
+    ) -> None:
+        self.path = path
+        self.host = platform.node() or "local"
+        self.max_observations = int(max_observations)
+        self.prior_weight = float(prior_weight)
+        self._lock = threading.Lock()
+        self._observations: List[Dict[str, Any]] = self._load(path, "observations")
+        self._calibration: List[Dict[str, Any]] = self._load(calibration_path, "observations")
+        self._runtime = np.array(_RUNTIME_PRIOR)
+        self._memory = np.array(_MEMORY_PRIOR)
+        self._fit()
+
+    @staticmethod
+    def _load(path: Optional[Path], key: str) -> List[Dict[str, Any]]:
+        if path is None or not path.is_file():
+            return []
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return []
+        rows = data.get(key) if isinstance(data, dict) else None
+        return [row for row in rows or [] if isinstance(row, dict) and row.get("duration_s")]
+
+    def _fit(self) -> None:
+        rows = self._calibration + self._observations
+        if rows:
+            x = np.stack([_design_row(r["duration_s"], r.get("features") or {}) for r in rows])
+        else:
+            x = np.zeros((0, len(COEFFICIENTS)))
+        timed = [i for i, r in enumerate(rows) if r.get("runtime_s")]
+        self._runtime = _ridge(x[timed], np.array([float(rows[i]["runtime_s"]) for i in timed]),
+                               np.array(_RUNTIME_PRIOR), self.prior_weight)
+        sized = [i for i, r in enumerate(rows) if r.get("peak_rss_bytes")]
+        self._memory = _ridge(x[sized], np.array([float(rows[i]["peak_rss_bytes"]) for i in sized]),
+                              np.array(_MEMORY_PRIOR), self.prior_weight)
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        payload = {"host": self.host, "observations": self._observations}
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def features(
+        enable_demucs: Optional[bool],
+        has_reference: bool,
+        section_aware: Optional[bool],
+        transient: Optional[bool],
+        sample_rate: Optional[int],
+        deliverables: int = 0,
+        normalize: bool = False,
+    ) -> Dict[str, Any]:
+        """Features from job settings (the same rules the engine command line follows)."""
+        if normalize:
+            # Native sample rate, no reference, stems or enhancement stages; its deliverables are
+            # streamed limiter passes, far cheaper than the "deliverables" coefficient prices them.
+            return {**{name: False for name in FEATURES}, "deliverables": 0, "normalize": True}
+        return {
+            "stems": enable_demucs is True,
+            "stems_auto": enable_demucs is None,
+            "reference": bool(has_reference),
+            "hooklift": section_aware is not False,
+            "transient": transient is not False,
+            "resample": bool(sample_rate) and int(sample_rate) != ENGINE_SAMPLE_RATE,
+            "deliverables": int(deliverables),
+            "normalize": False,
+        }
+
+    def predict_runtime(self, duration_s: float, features: Mapping[str, Any]) -> float:
+        with self._lock:
+            return max(1.0, float(_design_row(duration_s, features) @ self._runtime))
+
+    def predict_peak_bytes(self, duration_s: float, features: Mapping[str, Any]) -> int:
+        with self._lock:
+            return max(0, int(_design_row(duration_s, features) @ self._memory))
+
+    def observe(
+        self,
+        duration_s: float,
+        sample_rate: Optional[int],
+        features: Mapping[str, Any],
+        runtime_s: float,
+        peak_rss_bytes: Optional[int],
+        stages: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        """Add a completed job, refit and persist."""
+        row = {
+            "duration_s": round(float(duration_s), 3),
+            "sr": int(sample_rate) if sample_rate else None,
+            "features": {name: int(features.get(name) or 0) if name == "deliverables" else bool(features.get(name))
+                         for name in FEATURES},
+            "runtime_s": round(float(runtime_s), 3),
+            "peak_rss_bytes": int(peak_rss_bytes) if peak_rss_bytes else None,
+            "stages": {str(k): round(float(v), 4) for k, v in (stages or {}).items()},
+            "at": round(time.time(), 1),
+        }
+        with self._lock:
+            self._observations.append(row)
+            del self._observations[: -self.max_observations]
+            self._fit()
+            self._save()
+
+    def typical_duration(self) -> Optional[float]:
+        with self._lock:
+            durations = [float(r["duration_s"]) for r in self._observations + self._calibration]
+        return float(np.median(durations)) if durations else None
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._calibration + self._observations
+            stage_rates: Dict[str, List[float]] = {}
+            for row in rows:
+                for stage, seconds in (row.get("stages") or {}).items():
+                    stage_rates.setdefault(stage, []).append(float(seconds) / float(row["duration_s"]))
+            return {
+                "host": self.host,
+                "path": str(self.path) if self.path else None,
+                "observations": len(self._observations),
+                "calibration_observations": len(self._calibration),
+                "runtime_coefficients": {k: round(float(v), 5) for k, v in zip(COEFFICIENTS, self._runtime)},
+                "memory_coefficients": {k: round(float(v)) for k, v in zip(COEFFICIENTS, self._memory)},
+                "stage_seconds_per_audio_second": {
+                    stage: round(float(np.median(values)), 5) for stage, values in stage_rates.items()
+                },
+            }
@@ -0,0 +1,399 @@
+"""
+Retention and quota enforcement for job working directories.
+
+Each job directory holds four artifact classes with their own TTL,
+counted from the moment the job finished:
+
+    inputs         input/            (uploaded target and reference)
+    intermediates  anything else the engine leaves in the workdir
+    outputs        output/           (mastered audio and report)
+    logs           logs/, resources.json
+
+A daemon thread sweeps DATA_DIR periodically. It deletes expired
+artifacts, then, if the directory is still over `STORAGE_QUOTA_MB`, evicts
+whole finished jobs least-recently-accessed first. Deletions are planned
+in one pass and executed as a batch on the janitor thread, never on a
+request. Active and pinned jobs (downloads in flight) are never touched,
+and directories left over from a previous process are treated as
+finished at their last modification time.
+
+Inputs linked from the blob store are accounted once, under "blobs";
+deleting them from a workdir drops a reference, and the store's own
+copy is collected here once it has been unreferenced for
+`BLOB_UNREFERENCED_TTL_SEC` (immediately when over quota).
+
+Engine stage checkpoints (`DATA_DIR/_checkpoints`) are a pure cache:
+entries unused for `CHECKPOINT_TTL_SEC` are deleted, and when over quota
+they go, least recently used first, before any job is evicted.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    from . import metrics
+    from .config import settings
+except ImportError:  # pragma: no cover - supports direct module execution
+    import metrics
+    from config import settings
+
+logger = logging.getLogger("auralmind.janitor")
+
+ARTIFACT_CLASSES = ("inputs", "intermediates", "outputs", "logs")
+_JOB_DIR_RE = re.compile(r"^[0-9a-f]{32}$")
+_TERMINAL = frozenset({"completed", "failed", "cancelled"})
+# Quota eviction stops once usage is back under this fraction of the quota.
+_QUOTA_LOW_WATER = 0.9
+# Half-written checkpoints older than this are debris from a crashed engine.
+_CHECKPOINT_TMP_MAX_AGE_SEC = 3600.0
+
+
+def classify(name: str) -> str:
+    """Artifact class of a top-level entry in a job directory."""
+    if name == "input":
+        return "inputs"
+    if name == "output":
+        return "outputs"
+    if name in ("logs", "resources.json"):
+        return "logs"
+    return "intermediates"
+
+
+def _file_bytes(path: str) -> int:
+    # Hard-linked files are blob-store inputs; their bytes are accounted once, under "blobs".
+    st = os.lstat(path)
+    return st.st_size if st.st_nlink <= 1 else 0
+
+
+def _tree_bytes(path: Path) -> int:
+    try:
+        if not path.is_dir() or path.is_symlink():
+            return _file_bytes(str(path))
+    except OSError:
+        return 0
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += _file_bytes(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _remove(path: Path) -> None:
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def collect_checkpoints(root: Path, ttl_sec: float, free_bytes: int = 0) -> Dict[str, int]:
+    """
+    Delete engine checkpoints unused for `ttl_sec`, then, if `free_bytes`
+    is set, the least recently used ones until that much is freed.
+    """
+    now = time.time()
+    stats = {"bytes": 0, "deleted_bytes": 0}
+    entries = []
+    try:
+        scanned = list(os.scandir(root))
+    except OSError:
+        return stats
+    for entry in scanned:
+        try:
+            last_used = entry.stat(follow_symlinks=False).st_mtime
+        except OSError:
+            continue
+        size = _tree_bytes(Path(entry.path))
+        if entry.name.startswith("."):
+            # Still being written, unless the engine died long ago.
+            if now - last_used > _CHECKPOINT_TMP_MAX_AGE_SEC:
+                _remove(Path(entry.path))
+            else:
+                stats["bytes"] += size
+            continue
+        if now - last_used > ttl_sec:
+            _remove(Path(entry.path))
+            stats["deleted_bytes"] += size
+            continue
+        entries.append((last_used, size, Path(entry.path)))
+        stats["bytes"] += size
+    for _last_used, size, path in sorted(entries, key=lambda e: e[0]):
+        if stats["deleted_bytes"] >= free_bytes:
+            break
+        _remove(path)
+        stats["bytes"] -= size
+        stats["deleted_bytes"] += size
+    return stats
+
+
+@dataclass
+class _Candidate:
+    """A finished (or orphaned) job directory the janitor may delete from."""
+
+    job_id: str
+    workdir: Path
+    job: Any
+    finished: dt.datetime
+    last_access: dt.datetime
+    sizes: Dict[str, int]
+    paths: Dict[str, List[Path]]
+
+
+@dataclass
+class _Deletion:
+    candidate: _Candidate
+    artifact: Optional[str]  # None removes the whole directory
+    paths: List[Path]
+    sizes: Dict[str, int]
+    reason: str  # "ttl" or "quota"
+
+
+class Janitor:
+    """Background sweeper owning all deletions under the job data directory."""
+
+    def __init__(self, manager: Any) -> None:
+        self.manager = manager
+        self.ttls = {
+            "inputs": settings.JANITOR_INPUT_TTL_SEC,
+            "intermediates": settings.JANITOR_INTERMEDIATE_TTL_SEC,
+            "outputs": settings.JANITOR_OUTPUT_TTL_SEC,
+            "logs": settings.JANITOR_LOG_TTL_SEC,
+        }
+        self.blob_ttl = float(settings.BLOB_UNREFERENCED_TTL_SEC)
+        self.checkpoint_ttl = float(settings.CHECKPOINT_TTL_SEC)
+        self.quota_bytes = settings.STORAGE_QUOTA_MB * 1024 * 1024 if settings.STORAGE_QUOTA_MB > 0 else None
+        self.interval_sec = max(5.0, float(settings.JANITOR_INTERVAL_SEC))
+        self.max_deletions = max(1, int(settings.JANITOR_MAX_DELETIONS))
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Bytes written since the last sweep; lets uploads trigger an early sweep cheaply.
+        self._pending_bytes = 0
+        self._usage: Dict[str, Any] = {
+            "usage_bytes": {cls: 0 for cls in ARTIFACT_CLASSES + ("blobs", "checkpoints")},
+            "job_dirs": 0,
+            "blobs": 0,
+            "unreferenced_blob_bytes": 0,
+            "pinned_jobs": 0,
+            "last_sweep_at": None,
+            "last_sweep_seconds": None,
+            "deleted_bytes_total": 0,
+            "evicted_jobs_total": 0,
+        }
+
+    # -- lifecycle -----------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="janitor", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sweep()
+            except Exception:  # pragma: no cover - the janitor must outlive bad directories
+                logger.exception("Janitor sweep failed")
+            self._wake.wait(self.interval_sec)
+            self._wake.clear()
+
+    # -- pinning and accounting ---------------------------------------------
+
+    def pin(self, job: Any) -> None:
+        """Protect a job from deletion while a download streams from it."""
+        with self._lock:
+            job._pins += 1
+            job._pinned_at = time.monotonic()
+            job.last_accessed_at = dt.datetime.utcnow()
+
+    def unpin(self, job: Any) -> None:
+        with self._lock:
+            job._pins = max(0, job._pins - 1)
+
+    def _is_pinned(self, job: Any) -> bool:
+        # A client that vanished mid-download may never release its pin.
+        return job._pins > 0 and time.monotonic() - job._pinned_at < settings.JANITOR_PIN_MAX_SEC
+
+    def note_written(self, nbytes: int) -> None:
+        """Account freshly written bytes; wakes the sweeper early when the quota is at risk."""
+        with self._lock:
+            self._pending_bytes += int(nbytes)
+            usage = sum(self._usage["usage_bytes"].values()) + self._pending_bytes
+        if self.quota_bytes is not None and usage > self.quota_bytes:
+            self.wake()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            data = dict(self._usage)
+            data["usage_bytes"] = dict(self._usage["usage_bytes"])
+        data["total_bytes"] = sum(data["usage_bytes"].values())
+        data["quota_bytes"] = self.quota_bytes
+        data["ttl_seconds"] = dict(self.ttls, blobs=int(self.blob_ttl), checkpoints=int(self.checkpoint_ttl))
+        return data
+
+    # -- sweeping ------------------------------------------------------------
+
+    def sweep(self) -> Dict[str, Any]:
+        """Plan and execute one round of TTL expiry and quota eviction."""
+        started = time.monotonic()
+        now = dt.datetime.utcnow()
+        jobs = dict(self.manager.jobs)
+        data_dir: Path = self.manager.data_dir
+
+        blob_stats = self.manager.blobs.collect(self.blob_ttl)
+        usage = {cls: 0 for cls in ARTIFACT_CLASSES}
+        usage["blobs"] = blob_stats["blob_bytes"]
+        checkpoint_stats = collect_checkpoints(self.manager.checkpoint_dir, self.checkpoint_ttl)
+        usage["checkpoints"] = checkpoint_stats["bytes"]
+        checkpoint_deleted = checkpoint_stats["deleted_bytes"]
+        metrics.JANITOR_DELETED_BYTES.inc(checkpoint_deleted, reason="ttl")
+        candidates: List[_Candidate] = []
+        pinned = 0
+        try:
+            dirs = [d for d in os.scandir(data_dir) if d.is_dir(follow_symlinks=False) and _JOB_DIR_RE.match(d.name)]
+        except OSError:
+            dirs = []
+        for entry in dirs:
+            workdir = Path(entry.path)
+            sizes = {cls: 0 for cls in ARTIFACT_CLASSES}
+            paths: Dict[str, List[Path]] = {cls: [] for cls in ARTIFACT_CLASSES}
+            try:
+                children = list(workdir.iterdir())
+                mtime = dt.datetime.utcfromtimestamp(entry.stat().st_mtime)
+            except OSError:
+                continue
+            for child in children:
+                cls = classify(child.name)
+                sizes[cls] += _tree_bytes(child)
+                paths[cls].append(child)
+            for cls in ARTIFACT_CLASSES:
+                usage[cls] += sizes[cls]
+            job = jobs.get(entry.name)
+            if job is not None and (job.status not in _TERMINAL or job.finished_at is None or self._is_pinned(job)):
+                pinned += int(job.status in _TERMINAL)
+                continue
+            finished = job.finished_at if job is not None else mtime
+            last_access = (job.last_accessed_at or finished) if job is not None else mtime
+            candidates.append(_Candidate(entry.name, workdir, job, finished, last_access, sizes, paths))
+
+        # TTL expiry, counted from completion.
+        plan: List[_Deletion] = []
+        for cand in candidates:
+            age = (now - cand.finished).total_seconds()
+            expired = [cls for cls in ARTIFACT_CLASSES if cand.paths[cls] and 0 < self.ttls[cls] < age]
+            if not expired:
+                continue
+            if all(cls in expired for cls in ARTIFACT_CLASSES if cand.paths[cls]):
+                plan.append(_Deletion(cand, None, [cand.workdir], dict(cand.sizes), "ttl"))
+                cand.sizes = {cls: 0 for cls in ARTIFACT_CLASSES}
+            else:
+                for cls in expired:
+                    plan.append(_Deletion(cand, cls, cand.paths[cls], {cls: cand.sizes[cls]}, "ttl"))
+                    cand.sizes[cls] = 0
+
+        # Quota: evict whole finished jobs, least recently accessed first.
+        total = sum(usage.values()) - sum(sum(d.sizes.values()) for d in plan)
+        over_quota = self.quota_bytes is not None and total > self.quota_bytes
+        if over_quota:
+            # Blobs no job links to any more are the cheapest bytes to give back.
+            total -= blob_stats["unreferenced_bytes"]
+            # Checkpoints only cost a slower re-render; they go before any job.
+            excess = int(total - self.quota_bytes * _QUOTA_LOW_WATER)
+            if excess > 0 and usage["checkpoints"] > 0:
+                freed = collect_checkpoints(self.manager.checkpoint_dir, self.checkpoint_ttl, free_bytes=excess)
+                usage["checkpoints"] = freed["bytes"]
+                total -= freed["deleted_bytes"]
+                checkpoint_deleted += freed["deleted_bytes"]
+                metrics.JANITOR_DELETED_BYTES.inc(freed["deleted_bytes"], reason="quota")
+            for cand in sorted(candidates, key=lambda c: c.last_access):
+                if total <= self.quota_bytes * _QUOTA_LOW_WATER:
+                    break
+                left = sum(cand.sizes.values())
+                if left == 0:
+                    continue
+                sizes = dict(cand.sizes)
+                for item in plan:
+                    if item.candidate is cand:
+                        for cls, size in item.sizes.items():
+                            sizes[cls] += size
+                plan = [d for d in plan if d.candidate is not cand]
+                plan.append(_Deletion(cand, None, [cand.workdir], sizes, "quota"))
+                total -= left
+
+        deleted = self._execute(plan[: self.max_deletions])
+        if len(plan) > self.max_deletions:
+            self.wake()
+        blob_deleted = blob_stats["deleted_bytes"]
+        metrics.JANITOR_DELETED_BYTES.inc(blob_deleted, reason="ttl")
+        if over_quota:
+            # Evicted jobs may have released the last links to their inputs.
+            blob_stats = self.manager.blobs.collect(0.0)
+            usage["blobs"] = blob_stats["blob_bytes"]
+            blob_deleted += blob_stats["deleted_bytes"]
+            metrics.JANITOR_DELETED_BYTES.inc(blob_stats["deleted_bytes"], reason="quota")
+
+        with self._lock:
+            for item in deleted:
+                for cls, size in item.sizes.items():
+                    usage[cls] -= size
+            self._usage["usage_bytes"] = {cls: max(0, usage[cls]) for cls in usage}
+            self._usage["job_dirs"] = len(dirs) - sum(1 for d in deleted if d.artifact is None)
+            self._usage["blobs"] = blob_stats["blobs"]
+            self._usage["unreferenced_blob_bytes"] = blob_stats["unreferenced_bytes"]
+            self._usage["pinned_jobs"] = pinned
+            self._usage["last_sweep_at"] = now
+            self._usage["last_sweep_seconds"] = round(time.monotonic() - started, 3)
+            self._usage["deleted_bytes_total"] += (
+                sum(sum(d.sizes.values()) for d in deleted) + blob_deleted + checkpoint_deleted
+            )
+            self._usage["evicted_jobs_total"] += sum(1 for d in deleted if d.artifact is None)
+            self._pending_bytes = 0
+            for cls, size in self._usage["usage_bytes"].items():
+                metrics.STORAGE_BYTES.set(size, artifact=cls)
+        return self.snapshot()
+
+    def _execute(self, plan: List[_Deletion]) -> List[_Deletion]:
+        done: List[_Deletion] = []
+        for item in plan:
+            job = item.candidate.job
+            if job is not None:
+                with self._lock:
+                    if self._is_pinned(job):
+                        continue
+                    # Flag first so the API stops serving the artifact before it disappears.
+                    job.evicted.update(ARTIFACT_CLASSES if item.artifact is None else (item.artifact,))
+            for path in item.paths:
+                _remove(path)
+            if item.artifact is None:
+                self.manager.jobs.pop(item.candidate.job_id, None)
+            metrics.JANITOR_DELETED_BYTES.inc(sum(item.sizes.values()), reason=item.reason)
+            done.append(item)
+        if done:
+            logger.info(
+                "Janitor removed %d artifact group(s), %.1f MB",
+                len(done), sum(sum(d.sizes.values()) for d in done) / 1e6,
+            )
+        return done
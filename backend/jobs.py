@@ -10,9 +10,14 @@ directory.
 
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
+import heapq
+import json
 import os
+import platform
 import re
+import shutil
 import subprocess
 import sys
 import time
@@ -20,16 +25,32 @@ import uuid
 from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import soundfile as sf
 
 try:
     from .config import settings
+    from . import metrics
+    from .blobstore import BlobStore
+    from .costmodel import CostModel
+    from .janitor import Janitor
+    from .logtail import read_since
+    from .references import Reference, ReferenceLibrary
+    from .resources import process_sample, rusage_summary
     from .schemas import JobSettings
+    from .webhooks import WebhookDispatcher
 except ImportError:  # pragma: no cover - supports direct module execution
     from config import settings
+    import metrics
+    from blobstore import BlobStore
+    from costmodel import CostModel
+    from janitor import Janitor
+    from logtail import read_since
+    from references import Reference, ReferenceLibrary
+    from resources import process_sample, rusage_summary
     from schemas import JobSettings
+    from webhooks import WebhookDispatcher
 
 _DURATION_RE = re.compile(r"dur=([0-9]+(?:\.[0-9]+)?)s")
 _STAGE_HINTS = (
@@ -42,6 +63,88 @@ _STAGE_HINTS = (
     ("[master] governor + limiter + write", "Final loudness, true-peak control, and render", 94.0),
     ("[master] TOTAL runtime", "Finalizing artifacts", 98.0),
 )
+# Structured progress events (engine --progress-fd): stage -> (label, band start, band end).
+_STAGE_PLAN = {
+    "load": ("Source analysis and resampling", 3.0, 12.0),
+    "stems": ("Stem separation (HT-Demucs)", 12.0, 30.0),
+    "f0": ("Sub fundamental analysis", 30.0, 31.0),
+    "mono_sub": ("Mono-sub anchoring", 31.0, 33.0),
+    "match_eq": ("Reference match EQ + phase-safe convolution", 33.0, 44.0),
+    "warmth": ("Analog warmth tilt", 44.0, 46.0),
+    "masking_eq": ("Dynamic masking EQ", 46.0, 50.0),
+    "deess": ("De-essing", 50.0, 52.0),
+    "glow": ("Harmonic glow", 52.0, 54.0),
+    "spatial": ("Stereo field and width refinement", 54.0, 58.0),
+    "microshift": ("Side-channel micro-shift widening", 58.0, 60.0),
+    "microdetail": ("Micro-detail recovery in the side image", 60.0, 64.0),
+    "movement": ("Movement automation", 64.0, 68.0),
+    "hooklift": ("Section-aware hook lift", 68.0, 72.0),
+    "transient": ("Transient contour shaping", 72.0, 78.0),
+    "governor": ("Final loudness and true-peak control", 78.0, 90.0),
+    # The normalize preset streams three passes instead of the stages above.
+    "normalize_scan": ("Measuring loudness and peaks", 3.0, 30.0),
+    "normalize_limit": ("Loudness gain and true-peak limiting", 30.0, 70.0),
+    "normalize_write": ("Writing normalized output", 70.0, 90.0),
+    "deliver": ("Rendering delivery targets", 90.0, 96.0),
+    # --compare runs whole renders per variant and reports only these two stages.
+    "compare": ("Rendering comparison variants", 3.0, 92.0),
+    "loudness_match": ("Loudness-matching variants", 92.0, 98.0),
+    "write": ("Rendering mastered output", 96.0, 98.0),
+}
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+# Fallback runtime for queue-wait estimates when the input could not be probed.
+_DEFAULT_RUNTIME_SEC = 60.0
+
+# Report fields echoed in completion webhooks.
+_REPORT_SUMMARY_KEYS = (
+    "preset",
+    "lufs_post",
+    "true_peak_dbfs",
+    "governor_target_lufs",
+    "limiter_min_gain_db",
+    "runtime_sec",
+)
+_CHANGE_POLL_SEC = 0.25
+
+
+def engine_settings_args(s: JobSettings) -> List[str]:
+    """Engine flags for the DSP settings of a job (or of one comparison variant)."""
+    args: List[str] = []
+    if s.preset:
+        args.extend(["--preset", s.preset])
+    if s.enable_demucs is True:
+        args.append("--stems")
+    elif s.enable_demucs is False:
+        args.append("--no-stems")
+    if s.mono_sub is True:
+        args.append("--mono-sub")
+    elif s.mono_sub is False:
+        args.append("--no-mono-sub")
+    if s.dynamic_eq is True:
+        args.append("--masking-eq")
+    elif s.dynamic_eq is False:
+        args.append("--no-masking-eq")
+    if s.truepeak_limiter is False:
+        args.append("--no-limiter")
+    if s.target_lufs is not None:
+        args.extend(["--target-lufs", str(s.target_lufs)])
+    if s.true_peak_ceiling is not None:
+        args.extend(["--ceiling", str(s.true_peak_ceiling)])
+    if s.warmth and s.warmth > 0:
+        warmth = max(0.0, min(float(s.warmth), 100.0)) / 100.0
+        args.extend(["--warmth", f"{warmth:.4f}"])
+
+    if s.section_aware_mastering is True:
+        if s.section_lift_mix is not None:
+            args.extend(["--hooklift-mix", str(s.section_lift_mix)])
+    elif s.section_aware_mastering is False:
+        args.append("--no-hooklift")
+
+    if s.groove_transient_sculpting is False:
+        args.extend(["--transient-mix", "0.0"])
+    elif s.groove_transient_boost_db is not None:
+        args.extend(["--transient-boost", str(s.groove_transient_boost_db)])
+    return args
 
 
 @dataclass
@@ -62,14 +165,49 @@ class Job:
     workdir: Path = field(default_factory=Path)
     target_path: Path = field(default_factory=Path)
     reference_path: Optional[Path] = None
+    reference_profile_path: Optional[Path] = None
     output_path: Path = field(default_factory=Path)
     report_path: Path = field(default_factory=Path)
     log_path: Path = field(default_factory=Path)
     process: Optional[subprocess.Popen] = None
     future: Optional[Future] = None
     estimated_runtime_seconds: Optional[float] = None
+    queued_at: Optional[dt.datetime] = None
+    audio_duration_seconds: Optional[float] = None
+    audio_sample_rate: Optional[int] = None
+    estimated_peak_bytes: Optional[int] = None
+    # Album tracks: shift of the loudness target that keeps the set's relative levels (engine --target-lufs-offset).
+    loudness_offset_db: float = 0.0
+    resources: Dict[str, Any] = field(default_factory=dict)
+    stage_key: Optional[str] = None
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    callback_status: Optional[str] = None
+    last_accessed_at: Optional[dt.datetime] = None
+    # Artifact classes the janitor has deleted (inputs, intermediates, outputs, logs).
+    evicted: Set[str] = field(default_factory=set)
+    version: int = 0
     _log_offset: int = field(default=0, init=False, repr=False)
     _stage_floor: float = field(default=0.0, init=False, repr=False)
+    _stage_ceiling: float = field(default=100.0, init=False, repr=False)
+    _progress_fd: Optional[int] = field(default=None, init=False, repr=False)
+    _progress_buf: bytes = field(default=b"", init=False, repr=False)
+    _progress_events: int = field(default=0, init=False, repr=False)
+    _governor_iters: int = field(default=0, init=False, repr=False)
+    # Engine stage checkpoint the render resumed from (None for a full render).
+    _resumed_from: Optional[str] = field(default=None, init=False, repr=False)
+    _pins: int = field(default=0, init=False, repr=False)
+    _pinned_at: float = field(default=0.0, init=False, repr=False)
+    _snapshot: tuple = field(default=(), init=False, repr=False)
+    # (version, serialized status response) kept by the API; goes away with the job.
+    _status_body: Optional[Tuple[int, bytes]] = field(default=None, init=False, repr=False)
+
+    def variant_names(self) -> List[str]:
+        """Names accepted by download ?variant=: delivery targets and comparison variants."""
+        return [t.name for t in self.settings.deliverables] + [v.name for v in self.settings.variants]
+
+    def variant_path(self, name: str) -> Path:
+        """Output of a delivery target or comparison variant: the engine writes <out>.NAME<ext> next to the main master."""
+        return self.output_path.with_name(f"{self.output_path.stem}.{name}{self.output_path.suffix}")
 
 
 class JobManager:
@@ -79,36 +217,274 @@ class JobManager:
         self.data_dir = Path(settings.DATA_DIR)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.jobs: Dict[str, Job] = {}
-        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.max_workers = settings.MAX_CONCURRENT_JOBS
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        # Previews get their own lane so a few seconds of work never waits behind full renders.
+        self.preview_executor = ThreadPoolExecutor(max_workers=settings.PREVIEW_CONCURRENT_JOBS)
+        # Normalize-only jobs are short streamed passes; bulk batches of them must not hold mastering workers.
+        self.normalize_executor = ThreadPoolExecutor(max_workers=settings.NORMALIZE_CONCURRENT_JOBS)
+        # Analysis-only engine runs (no rendering) likewise stay off the mastering workers.
+        self.analysis_executor = ThreadPoolExecutor(max_workers=settings.ANALYZE_CONCURRENT_JOBS)
+        self.webhooks = WebhookDispatcher(
+            secret=settings.WEBHOOK_SECRET,
+            max_attempts=settings.WEBHOOK_MAX_ATTEMPTS,
+            timeout_sec=settings.WEBHOOK_TIMEOUT_SEC,
+            backoff_sec=settings.WEBHOOK_BACKOFF_SEC,
+            allowed_hosts=settings.CALLBACK_ALLOWED_HOSTS,
+        )
+        cost_model_path = settings.COST_MODEL_PATH or str(self.data_dir / f"costmodel-{platform.node() or 'local'}.json")
+        self.cost_model = CostModel(
+            Path(cost_model_path),
+            calibration_path=Path(settings.COST_MODEL_CALIBRATION) if settings.COST_MODEL_CALIBRATION else None,
+            prior_weight=settings.COST_MODEL_PRIOR_WEIGHT,
+        )
+        self.blobs = BlobStore(self.data_dir / "_blobs")
+        self.checkpoint_dir = self.data_dir / "_checkpoints"
+        self.references = ReferenceLibrary(
+            self.data_dir / "_references",
+            self.blobs,
+            script_path=settings.AURALMIND_SCRIPT_PATH,
+            timeout_sec=settings.JOB_TIMEOUT_SEC,
+        )
+        self.janitor = Janitor(self)
 
-    def _estimate_audio_duration_seconds(self, path: Path) -> Optional[float]:
-        """Best-effort audio duration estimate from file metadata."""
+    def _probe_audio(self, path: Path) -> Optional[Tuple[float, int]]:
+        """Best-effort (duration seconds, sample rate) from file metadata."""
         try:
             info = sf.info(str(path))
         except Exception:
             return None
         if info.samplerate <= 0 or info.frames <= 0:
             return None
-        return float(info.frames) / float(info.samplerate)
+        return float(info.frames) / float(info.samplerate), int(info.samplerate)
+
+    def _job_features(self, job: Job, settings_obj: Optional[JobSettings] = None) -> Dict[str, Any]:
+        # A stored reference profile costs nothing at run time, so only uploaded references count.
+        s = settings_obj or job.settings
+        return self.cost_model.features(
+            enable_demucs=False if s.preview else s.enable_demucs,
+            has_reference=job.reference_path is not None,
+            section_aware=s.section_aware_mastering,
+            transient=s.groove_transient_sculpting,
+            sample_rate=job.audio_sample_rate,
+            deliverables=len(s.deliverables),
+            normalize=s.normalize,
+        )
+
+    def _variant_peak_bytes(self, job: Job) -> int:
+        duration = float(job.audio_duration_seconds or 0.0)
+        return max(self.cost_model.predict_peak_bytes(duration, self._job_features(job, s))
+                   for _, s in job.settings.variant_settings())
+
+    def _compare_workers(self, job: Job) -> int:
+        """Variants a comparison renders at once: bounded by cores and COMPARE_MEMORY_BUDGET_MB."""
+        budget = settings.COMPARE_MEMORY_BUDGET_MB * 1024 * 1024
+        fits = int(budget // max(1, self._variant_peak_bytes(job)))
+        return max(1, min(len(job.settings.variants), os.cpu_count() or 1, fits))
 
     def _estimate_runtime_seconds(self, job: Job) -> Optional[float]:
         """
-        Estimate runtime for smoother progress/ETA.
-        Model is intentionally simple and conservative.
+        Estimate runtime (and peak memory) from the host's learned cost model.
+        Also records the probed duration/sample rate the model is keyed on.
         """
-        duration_s = self._estimate_audio_duration_seconds(job.target_path)
-        if duration_s is None:
+        probed = self._probe_audio(job.target_path)
+        if probed is None:
             return None
-        rtf = 0.16  # base real-time factor for no-stem runs
-        if job.reference_path:
-            rtf += 0.04
-        if job.settings.enable_demucs:
-            rtf += 0.55
-        if job.settings.section_aware_mastering:
-            rtf += 0.05
-        if job.settings.groove_transient_sculpting is not False:
-            rtf += 0.03
-        return max(14.0, 6.0 + duration_s * rtf)
+        job.audio_duration_seconds, job.audio_sample_rate = probed
+        if job.settings.variants:
+            job.estimated_peak_bytes = self._variant_peak_bytes(job) * self._compare_workers(job)
+        else:
+            job.estimated_peak_bytes = self.cost_model.predict_peak_bytes(job.audio_duration_seconds, self._job_features(job))
+        return self._predict_runtime(job)
+
+    def _predict_runtime(self, job: Job) -> float:
+        duration = float(job.audio_duration_seconds or 0.0)
+        if job.settings.preview:
+            # The whole-file analysis is cheap next to rendering: model the excerpt plus pre-roll.
+            duration = min(duration, settings.PREVIEW_SECONDS + 3.0)
+        if job.settings.variants:
+            # Like the engine's waves: the first variant per preset/stems choice pays for decode and separation,
+            # the rest resume from its checkpoints. Each wave spreads over the comparison's workers.
+            workers = self._compare_workers(job)
+            leaders: Dict[Tuple[str, Optional[bool]], float] = {}
+            followers: List[float] = []
+            for _, s in job.settings.variant_settings():
+                key = (s.preset, s.enable_demucs)
+                if key in leaders:
+                    shared = s.model_copy(update={"enable_demucs": False})
+                    followers.append(self.cost_model.predict_runtime(duration, self._job_features(job, shared)))
+                else:
+                    leaders[key] = self.cost_model.predict_runtime(duration, self._job_features(job, s))
+            waves = [list(leaders.values()), followers]
+            return sum(max(max(w), sum(w) / workers) for w in waves if w)
+        return self.cost_model.predict_runtime(duration, self._job_features(job))
+
+    def next_job_peak_bytes(self) -> Optional[int]:
+        """
+        Predicted peak memory of the job a freed worker would start next: the
+        oldest queued job, or a typical job on this host when nothing is queued.
+        """
+        queued = [j for j in list(self.jobs.values()) if j.status == "queued" and j.future is not None]
+        if queued:
+            return min(queued, key=lambda j: j.created_at).estimated_peak_bytes
+        duration = self.cost_model.typical_duration()
+        if duration is None:
+            return None
+        features = self.cost_model.features(
+            enable_demucs=None, has_reference=False, section_aware=None, transient=None, sample_rate=None
+        )
+        return self.cost_model.predict_peak_bytes(duration, features)
+
+    @staticmethod
+    def job_class(job: Job) -> str:
+        """Scheduling class used for queue accounting; stem separation dominates runtime."""
+        if job.settings.preview:
+            return "preview"
+        if job.settings.normalize and not job.settings.variants:
+            return "normalize"
+        variants = [s for _, s in job.settings.variant_settings()] or [job.settings]
+        return "stems" if any(s.enable_demucs for s in variants) else "standard"
+
+    @staticmethod
+    def _stems_label(job: Job) -> str:
+        if job.settings.enable_demucs is None:
+            return "auto"
+        return "on" if job.settings.enable_demucs else "off"
+
+    def collect_metrics(self) -> None:
+        """Refresh point-in-time gauges right before a scrape."""
+        counts = {status: 0 for status in ("queued", "processing", *sorted(TERMINAL_STATUSES))}
+        for job in list(self.jobs.values()):
+            counts[job.status] = counts.get(job.status, 0) + 1
+        for status, count in counts.items():
+            metrics.JOBS_BY_STATUS.set(count, status=status)
+        capacity = self.capacity()
+        for job_class, depth in capacity["queue_depth"].items():
+            metrics.QUEUE_DEPTH.set(depth, job_class=job_class)
+        metrics.WORKERS_BUSY.set(capacity["workers_busy"])
+        metrics.WORKERS_TOTAL.set(capacity["workers_total"])
+
+    def _sample_resources(self, job: Job) -> None:
+        """Track current/peak RSS and I/O of the running engine from /proc."""
+        if job.process is None:
+            return
+        sample = process_sample(job.process.pid)
+        if not sample:
+            return
+        usage = job.resources
+        if "rss_bytes" in sample:
+            usage["rss_bytes"] = sample["rss_bytes"]
+        peak = max(sample.get("rss_bytes", 0), sample.get("hwm_bytes", 0), int(usage.get("max_rss_bytes") or 0))
+        if peak:
+            usage["max_rss_bytes"] = peak
+        for key in ("io_read_bytes", "io_write_bytes"):
+            if key in sample:
+                usage[key] = sample[key]
+
+    def _reap(self, job: Job) -> bool:
+        """
+        Non-blocking exit check. On POSIX the child is reaped with wait4 so
+        its rusage (CPU, peak RSS, block I/O) is captured; Popen is told the
+        exit code directly since it can no longer wait on the pid itself.
+        """
+        process = job.process
+        if process is None or process.returncode is not None:
+            return True
+        if not hasattr(os, "wait4"):
+            return process.poll() is not None
+        try:
+            pid, status, usage = os.wait4(process.pid, os.WNOHANG)
+        except ChildProcessError:
+            # Already reaped through Popen; rusage is lost but the exit code is not.
+            return process.poll() is not None
+        if pid == 0:
+            return False
+        process.returncode = os.waitstatus_to_exitcode(status)
+        summary = rusage_summary(usage)
+        # wait4's ru_maxrss is exact; keep the larger in case sampling saw more.
+        summary["max_rss_bytes"] = max(summary["max_rss_bytes"], int(job.resources.get("max_rss_bytes") or 0))
+        job.resources.update(summary)
+        job.resources.pop("rss_bytes", None)
+        return True
+
+    def _persist_resources(self, job: Job) -> None:
+        """Store final resource usage next to the job artifacts."""
+        if not job.resources:
+            return
+        try:
+            with open(job.workdir / "resources.json", "w", encoding="utf-8") as f:
+                json.dump(job.resources, f, indent=2, sort_keys=True)
+        except OSError:
+            pass
+
+    def _record_finished(self, job: Job) -> None:
+        """Account a terminal job in the duration/outcome series."""
+        stems = self._stems_label(job)
+        metrics.JOBS_FINISHED.inc(status=job.status, preset=job.settings.preset, stems=stems)
+        cpu = float(job.resources.get("cpu_user_seconds", 0.0)) + float(job.resources.get("cpu_system_seconds", 0.0))
+        if cpu > 0:
+            metrics.JOB_CPU_SECONDS.inc(cpu, preset=job.settings.preset, stems=stems)
+        if job.status != "completed" or not job.started_at or not job.finished_at:
+            return
+        runtime = (job.finished_at - job.started_at).total_seconds()
+        metrics.JOB_DURATION.observe(runtime, preset=job.settings.preset, stems=stems)
+        if job.audio_duration_seconds:
+            metrics.JOB_REALTIME_FACTOR.observe(runtime / job.audio_duration_seconds, stems=stems)
+        if job._governor_iters:
+            metrics.GOVERNOR_ITERATIONS.observe(job._governor_iters)
+        # Previews, comparisons and resumed renders skip or repeat stages; their runtime says nothing about the host's cost.
+        if job.audio_duration_seconds and job._resumed_from is None and not job.settings.preview and not job.settings.variants:
+            self.cost_model.observe(
+                job.audio_duration_seconds,
+                job.audio_sample_rate,
+                self._job_features(job),
+                runtime_s=runtime,
+                peak_rss_bytes=job.resources.get("max_rss_bytes"),
+                stages=job.stage_timings,
+            )
+
+    def capacity(self) -> Dict[str, Any]:
+        """
+        Snapshot of worker slots, queued work and the expected wait for a new job.
+
+        The wait is simulated by handing queued jobs (FIFO, as the executor
+        does) to whichever slot frees up first, using each job's runtime
+        estimate minus the time already spent for running jobs.
+        """
+        now = dt.datetime.utcnow()
+        running: List[Job] = []
+        queued: List[Job] = []
+        depth = {"standard": 0, "stems": 0, "preview": 0, "normalize": 0}
+        for job in list(self.jobs.values()):
+            job_class = self.job_class(job)
+            if job_class in ("preview", "normalize"):
+                # Own lanes: previews and normalize jobs never hold or wait for a full-render slot.
+                depth[job_class] += int(job.status == "queued" and job.future is not None)
+            elif job.status == "processing":
+                running.append(job)
+            elif job.status == "queued" and job.future is not None:
+                queued.append(job)
+        queued.sort(key=lambda j: j.created_at)
+
+        slots = [0.0] * max(0, self.max_workers - len(running))
+        for job in running:
+            est = job.estimated_runtime_seconds or _DEFAULT_RUNTIME_SEC
+            elapsed = (now - job.started_at).total_seconds() if job.started_at else 0.0
+            slots.append(max(0.0, est - elapsed))
+        heapq.heapify(slots)
+        for job in queued:
+            depth[self.job_class(job)] += 1
+            start = heapq.heappop(slots)
+            heapq.heappush(slots, start + (job.estimated_runtime_seconds or _DEFAULT_RUNTIME_SEC))
+
+        busy = min(len(running), self.max_workers)
+        return {
+            "workers_total": self.max_workers,
+            "workers_busy": busy,
+            "workers_free": self.max_workers - busy,
+            "queue_depth": depth,
+            "estimated_wait_seconds": round(slots[0], 1) if slots else 0.0,
+        }
 
     def _set_stage(self, job: Job, stage: str, floor: float, detail: Optional[str] = None) -> None:
         """Update human-friendly stage text and progress floor."""
@@ -134,31 +510,205 @@ class JobManager:
             if duration_match:
                 try:
                     duration_s = float(duration_match.group(1))
-                    job.estimated_runtime_seconds = max(14.0, 6.0 + duration_s * 0.22)
+                    job.estimated_runtime_seconds = self.cost_model.predict_runtime(duration_s, self._job_features(job))
                 except Exception:
                     pass
 
+    def _apply_progress_event(self, job: Job, event: Dict[str, Any]) -> None:
+        """Fold one structured engine event into the job's stage/progress state."""
+        kind = event.get("event")
+        if kind == "audio":
+            if event.get("duration_s"):
+                job.audio_duration_seconds = float(event["duration_s"])
+                if job.estimated_runtime_seconds is None:
+                    job.estimated_runtime_seconds = self._predict_runtime(job)
+            return
+        if kind == "checkpoint":
+            job._resumed_from = str(event.get("stage") or "") or None
+            return
+        if kind == "cache":
+            caches = event.get("caches")
+            if isinstance(caches, dict):
+                for cache, stats in caches.items():
+                    if not isinstance(stats, dict):
+                        continue
+                    for key, result in (("hits", "hit"), ("misses", "miss")):
+                        amount = int(stats.get(key, 0))
+                        if amount > 0:
+                            metrics.CACHE_REQUESTS.inc(amount, cache=str(cache), result=result)
+            return
+        if kind == "done":
+            timings = event.get("stage_seconds")
+            if isinstance(timings, dict):
+                job.stage_timings.update({str(k): float(v) for k, v in timings.items()})
+            return
+        if kind != "stage":
+            return
+
+        name = str(event.get("stage") or "")
+        label, start, end = _STAGE_PLAN.get(name, (name.replace("_", " ").capitalize(), job._stage_floor, job._stage_floor))
+        try:
+            fraction = min(1.0, max(0.0, float(event.get("fraction", 0.0))))
+        except (TypeError, ValueError):
+            fraction = 0.0
+        if event.get("governor_iter") is not None:
+            job._governor_iters = max(job._governor_iters, int(event["governor_iter"]))
+        if event.get("stage_seconds") is not None:
+            job.stage_timings[name] = float(event["stage_seconds"])
+            metrics.STAGE_DURATION.observe(float(event["stage_seconds"]), stage=name)
+            detail = f"{label} finished in {float(event['stage_seconds']):.2f}s"
+        elif event.get("governor_iter") is not None:
+            detail = f"Governor pass {int(event['governor_iter'])}/{int(event.get('governor_steps') or 0)}"
+            if event.get("target_lufs") is not None:
+                detail += f" at {float(event['target_lufs']):.2f} LUFS"
+        elif fraction <= 0.0:
+            detail = f"Entering {name.replace('_', ' ')} stage"
+        else:
+            detail = f"{label} ({fraction * 100.0:.0f}%)"
+
+        job.stage_key = name
+        job._stage_ceiling = max(end, job._stage_floor)
+        self._set_stage(job, label, start + fraction * (end - start), detail=detail)
+
+    def _drain_progress(self, job: Job) -> None:
+        """Read any pending JSON-lines events from the engine's progress pipe."""
+        fd = job._progress_fd
+        if fd is None:
+            return
+        chunks = []
+        while True:
+            try:
+                chunk = os.read(fd, 65536)
+            except BlockingIOError:
+                break
+            except OSError:
+                chunk = b""
+            if not chunk:
+                # EOF: the engine exited (or closed the channel).
+                self._close_progress(job)
+                break
+            chunks.append(chunk)
+        if not chunks:
+            return
+        *lines, job._progress_buf = (job._progress_buf + b"".join(chunks)).split(b"\n")
+        for raw_line in lines:
+            try:
+                event = json.loads(raw_line)
+            except ValueError:
+                continue
+            if isinstance(event, dict):
+                job._progress_events += 1
+                self._apply_progress_event(job, event)
+
+    def _close_progress(self, job: Job) -> None:
+        if job._progress_fd is not None:
+            try:
+                os.close(job._progress_fd)
+            except OSError:
+                pass
+            job._progress_fd = None
+
+    def _publish(self, job: Job) -> None:
+        """Bump the job version whenever its client-visible state changed."""
+        snapshot = (
+            job.status,
+            round(job.progress, 1),
+            job.current_stage,
+            job.stage_detail,
+            job.eta_seconds,
+            job.error,
+            job.started_at,
+            job.finished_at,
+            job.callback_status,
+        )
+        if snapshot != job._snapshot:
+            job._snapshot = snapshot
+            job.version += 1
+
+    def _completion_payload(self, job: Job) -> Dict[str, Any]:
+        """Webhook body describing a finished job."""
+        summary: Optional[Dict[str, Any]] = None
+        if job.status == "completed" and job.report_path.is_file():
+            try:
+                report = json.loads(job.report_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                report = None
+            if isinstance(report, dict):
+                summary = {key: report[key] for key in _REPORT_SUMMARY_KEYS if key in report}
+        completed = job.status == "completed"
+        return {
+            "event": f"job.{job.status}",
+            "job_id": job.id,
+            "status": job.status,
+            "error": job.error,
+            "preset": job.settings.preset,
+            "created_at": job.created_at.isoformat(),
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+            "download_path": f"/api/jobs/{job.id}/download" if completed else None,
+            "variant_download_paths": {
+                name: f"/api/jobs/{job.id}/download?variant={name}" for name in job.variant_names()
+            } if completed else {},
+            "report_path": f"/api/jobs/{job.id}/report" if completed else None,
+            "report_summary": summary,
+        }
+
+    def _dispatch_callback(self, job: Job) -> None:
+        """POST the completion payload to the job's callback URL, if any."""
+        url = job.settings.callback_url
+        if not url:
+            return
+        job.callback_status = "pending"
+        self._publish(job)
+        future = self.webhooks.submit(url, self._completion_payload(job))
+
+        def _record(done: Future) -> None:
+            delivered = not done.cancelled() and done.exception() is None and bool(done.result())
+            job.callback_status = "delivered" if delivered else "failed"
+            self._publish(job)
+
+        future.add_done_callback(_record)
+
+    async def wait_for_change(self, job: Job, version: int, timeout: float) -> bool:
+        """
+        Wait until the job's version moves past `version`.
+        Returns False on timeout. Checking is an integer compare, so the
+        short poll interval costs nothing compared to client HTTP polling.
+        """
+        return await self.wait_for_any_change([(job, version)], timeout)
+
+    async def wait_for_any_change(self, watched: List[Tuple[Job, int]], timeout: float) -> bool:
+        """Wait until any (job, version) pair is outdated; False on timeout."""
+        deadline = time.monotonic() + max(0.0, float(timeout))
+        while all(job.version == version for job, version in watched):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(_CHANGE_POLL_SEC, remaining))
+        return True
+
     def _ingest_log_updates(self, job: Job) -> None:
         """Read appended log content and extract stage transitions."""
         if not job.log_path.exists():
             return
         try:
-            with open(job.log_path, "r", encoding="utf-8", errors="ignore") as log_reader:
-                log_reader.seek(job._log_offset)
-                chunk = log_reader.read()
-                job._log_offset = log_reader.tell()
-        except Exception:
+            chunk, job._log_offset = read_since(job.log_path, job._log_offset)
+        except OSError:
             return
 
         if not chunk:
             return
-        for raw_line in chunk.splitlines():
+        for raw_line in chunk.decode("utf-8", errors="ignore").splitlines():
             self._parse_log_line(job, raw_line)
 
     def _update_progress(self, job: Job) -> None:
         """Progress model: stage floors + elapsed-time estimate."""
-        self._ingest_log_updates(job)
+        self._drain_progress(job)
+        if not job._progress_events:
+            # Fallback for engines that do not speak the structured progress channel.
+            self._ingest_log_updates(job)
         if job.started_at is None:
+            self._publish(job)
             return
         elapsed = max(0.0, (dt.datetime.utcnow() - job.started_at).total_seconds())
         if job.estimated_runtime_seconds:
@@ -169,7 +719,11 @@ class JobManager:
             # Fallback when duration metadata is not available.
             time_progress = min(90.0, 2.0 + elapsed * 0.35)
             job.eta_seconds = None
+        if job._progress_events:
+            # Engine events are authoritative; time only interpolates inside the current stage band.
+            time_progress = min(time_progress, job._stage_ceiling - 0.5)
         job.progress = max(job.progress, job._stage_floor, float(time_progress))
+        self._publish(job)
 
     def create_job(self, settings_obj: JobSettings) -> Job:
         """Create a new job and register it in the registry."""
@@ -186,28 +740,69 @@ class JobManager:
         )
         job.target_path = workdir / "input" / "target"
         job.reference_path = None
+        job.reference_profile_path = None
         job.output_path = workdir / "output" / "mastered.wav"
         job.report_path = workdir / "output" / "report.json"
         job.log_path = workdir / "logs" / "stdout.log"
+        self._publish(job)
         self.jobs[job_id] = job
         return job
 
+    def attach_reference(self, job: Job, reference: Reference) -> None:
+        """
+        Point a job at a stored reference profile. The job links its own
+        copy, so deleting the reference later cannot break a queued job.
+        """
+        dest = job.workdir / "input" / "reference_profile.npz"
+        try:
+            os.link(reference.profile_path, dest)
+        except OSError:
+            shutil.copyfile(reference.profile_path, dest)
+        job.reference_profile_path = dest
+
+    def hold_job(self, job: Job, stage: str, detail: Optional[str] = None) -> None:
+        """Describe what a queued job waits on before it is scheduled (e.g. its album's analysis)."""
+        job.current_stage = stage
+        job.stage_detail = detail
+        self._publish(job)
+
+    def fail_job(self, job: Job, error: str) -> None:
+        """Fail a job that never reached the engine."""
+        job.status = "failed"
+        job.current_stage = "Master failed"
+        job.stage_detail = error
+        job.error = error
+        job.finished_at = dt.datetime.utcnow()
+        job.progress = 100.0
+        job.eta_seconds = 0
+        self._publish(job)
+
     def run_job(self, job_id: str) -> None:
         """Schedule execution of the job in a background thread."""
         job = self.jobs[job_id]
         job.estimated_runtime_seconds = self._estimate_runtime_seconds(job)
-        future = self.executor.submit(self._execute_job, job)
+        job.queued_at = dt.datetime.utcnow()
+        executor = {"preview": self.preview_executor, "normalize": self.normalize_executor}.get(
+            self.job_class(job), self.executor
+        )
+        future = executor.submit(self._execute_job, job)
         job.future = future
 
     def _execute_job(self, job: Job) -> None:
         """Worker function executed in a background thread."""
+        if job.status == "cancelled":
+            # Cancelled while queued, after the worker had already picked the future up.
+            return
         job.started_at = dt.datetime.utcnow()
+        if job.queued_at is not None:
+            metrics.QUEUE_WAIT.observe((job.started_at - job.queued_at).total_seconds(), job_class=self.job_class(job))
         job.status = "processing"
         job.progress = 2.0
         job.eta_seconds = None
         job._log_offset = 0
         job._stage_floor = 2.0
         self._set_stage(job, "Booting mastering engine", 2.0, "Launching DSP worker")
+        self._publish(job)
         script = settings.AURALMIND_SCRIPT_PATH
         cmd = [
             sys.executable,
@@ -219,59 +814,64 @@ class JobManager:
         ]
         if job.reference_path:
             cmd.extend(["--reference", str(job.reference_path)])
-        if job.settings.preset:
-            cmd.extend(["--preset", job.settings.preset])
-        if job.settings.enable_demucs is True:
-            cmd.append("--stems")
-        elif job.settings.enable_demucs is False:
-            cmd.append("--no-stems")
-        if job.settings.mono_sub is True:
-            cmd.append("--mono-sub")
-        elif job.settings.mono_sub is False:
-            cmd.append("--no-mono-sub")
-        if job.settings.dynamic_eq is True:
-            cmd.append("--masking-eq")
-        elif job.settings.dynamic_eq is False:
-            cmd.append("--no-masking-eq")
-        if job.settings.truepeak_limiter is False:
-            cmd.append("--no-limiter")
-        if job.settings.target_lufs is not None:
-            cmd.extend(["--target-lufs", str(job.settings.target_lufs)])
-        if job.settings.true_peak_ceiling is not None:
-            cmd.extend(["--ceiling", str(job.settings.true_peak_ceiling)])
-        if job.settings.warmth and job.settings.warmth > 0:
-            warmth = max(0.0, min(float(job.settings.warmth), 100.0)) / 100.0
-            cmd.extend(["--warmth", f"{warmth:.4f}"])
-
-        if job.settings.section_aware_mastering is True:
-            if job.settings.section_lift_mix is not None:
-                cmd.extend(["--hooklift-mix", str(job.settings.section_lift_mix)])
-        elif job.settings.section_aware_mastering is False:
-            cmd.append("--no-hooklift")
-
-        if job.settings.groove_transient_sculpting is False:
-            cmd.extend(["--transient-mix", "0.0"])
-        elif job.settings.groove_transient_boost_db is not None:
-            cmd.extend(["--transient-boost", str(job.settings.groove_transient_boost_db)])
+        elif job.reference_profile_path:
+            cmd.extend(["--reference-profile", str(job.reference_profile_path)])
+        elif job.settings.reference == "auto":
+            cmd.extend(["--reference-index", str(self.references.root)])
+        if job.settings.variants:
+            spec_path = job.workdir / "input" / "compare.json"
+            spec = {"variants": [{"name": name, "args": engine_settings_args(s)} for name, s in job.settings.variant_settings()]}
+            spec_path.write_text(json.dumps(spec, indent=2), encoding="utf-8")
+            cmd.extend(["--compare", str(spec_path), "--compare-jobs", str(self._compare_workers(job))])
+        else:
+            cmd.extend(engine_settings_args(job.settings))
 
         out_subtype = "PCM_16" if int(job.settings.output_pcm_bits) == 16 else "PCM_24"
         cmd.extend(["--out-subtype", out_subtype])
+        cmd.extend(["--report", str(job.report_path)])
+        if job.settings.preview:
+            cmd.extend(["--preview", str(settings.PREVIEW_SECONDS)])
+        if job.loudness_offset_db:
+            cmd.extend(["--target-lufs-offset", f"{job.loudness_offset_db:.3f}"])
+        for target in job.settings.deliverables:
+            subtype = "PCM_16" if int(target.output_pcm_bits) == 16 else "PCM_24"
+            cmd.extend(["--deliverable", f"{target.name}:{target.target_lufs}:{target.true_peak_ceiling}:{subtype}"])
+        if job.settings.profile:
+            cmd.extend(["--profile", str(job.workdir / "logs")])
+        elif settings.CHECKPOINT_TTL_SEC > 0 and not job.settings.preview:
+            # Profiles must cover the full render, so profiled jobs never resume.
+            cmd.extend(["--checkpoint-dir", str(self.checkpoint_dir)])
+        elif job.settings.variants:
+            # Comparisons share upstream work through checkpoints; without the shared cache they stay in the job.
+            cmd.extend(["--checkpoint-dir", str(job.workdir / "checkpoints")])
 
         env = os.environ.copy()
         env["PYTHONUNBUFFERED"] = "1"
         env.setdefault("PYTHONIOENCODING", "utf-8")
         log_file = open(job.log_path, "w", encoding="utf-8", buffering=1)
+        write_fd: Optional[int] = None
+        if os.name == "posix":
+            job._progress_fd, write_fd = os.pipe()
+            os.set_blocking(job._progress_fd, False)
+            cmd.extend(["--progress-fd", str(write_fd)])
         try:
-            job.process = subprocess.Popen(
-                cmd,
-                stdout=log_file,
-                stderr=subprocess.STDOUT,
-                cwd=str(job.workdir),
-                env=env,
-            )
+            try:
+                job.process = subprocess.Popen(
+                    cmd,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    cwd=str(job.workdir),
+                    env=env,
+                    pass_fds=(write_fd,) if write_fd is not None else (),
+                )
+            finally:
+                # The child owns the write end now; keeping it would block EOF detection.
+                if write_fd is not None:
+                    os.close(write_fd)
             while True:
-                if job.process.poll() is not None:
+                if self._reap(job):
                     break
+                self._sample_resources(job)
                 self._update_progress(job)
                 time.sleep(0.5)
             self._update_progress(job)
@@ -313,7 +913,12 @@ class JobManager:
             job.progress = max(job.progress, 100.0)
             if job.eta_seconds is None:
                 job.eta_seconds = 0
+            self._close_progress(job)
             log_file.close()
+            self._persist_resources(job)
+            self._publish(job)
+            self._record_finished(job)
+            self._dispatch_callback(job)
 
     def cancel_job(self, job_id: str) -> bool:
         """Attempt to cancel a running job."""
@@ -322,7 +927,8 @@ class JobManager:
             return False
         if job.status not in {"queued", "processing"}:
             return False
-        if job.process and job.process.poll() is None:
+        # returncode rather than poll(): the worker thread owns reaping (wait4).
+        if job.process and job.process.returncode is None:
             try:
                 job.process.kill()
                 job.status = "cancelled"
@@ -331,15 +937,24 @@ class JobManager:
                 job.finished_at = dt.datetime.utcnow()
                 job.progress = 100.0
                 job.eta_seconds = 0
+                self._publish(job)
                 return True
             except Exception:
                 return False
+        queued = job.status == "queued"
         job.status = "cancelled"
+        if queued and job.future is not None:
+            job.future.cancel()
         job.current_stage = "Job cancelled"
         job.stage_detail = "Cancelled by user request"
         job.finished_at = dt.datetime.utcnow()
         job.progress = 100.0
         job.eta_seconds = 0
+        self._publish(job)
+        if queued:
+            # The worker never runs (or returns at once), so the terminal bookkeeping happens here.
+            self._record_finished(job)
+            self._dispatch_callback(job)
         return True
 
 
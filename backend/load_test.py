@@ -0,0 +1,195 @@
+"""
+Load generator for the AuralMind API.
+
+Drives concurrent clients through the full job lifecycle (upload, status
+polling, log reads, download) against a running server and reports latency
+percentiles and errors per operation. Pair it with the stub engine to
+measure the API in isolation from DSP cost:
+
+    AURALMIND_SCRIPT_PATH=stub_engine.py STUB_ENGINE_RTF=0.1 uvicorn main:app --port 8000
+    python load_test.py --jobs 40 --concurrency 8 --duration 30
+"""
+
+import argparse
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+import requests
+import soundfile as sf
+
+API_BASE = os.environ.get("API_BASE", "http://localhost:8000")
+TERMINAL = {"completed", "failed", "cancelled"}
+
+
+class Recorder:
+    """Thread-safe latency and error tallies keyed by operation name."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.outcomes: Dict[str, int] = defaultdict(int)
+        self.job_seconds: List[float] = []
+
+    def call(self, op: str, session: requests.Session, method: str, url: str, ok=(200,), **kwargs):
+        t0 = time.perf_counter()
+        try:
+            res = session.request(method, url, **kwargs)
+        except requests.RequestException as exc:
+            with self._lock:
+                self.errors[op][type(exc).__name__] += 1
+            return None
+        elapsed = time.perf_counter() - t0
+        with self._lock:
+            self.latencies[op].append(elapsed)
+            if res.status_code not in ok:
+                self.errors[op][str(res.status_code)] += 1
+        return res if res.status_code in ok else None
+
+    def finish(self, status: str, seconds: float) -> None:
+        with self._lock:
+            self.outcomes[status] += 1
+            self.job_seconds.append(seconds)
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(math.ceil(q / 100.0 * len(ordered))) - 1))
+    return ordered[idx]
+
+
+def make_test_audio(path: str, duration_s: float, sr: int = 44100) -> None:
+    """Write a short stereo tone-plus-noise WAV so no fixture file is needed."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(duration_s * sr)) / sr
+    tone = 0.3 * np.sin(2 * np.pi * 110.0 * t) + 0.05 * rng.standard_normal(t.shape[0])
+    sf.write(path, np.stack([tone, tone * 0.9], axis=1).astype(np.float32), sr, subtype="PCM_16")
+
+
+def run_client(args: argparse.Namespace, rec: Recorder, target_path: str) -> None:
+    """One simulated user: upload, poll until terminal, read logs, download."""
+    session = requests.Session()
+    started = time.perf_counter()
+    with open(target_path, "rb") as f:
+        res = rec.call(
+            "upload", session, "POST", f"{args.base}/api/jobs",
+            files={"target": (os.path.basename(target_path), f, "audio/wav")},
+            data={"settings_json": json.dumps({"preset": args.preset})},
+            timeout=args.timeout,
+        )
+    if res is None:
+        rec.finish("upload_error", time.perf_counter() - started)
+        return
+    job_id = res.json()["id"]
+
+    etag: Optional[str] = None
+    log_offset = 0
+    status = "queued"
+    deadline = time.monotonic() + args.job_timeout
+    while status not in TERMINAL and time.monotonic() < deadline:
+        if args.poll == "long":
+            headers = {"If-None-Match": etag} if etag else {}
+            res = rec.call("status_longpoll", session, "GET", f"{args.base}/api/jobs/{job_id}",
+                           ok=(200, 304), params={"wait": 30}, headers=headers, timeout=args.timeout + 30)
+            if res is not None and res.status_code == 200:
+                etag = res.headers.get("ETag")
+                status = res.json()["status"]
+        else:
+            res = rec.call("status", session, "GET", f"{args.base}/api/jobs/{job_id}", timeout=args.timeout)
+            if res is not None:
+                status = res.json()["status"]
+            time.sleep(args.poll_interval)
+        if args.log_reads:
+            res = rec.call("logs", session, "GET", f"{args.base}/api/jobs/{job_id}/logs",
+                           params={"since": log_offset}, timeout=args.timeout)
+            if res is not None:
+                log_offset = int(res.headers.get("X-Log-Offset", log_offset))
+
+    if status not in TERMINAL:
+        status = "client_timeout"
+    elif status == "completed" and args.download:
+        rec.call("download", session, "GET", f"{args.base}/api/jobs/{job_id}/download", timeout=args.timeout)
+        rec.call("report", session, "GET", f"{args.base}/api/jobs/{job_id}/report", timeout=args.timeout)
+    rec.finish(status, time.perf_counter() - started)
+
+
+def summarize(rec: Recorder, wall_s: float) -> dict:
+    ops = {}
+    for op in sorted(set(rec.latencies) | set(rec.errors)):
+        values = rec.latencies.get(op, [])
+        ops[op] = {
+            "count": len(values),
+            "errors": dict(rec.errors.get(op, {})),
+            "p50_ms": round(percentile(values, 50) * 1000.0, 2),
+            "p90_ms": round(percentile(values, 90) * 1000.0, 2),
+            "p99_ms": round(percentile(values, 99) * 1000.0, 2),
+            "max_ms": round(max(values) * 1000.0, 2) if values else float("nan"),
+        }
+    return {
+        "wall_seconds": round(wall_s, 2),
+        "jobs": dict(rec.outcomes),
+        "jobs_per_minute": round(60.0 * sum(rec.outcomes.values()) / max(wall_s, 1e-9), 2),
+        "job_seconds_p50": round(percentile(rec.job_seconds, 50), 2),
+        "job_seconds_p90": round(percentile(rec.job_seconds, 90), 2),
+        "operations": ops,
+    }
+
+
+def print_summary(summary: dict) -> None:
+    print(f"{'operation':<18} {'count':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}  errors")
+    for op, row in summary["operations"].items():
+        errors = ", ".join(f"{k}x{v}" for k, v in row["errors"].items()) or "-"
+        print(f"{op:<18} {row['count']:>7} {row['p50_ms']:>9} {row['p90_ms']:>9} {row['p99_ms']:>9} {row['max_ms']:>9}  {errors}")
+    print(f"jobs: {summary['jobs']}  throughput: {summary['jobs_per_minute']} jobs/min  "
+          f"job time p50/p90: {summary['job_seconds_p50']}s/{summary['job_seconds_p90']}s  "
+          f"wall: {summary['wall_seconds']}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the mastering API")
+    parser.add_argument("--base", default=API_BASE, help="API base URL")
+    parser.add_argument("--target", default=None, help="Audio file to upload (default: generated tone)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Length of the generated audio in seconds")
+    parser.add_argument("--jobs", type=int, default=20, help="Total jobs to submit")
+    parser.add_argument("--concurrency", type=int, default=4, help="Simultaneous clients")
+    parser.add_argument("--preset", default="hi_fi_streaming", help="Mastering preset")
+    parser.add_argument("--poll", choices=("short", "long"), default="short",
+                        help="Fixed-interval polling, or ETag long-polling")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between short polls")
+    parser.add_argument("--no-logs", dest="log_reads", action="store_false", help="Skip incremental log reads")
+    parser.add_argument("--no-download", dest="download", action="store_false", help="Skip output/report downloads")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--job-timeout", type=float, default=1800.0, help="Give up on a job after this many seconds")
+    parser.add_argument("--json", default=None, help="Also write the summary to this JSON file")
+    args = parser.parse_args()
+
+    recorder = Recorder()
+    with tempfile.TemporaryDirectory(prefix="auralmind-load-") as tmp:
+        target = args.target
+        if target is None:
+            target = os.path.join(tmp, "load_test.wav")
+            make_test_audio(target, args.duration)
+        t_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+            futures = [pool.submit(run_client, args, recorder, target) for _ in range(args.jobs)]
+        for future in futures:
+            if future.exception() is not None:
+                recorder.outcomes["client_error"] += 1
+        result = summarize(recorder, time.perf_counter() - t_start)
+
+    print_summary(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    failed = sum(v for k, v in result["jobs"].items() if k != "completed")
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,73 @@
+"""
+Incremental readers for job log files.
+
+Engine logs grow for the whole lifetime of a job (Demucs runs can take many
+minutes), so readers here never scan the file from the start: tails seek
+backwards from the end in fixed-size blocks, and followers resume from a
+byte offset returned by the previous read.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import List, Tuple, Union
+
+PathLike = Union[str, Path]
+
+_BLOCK_SIZE = 8192
+
+
+def tail_lines(path: PathLike, lines: int, block_size: int = _BLOCK_SIZE) -> Tuple[bytes, int]:
+    """
+    Return (last `lines` lines, end offset), reading backwards block by block.
+    The end offset can be passed to `read_since` to follow the file.
+    """
+    lines = max(1, int(lines))
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        end = pos = f.tell()
+        blocks: List[bytes] = []
+        newlines = 0
+        # One extra newline is needed when the file ends with "\n".
+        while pos > 0 and newlines <= lines:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step)
+            blocks.append(block)
+            newlines += block.count(b"\n")
+    data = b"".join(reversed(blocks))
+    kept = data.splitlines(keepends=True)[-lines:]
+    return b"".join(kept), end
+
+
+def read_since(
+    path: PathLike,
+    offset: int,
+    max_bytes: int = 256 * 1024,
+    *,
+    complete_lines: bool = True,
+) -> Tuple[bytes, int]:
+    """
+    Read bytes appended after `offset`; returns (data, next_offset).
+
+    With `complete_lines`, a trailing partial line is left for the next call
+    unless the chunk is full and contains no newline at all (so one huge line
+    can never stall a follower). An offset past the end of the file means the
+    log was rewritten, so reading restarts from the beginning.
+    """
+    offset = max(0, int(offset))
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if offset > size:
+            offset = 0
+        f.seek(offset)
+        data = f.read(max(1, int(max_bytes)))
+    if complete_lines and data and not data.endswith(b"\n"):
+        cut = data.rfind(b"\n")
+        if cut >= 0:
+            data = data[: cut + 1]
+        elif len(data) < max_bytes:
+            data = b""
+    return data, offset + len(data)
@@ -9,27 +9,92 @@ creation, status polling and retrieval of outputs and reports.
 
 from __future__ import annotations
 
-from collections import deque
+import asyncio
+import hmac
 import json
 import logging
 import mimetypes
+import os
+import shutil
+import time
+import uuid
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 import dotenv
-from fastapi import BackgroundTasks, FastAPI, File, Form, HTTPException, Response, UploadFile
+from fastapi import BackgroundTasks, FastAPI, File, Form, Header, HTTPException, Query, Response, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 from pydantic import ValidationError
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 
 try:
+    from . import metrics
+    from .albums import Album, album_manager, iter_archive
+    from .analysis import ANALYSIS_DIR, AnalysisError, run_analysis
+    from .blobstore import UploadTooLarge
     from .config import settings
-    from .jobs import job_manager
-    from .schemas import ErrorResponse, JobReportResponse, JobSettings, JobStatusResponse
+    from .jobs import TERMINAL_STATUSES, Job, job_manager
+    from .logtail import read_since, tail_lines
+    from .references import Reference, ReferenceProfileError
+    from .resources import disk_snapshot, memory_snapshot
+    from .schemas import (
+        AlbumStatusResponse,
+        AlbumTrackStatus,
+        AnalyzeResponse,
+        CostModelResponse,
+        StorageResponse,
+        ErrorResponse,
+        JobReportResponse,
+        JobResourceUsage,
+        JobSettings,
+        JobStatusBatchRequest,
+        JobStatusBatchResponse,
+        JobStatusResponse,
+        ReadinessResponse,
+        ReferenceListResponse,
+        ReferenceResponse,
+        TrackAnalysisResponse,
+    )
+    from .webhooks import check_callback_url
 except ImportError:  # pragma: no cover - supports `uvicorn main:app` from backend/
+    import metrics
+    from albums import Album, album_manager, iter_archive
+    from analysis import ANALYSIS_DIR, AnalysisError, run_analysis
+    from blobstore import UploadTooLarge
     from config import settings
-    from jobs import job_manager
-    from schemas import ErrorResponse, JobReportResponse, JobSettings, JobStatusResponse
+    from jobs import TERMINAL_STATUSES, Job, job_manager
+    from logtail import read_since, tail_lines
+    from references import Reference, ReferenceProfileError
+    from resources import disk_snapshot, memory_snapshot
+    from schemas import (
+        AlbumStatusResponse,
+        AlbumTrackStatus,
+        AnalyzeResponse,
+        CostModelResponse,
+        StorageResponse,
+        ErrorResponse,
+        JobReportResponse,
+        JobResourceUsage,
+        JobSettings,
+        JobStatusBatchRequest,
+        JobStatusBatchResponse,
+        JobStatusResponse,
+        ReadinessResponse,
+        ReferenceListResponse,
+        ReferenceResponse,
+        TrackAnalysisResponse,
+    )
+    from webhooks import check_callback_url
+
 
+_SSE_HEARTBEAT_SEC = 15.0
+# Profile artifacts the engine writes into logs/ under --profile.
+_PROFILE_FILES = {
+    "pstats": ("profile.pstats", "application/octet-stream"),
+    "collapsed": ("profile.collapsed", "text/plain"),
+    "memory": ("profile_memory.json", "application/json"),
+}
 
 
 logger = logging.getLogger("auralmind.api")
@@ -46,7 +111,7 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["Content-Disposition"],
+    expose_headers=["Content-Disposition", "ETag", "X-Log-Offset"],
 )
 
 
@@ -57,12 +122,181 @@ async def log_runtime_config() -> None:
         logger.info("CORS allow_origin_regex=%s", settings.ALLOWED_ORIGIN_REGEX)
 
 
+@app.on_event("startup")
+async def start_janitor() -> None:
+    job_manager.janitor.start()
+
+
+@app.on_event("shutdown")
+async def stop_janitor() -> None:
+    job_manager.janitor.stop()
+
+
 @app.get("/api/health")
 async def health() -> dict:
     """Health check endpoint."""
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics() -> PlainTextResponse:
+    """Prometheus scrape endpoint (text exposition format)."""
+    job_manager.collect_metrics()
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/api/ready", response_model=ReadinessResponse)
+async def ready(response: Response) -> ReadinessResponse:
+    """
+    Capacity-aware readiness probe.
+
+    Unlike `/api/health` this answers "should this node take another
+    upload": it returns 503 once the queue, free disk or memory headroom
+    crosses the configured thresholds, so a load balancer can route around
+    a saturated node while it keeps draining its own work.
+    """
+    capacity = job_manager.capacity()
+    disk = disk_snapshot(job_manager.data_dir)
+    memory = memory_snapshot()
+
+    reasons: List[str] = []
+    queued = sum(capacity["queue_depth"].values())
+    if capacity["workers_free"] == 0 and queued >= settings.READY_MAX_QUEUE:
+        reasons.append(f"queue full ({queued} queued, limit {settings.READY_MAX_QUEUE})")
+    min_disk = settings.READY_MIN_FREE_DISK_MB * 1024 * 1024
+    if disk["free_bytes"] is not None and disk["free_bytes"] < min_disk:
+        reasons.append(f"low disk ({disk['free_bytes'] // (1024 * 1024)} MB free)")
+    # The floor is raised to what the next job is predicted to need on this host.
+    next_peak = job_manager.next_job_peak_bytes()
+    min_mem = max(settings.READY_MIN_FREE_MEM_MB * 1024 * 1024, next_peak or 0)
+    if memory["available_bytes"] is not None and memory["available_bytes"] < min_mem:
+        reasons.append(
+            f"low memory ({memory['available_bytes'] // (1024 * 1024)} MB available, "
+            f"{min_mem // (1024 * 1024)} MB needed)"
+        )
+
+    if reasons:
+        response.status_code = 503
+    return ReadinessResponse(
+        ready=not reasons,
+        reasons=reasons,
+        disk_free_bytes=disk["free_bytes"],
+        disk_total_bytes=disk["total_bytes"],
+        memory_available_bytes=memory["available_bytes"],
+        memory_total_bytes=memory["total_bytes"],
+        next_job_peak_bytes=next_peak,
+        **capacity,
+    )
+
+
+@app.get(
+    "/api/costmodel",
+    response_model=CostModelResponse,
+    responses={403: {"model": ErrorResponse}},
+)
+async def cost_model(x_admin_token: Optional[str] = Header(None)) -> CostModelResponse:
+    """Fitted runtime/memory model of this host. Admin only."""
+    _require_admin(x_admin_token)
+    return CostModelResponse(**job_manager.cost_model.summary())
+
+
+@app.get("/api/storage", response_model=StorageResponse)
+async def storage() -> StorageResponse:
+    """
+    Disk usage of job directories by artifact class, as of the janitor's
+    last sweep (usage is never walked on the request path), plus the
+    filesystem's free space right now.
+    """
+    disk = disk_snapshot(job_manager.data_dir)
+    return StorageResponse(
+        **job_manager.janitor.snapshot(),
+        disk_free_bytes=disk["free_bytes"],
+        disk_total_bytes=disk["total_bytes"],
+    )
+
+
+def _require_artifact(job: Job, artifact: str) -> None:
+    """410 once the janitor has expired or evicted the artifact class."""
+    if artifact in job.evicted:
+        raise HTTPException(status_code=410, detail=f"Job {artifact} have expired and were deleted")
+
+
+def _status_response(job: Job) -> JobStatusResponse:
+    """Build the public status representation of a job."""
+    return JobStatusResponse(
+        id=job.id,
+        status=job.status,
+        progress=job.progress,
+        current_stage=job.current_stage,
+        stage_key=job.stage_key,
+        stage_detail=job.stage_detail,
+        eta_seconds=job.eta_seconds,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        error=job.error,
+        stage_timings=job.stage_timings,
+        callback_status=job.callback_status,
+        resources=JobResourceUsage(**job.resources),
+        version=job.version,
+        settings=job.settings,
+    )
+
+
+def _status_body(job: Job) -> bytes:
+    """Serialized status JSON, cached on the job per version."""
+    version = job.version
+    cached = job._status_body
+    if cached is not None and cached[0] == version:
+        metrics.CACHE_REQUESTS.inc(cache="status_body", result="hit")
+        return cached[1]
+    metrics.CACHE_REQUESTS.inc(cache="status_body", result="miss")
+    body = _status_response(job).model_dump_json().encode("utf-8")
+    job._status_body = (version, body)
+    return body
+
+
+def _status_etag(job: Job) -> str:
+    return f'"{job.id}.{job.version}"'
+
+
+def _etag_version(job: Job, if_none_match: Optional[str]) -> Optional[int]:
+    """Return the job version named by an If-None-Match header, if it refers to this job."""
+    if not if_none_match:
+        return None
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        job_part, _, version_part = tag.strip('"').rpartition(".")
+        if job_part == job.id and version_part.isdigit():
+            return int(version_part)
+    return None
+
+
+def _require_admin(token: Optional[str]) -> None:
+    """Reject callers without the configured X-Admin-Token."""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin features are disabled on this server")
+    if not token or not hmac.compare_digest(token.encode("utf-8"), settings.ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+async def _store_upload(upload: UploadFile, dest: Path, kind: str) -> None:
+    """
+    Hash the upload into the blob store while it streams in and link it to
+    `dest`; content the store already has is not written again.
+    """
+    try:
+        _digest, size, existed = await job_manager.blobs.ingest(upload, dest, settings.MAX_UPLOAD_MB * 1024 * 1024)
+    except UploadTooLarge:
+        raise HTTPException(status_code=400, detail=f"{kind.capitalize()} file exceeds maximum allowed size")
+    metrics.UPLOAD_BYTES.inc(size, kind=kind)
+    metrics.CACHE_REQUESTS.inc(cache="upload_blob", result="hit" if existed else "miss")
+    if not existed:
+        job_manager.janitor.note_written(size)
+
+
 def _validate_upload(file: UploadFile, max_mb: int) -> None:
     """Validate an uploaded file."""
     if not file:
@@ -83,6 +317,7 @@ async def create_job(
     target: UploadFile = File(...),
     reference: Optional[UploadFile] = File(None),
     settings_json: Optional[str] = Form(None),
+    x_admin_token: Optional[str] = Header(None),
 ) -> JobStatusResponse:
     """Create a new mastering job."""
     _validate_upload(target, settings.MAX_UPLOAD_MB)
@@ -93,64 +328,137 @@ async def create_job(
         job_settings = JobSettings(**settings_data)
     except (json.JSONDecodeError, ValidationError) as exc:
         raise HTTPException(status_code=400, detail=f"Invalid settings: {exc}")
+    if job_settings.profile:
+        _require_admin(x_admin_token)
+    if job_settings.callback_url:
+        try:
+            await run_in_threadpool(check_callback_url, job_settings.callback_url, settings.CALLBACK_ALLOWED_HOSTS)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=f"Invalid settings: {exc}")
+    stored_reference: Optional[Reference] = None
+    if sum((reference is not None, job_settings.reference_id is not None, job_settings.reference == "auto")) > 1:
+        raise HTTPException(status_code=400, detail="Choose one of: reference upload, reference_id, reference \"auto\"")
+    if reference is not None and job_settings.normalize:
+        raise HTTPException(status_code=400, detail=f"Preset {job_settings.preset!r} does not use a reference")
+    if job_settings.reference == "auto":
+        if not job_manager.references.all():
+            raise HTTPException(status_code=400, detail="No stored references to choose from")
+        if not job_manager.references.has_index():
+            await run_in_threadpool(job_manager.references.rebuild_index)
+    if job_settings.reference_id:
+        stored_reference = job_manager.references.get(job_settings.reference_id)
+        if stored_reference is None:
+            raise HTTPException(status_code=400, detail="Unknown reference_id")
 
     job = job_manager.create_job(job_settings)
     target_ext = Path(target.filename or "target").suffix or ".wav"
     job.target_path = job.workdir / "input" / f"target{target_ext}"
-    with open(job.target_path, "wb") as out_f:
-        content = await target.read()
-        if len(content) > settings.MAX_UPLOAD_MB * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="Target file exceeds maximum allowed size")
-        out_f.write(content)
+    await _store_upload(target, job.target_path, "target")
 
     if reference:
         ref_ext = Path(reference.filename or "reference").suffix or ".wav"
         ref_path = job.workdir / "input" / f"reference{ref_ext}"
         job.reference_path = ref_path
-        with open(ref_path, "wb") as ref_f:
-            ref_content = await reference.read()
-            if len(ref_content) > settings.MAX_UPLOAD_MB * 1024 * 1024:
-                raise HTTPException(status_code=400, detail="Reference file exceeds maximum allowed size")
-            ref_f.write(ref_content)
+        await _store_upload(reference, ref_path, "reference")
+    elif stored_reference is not None:
+        job_manager.attach_reference(job, stored_reference)
 
     background_tasks.add_task(job_manager.run_job, job.id)
-    return JobStatusResponse(
-        id=job.id,
-        status=job.status,
-        progress=job.progress,
-        current_stage=job.current_stage,
-        stage_detail=job.stage_detail,
-        eta_seconds=job.eta_seconds,
-        created_at=job.created_at,
-        started_at=job.started_at,
-        finished_at=job.finished_at,
-        error=job.error,
-        settings=job.settings,
+    return _status_response(job)
+
+
+@app.post(
+    "/api/jobs/status",
+    response_model=JobStatusBatchResponse,
+    responses={400: {"model": ErrorResponse}},
+)
+async def get_job_statuses(
+    query: JobStatusBatchRequest,
+    wait: float = Query(0.0, ge=0.0, description="Seconds to wait for any listed job to change."),
+) -> Response:
+    """Retrieve many job statuses in one call, skipping jobs the caller already has."""
+    ids = list(dict.fromkeys(query.ids))
+    found: List[Job] = [job_manager.jobs[job_id] for job_id in ids if job_id in job_manager.jobs]
+    missing = [job_id for job_id in ids if job_id not in job_manager.jobs]
+    if wait > 0 and found and query.versions:
+        watched = [(job, query.versions[job.id]) for job in found if job.id in query.versions]
+        if len(watched) == len(found):
+            await job_manager.wait_for_any_change(watched, min(wait, settings.STATUS_MAX_WAIT_SEC))
+
+    changed: List[bytes] = []
+    unchanged: List[str] = []
+    for job in found:
+        if query.versions.get(job.id) == job.version:
+            unchanged.append(job.id)
+        else:
+            changed.append(_status_body(job))
+    # Splice cached per-job bodies instead of re-serializing every status.
+    body = (
+        b'{"jobs":[' + b",".join(changed) + b'],"unchanged":' + json.dumps(unchanged).encode("utf-8")
+        + b',"missing":' + json.dumps(missing).encode("utf-8") + b"}"
     )
+    return Response(content=body, media_type="application/json")
 
 
 @app.get(
     "/api/jobs/{job_id}",
     response_model=JobStatusResponse,
+    responses={304: {"description": "Not modified"}, 404: {"model": ErrorResponse}},
+)
+async def get_job_status(
+    job_id: str,
+    wait: float = Query(0.0, ge=0.0, description="Long-poll: seconds to wait for a newer version."),
+    version: Optional[int] = Query(None, ge=0, description="Last seen version (alternative to If-None-Match)."),
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    """Retrieve the status of a given job (ETag / long-poll aware)."""
+    job = job_manager.jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    seen = _etag_version(job, if_none_match)
+    if seen is None:
+        seen = version
+    if seen is not None and seen == job.version and wait > 0:
+        await job_manager.wait_for_change(job, seen, min(wait, settings.STATUS_MAX_WAIT_SEC))
+    headers = {"ETag": _status_etag(job), "Cache-Control": "no-cache"}
+    if seen is not None and seen == job.version:
+        return Response(status_code=304, headers=headers)
+    return Response(content=_status_body(job), media_type="application/json", headers=headers)
+
+
+async def _job_event_stream(job: Job, last_version: int) -> AsyncIterator[str]:
+    """Yield a `status` event per job version change until the job is terminal."""
+    while True:
+        if job.version != last_version:
+            last_version = job.version
+            payload = _status_body(job).decode("utf-8")
+            yield f"id: {last_version}\nevent: status\ndata: {payload}\n\n"
+
+        if job.status in TERMINAL_STATUSES:
+            yield "event: end\ndata: {}\n\n"
+            return
+        if not await job_manager.wait_for_change(job, last_version, _SSE_HEARTBEAT_SEC):
+            # Comment line keeps proxies from closing an idle stream.
+            yield ": keep-alive\n\n"
+
+
+@app.get(
+    "/api/jobs/{job_id}/events",
     responses={404: {"model": ErrorResponse}},
 )
-async def get_job_status(job_id: str) -> JobStatusResponse:
-    """Retrieve the status of a given job."""
+async def job_events(job_id: str, last_event_id: Optional[str] = Header(None)) -> StreamingResponse:
+    """Server-sent events stream pushing status changes for a job."""
     job = job_manager.jobs.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return JobStatusResponse(
-        id=job.id,
-        status=job.status,
-        progress=job.progress,
-        current_stage=job.current_stage,
-        stage_detail=job.stage_detail,
-        eta_seconds=job.eta_seconds,
-        created_at=job.created_at,
-        started_at=job.started_at,
-        finished_at=job.finished_at,
-        error=job.error,
-        settings=job.settings,
+    try:
+        last_version = int(last_event_id) if last_event_id else -1
+    except ValueError:
+        last_version = -1
+    return StreamingResponse(
+        _job_event_stream(job, last_version),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -158,17 +466,65 @@ async def get_job_status(job_id: str) -> JobStatusResponse:
     "/api/jobs/{job_id}/download",
     responses={404: {"model": ErrorResponse}},
 )
-async def download_output(job_id: str) -> Response:
-    """Download the mastered audio file for a completed job."""
+async def download_output(
+    job_id: str,
+    variant: Optional[str] = Query(None, description="Name of a delivery target or comparison variant."),
+    matched: bool = Query(False, description="Comparison variants only: the loudness-matched copy."),
+) -> Response:
+    """Download the mastered audio file (or one of its delivery masters or comparison variants) for a completed job."""
     job = job_manager.jobs.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     if job.status != "completed":
         raise HTTPException(status_code=400, detail="Job is not complete")
-    if not job.output_path.is_file():
+    _require_artifact(job, "outputs")
+    if job.settings.variants and variant is None:
+        raise HTTPException(status_code=400, detail="Comparison jobs are downloaded per variant (?variant=NAME)")
+    if matched and not job.settings.variants:
+        raise HTTPException(status_code=400, detail="Only comparison variants have loudness-matched copies")
+    path = job.output_path
+    if variant is not None:
+        names = job.variant_names()
+        if variant not in names:
+            raise HTTPException(status_code=404, detail=f"Unknown variant; expected one of {names}")
+        path = job.variant_path(f"{variant}.matched" if matched else variant)
+    if not path.is_file():
         raise HTTPException(status_code=404, detail="Output file not found")
-    mime, _ = mimetypes.guess_type(job.output_path.name)
-    return FileResponse(job.output_path, media_type=mime or "application/octet-stream", filename=job.output_path.name)
+    mime, _ = mimetypes.guess_type(path.name)
+    # Pinned until the body has been sent, so the janitor cannot delete it mid-stream.
+    job_manager.janitor.pin(job)
+    return FileResponse(
+        path,
+        media_type=mime or "application/octet-stream",
+        filename=path.name,
+        background=BackgroundTask(job_manager.janitor.unpin, job),
+    )
+
+
+@app.get(
+    "/api/jobs/{job_id}/profile/{kind}",
+    responses={403: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def download_profile(job_id: str, kind: str, x_admin_token: Optional[str] = Header(None)) -> Response:
+    """Download a profiling artifact (pstats, collapsed or memory) of a profiled job. Admin only."""
+    _require_admin(x_admin_token)
+    job = job_manager.jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if kind not in _PROFILE_FILES:
+        raise HTTPException(status_code=404, detail=f"Unknown profile artifact; expected one of {sorted(_PROFILE_FILES)}")
+    filename, media_type = _PROFILE_FILES[kind]
+    _require_artifact(job, "logs")
+    path = job.workdir / "logs" / filename
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="Profile not available for this job")
+    job_manager.janitor.pin(job)
+    return FileResponse(
+        path,
+        media_type=media_type,
+        filename=f"{job.id}-{filename}",
+        background=BackgroundTask(job_manager.janitor.unpin, job),
+    )
 
 
 @app.get(
@@ -183,6 +539,7 @@ async def get_report(job_id: str) -> JobReportResponse:
         raise HTTPException(status_code=404, detail="Job not found")
     if job.status != "completed":
         raise HTTPException(status_code=400, detail="Job is not complete")
+    _require_artifact(job, "outputs")
     if not job.report_path.is_file():
         raise HTTPException(status_code=404, detail="Report file not found")
     with open(job.report_path, "r", encoding="utf-8") as f:
@@ -197,22 +554,36 @@ async def get_report(job_id: str) -> JobReportResponse:
     "/api/jobs/{job_id}/logs",
     responses={404: {"model": ErrorResponse}},
 )
-async def get_logs(job_id: str, lines: int = 50) -> Response:
-    """Return the last few lines of the job's log file as plain text."""
+async def get_logs(
+    job_id: str,
+    lines: int = 50,
+    since: Optional[int] = Query(None, ge=0, description="Byte offset from a previous X-Log-Offset header."),
+) -> Response:
+    """
+    Return the last few lines of the job's log file as plain text, or with
+    `since`, only the bytes appended after that offset. Either way the
+    `X-Log-Offset` header carries the offset to pass on the next call.
+    """
     job = job_manager.jobs.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     if not job.log_path.is_file():
         # During early queued/processing states the log file may not exist yet.
         # Return an empty text response instead of a 404 to avoid noisy client errors.
-        return Response(content="", media_type="text/plain")
+        return Response(content="", media_type="text/plain", headers={"X-Log-Offset": str(since or 0)})
     try:
-        safe_lines = max(1, min(int(lines), 500))
-        with open(job.log_path, "r", encoding="utf-8", errors="ignore") as f:
-            tail = "".join(deque(f, maxlen=safe_lines))
-    except Exception as exc:
+        if since is not None:
+            data, next_offset = read_since(job.log_path, since)
+        else:
+            safe_lines = max(1, min(int(lines), 500))
+            data, next_offset = tail_lines(job.log_path, safe_lines)
+    except OSError as exc:
         raise HTTPException(status_code=500, detail=f"Unable to read log: {exc}")
-    return Response(content=tail, media_type="text/plain")
+    return Response(
+        content=data.decode("utf-8", errors="ignore"),
+        media_type="text/plain",
+        headers={"X-Log-Offset": str(next_offset)},
+    )
 
 
 @app.post(
@@ -228,16 +599,312 @@ async def cancel_job(job_id: str) -> JobStatusResponse:
     cancelled = job_manager.cancel_job(job_id)
     if not cancelled:
         raise HTTPException(status_code=400, detail="Unable to cancel job")
-    return JobStatusResponse(
-        id=job.id,
-        status=job.status,
-        progress=job.progress,
-        current_stage=job.current_stage,
-        stage_detail=job.stage_detail,
-        eta_seconds=job.eta_seconds,
-        created_at=job.created_at,
-        started_at=job.started_at,
-        finished_at=job.finished_at,
-        error=job.error,
-        settings=job.settings,
+    return _status_response(job)
+
+
+def _album_response(album: Album) -> AlbumStatusResponse:
+    """Build the public status representation of an album."""
+    return AlbumStatusResponse(
+        id=album.id,
+        status=album.status,
+        progress=album.progress,
+        eta_seconds=album.eta_seconds(job_manager.max_workers),
+        created_at=album.created_at,
+        finished_at=album.finished_at,
+        loudness_spread=album.loudness_spread,
+        reference_id=album.reference_id,
+        tracks=[
+            AlbumTrackStatus(
+                job_id=track.job.id,
+                filename=track.filename,
+                status=track.job.status,
+                progress=track.job.progress,
+                current_stage=track.job.current_stage,
+                error=track.job.error,
+                duration_s=track.duration_s,
+                source_lufs=track.source_lufs,
+                loudness_offset_db=track.job.loudness_offset_db,
+            )
+            for track in album.tracks
+        ],
+        settings=album.settings,
+    )
+
+
+@app.post(
+    "/api/albums",
+    response_model=AlbumStatusResponse,
+    responses={400: {"model": ErrorResponse}, 422: {"model": ErrorResponse}},
+)
+async def create_album(
+    background_tasks: BackgroundTasks,
+    targets: List[UploadFile] = File(...),
+    reference: Optional[UploadFile] = File(None),
+    settings_json: Optional[str] = Form(None),
+    loudness_spread: float = Form(0.5, ge=0.0, le=1.0),
+) -> AlbumStatusResponse:
+    """
+    Master an EP or album: every target against one reference, with loudness
+    targets that keep the set consistent. The reference is profiled once
+    (uploads are added to the reference library), the targets are analysed
+    in parallel, then the tracks render as regular jobs.
+
+    `loudness_spread` is the share of the sources' loudness differences the
+    masters keep: 1 preserves them (album gain), 0 brings every track to the
+    same target.
+    """
+    if not 2 <= len(targets) <= settings.ALBUM_MAX_TRACKS:
+        raise HTTPException(status_code=400, detail=f"An album needs 2 to {settings.ALBUM_MAX_TRACKS} targets")
+    for target in targets:
+        _validate_upload(target, settings.MAX_UPLOAD_MB)
+    if reference:
+        _validate_upload(reference, settings.MAX_UPLOAD_MB)
+    try:
+        settings_data = json.loads(settings_json or "{}")
+        job_settings = JobSettings(**settings_data)
+    except (json.JSONDecodeError, ValidationError) as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid settings: {exc}")
+    if job_settings.preview or job_settings.variants or job_settings.profile or job_settings.callback_url:
+        raise HTTPException(status_code=400, detail="Albums do not support preview, variants, profile or callback_url")
+    if job_settings.reference == "auto":
+        raise HTTPException(status_code=400, detail="Albums use one reference; reference \"auto\" is not supported")
+    if reference is not None and job_settings.reference_id is not None:
+        raise HTTPException(status_code=400, detail="Choose one of: reference upload, reference_id")
+    if reference is not None and job_settings.normalize:
+        raise HTTPException(status_code=400, detail=f"Preset {job_settings.preset!r} does not use a reference")
+    stored_reference: Optional[Reference] = None
+    if job_settings.reference_id:
+        stored_reference = job_manager.references.get(job_settings.reference_id)
+        if stored_reference is None:
+            raise HTTPException(status_code=400, detail="Unknown reference_id")
+    elif reference:
+        try:
+            digest, size, staged = await job_manager.references.stage_upload(
+                reference, settings.MAX_UPLOAD_MB * 1024 * 1024
+            )
+        except UploadTooLarge:
+            raise HTTPException(status_code=400, detail="Reference file exceeds maximum allowed size")
+        metrics.UPLOAD_BYTES.inc(size, kind="library_reference")
+        try:
+            stored_reference = await run_in_threadpool(
+                job_manager.references.add, digest, size, staged, reference.filename or ""
+            )
+        except ReferenceProfileError as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+        job_settings = job_settings.model_copy(update={"reference_id": stored_reference.id})
+
+    album = album_manager.create_album(
+        job_settings, loudness_spread, reference_id=stored_reference.id if stored_reference else None
+    )
+    for target in targets:
+        job = job_manager.create_job(job_settings)
+        target_ext = Path(target.filename or "target").suffix or ".wav"
+        job.target_path = job.workdir / "input" / f"target{target_ext}"
+        await _store_upload(target, job.target_path, "target")
+        if stored_reference is not None:
+            job_manager.attach_reference(job, stored_reference)
+        album_manager.add_track(album, job, target.filename or job.target_path.name)
+
+    background_tasks.add_task(album_manager.start, album)
+    return _album_response(album)
+
+
+@app.get(
+    "/api/albums/{album_id}",
+    response_model=AlbumStatusResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_album_status(album_id: str) -> AlbumStatusResponse:
+    """Aggregated album status plus the state of every track."""
+    album = album_manager.albums.get(album_id)
+    if album is None:
+        raise HTTPException(status_code=404, detail="Album not found")
+    return _album_response(album)
+
+
+@app.get(
+    "/api/albums/{album_id}/download",
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 410: {"model": ErrorResponse}},
+)
+async def download_album(album_id: str) -> StreamingResponse:
+    """
+    Stream a ZIP of the album's masters (`NN-<upload name>.wav`, plus each
+    delivery master) once no track is still running. Tracks that failed
+    are left out; the archive is built on the fly, never stored.
+    """
+    album = album_manager.albums.get(album_id)
+    if album is None:
+        raise HTTPException(status_code=404, detail="Album not found")
+    if album.status in ("analyzing", "processing"):
+        raise HTTPException(status_code=400, detail="Album is not complete")
+    jobs = [job for job in album.jobs if job.status == "completed"]
+    if not jobs:
+        raise HTTPException(status_code=400, detail="No track of the album completed")
+    for job in jobs:
+        _require_artifact(job, "outputs")
+    entries = album.archive_entries()
+    if not all(path.is_file() for _, path in entries):
+        raise HTTPException(status_code=404, detail="Output file not found")
+
+    def _unpin_all() -> None:
+        for job in jobs:
+            job_manager.janitor.unpin(job)
+
+    for job in jobs:
+        job_manager.janitor.pin(job)
+    return StreamingResponse(
+        iter_archive(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="album-{album.id[:8]}.zip"'},
+        background=BackgroundTask(_unpin_all),
+    )
+
+
+@app.post(
+    "/api/albums/{album_id}/cancel",
+    response_model=AlbumStatusResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def cancel_album(album_id: str) -> AlbumStatusResponse:
+    """Cancel every track that has not finished yet."""
+    album = album_manager.albums.get(album_id)
+    if album is None:
+        raise HTTPException(status_code=404, detail="Album not found")
+    if not album_manager.cancel(album):
+        raise HTTPException(status_code=400, detail="Unable to cancel album")
+    return _album_response(album)
+
+
+def _analysis_response(filename: str, path: Path, record: Dict[str, Any], timeline: bool) -> TrackAnalysisResponse:
+    if record.get("status") != "ok":
+        # Engine errors name the scratch copy; report the upload instead.
+        error = str(record.get("error") or "").replace(str(path), filename)
+        return TrackAnalysisResponse(filename=filename, status="failed", error=error)
+    loudness = dict(record.get("loudness") or {})
+    if not timeline:
+        loudness["short_term_lufs"] = None
+    return TrackAnalysisResponse(
+        filename=filename,
+        status="ok",
+        sample_rate=record.get("sr"),
+        channels=record.get("channels"),
+        duration_s=record.get("duration_s"),
+        features=record.get("features") or {},
+        f0_hz=record.get("f0_hz"),
+        loudness=loudness or None,
+    )
+
+
+@app.post(
+    "/api/analyze",
+    response_model=AnalyzeResponse,
+    responses={400: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+)
+async def analyze(
+    files: List[UploadFile] = File(...),
+    timeline: bool = Query(False, description="Include the short-term loudness timeline of every file."),
+) -> AnalyzeResponse:
+    """
+    Measure files without mastering them: loudness (integrated, maxima,
+    LRA), peaks, crest, band correlation, spectral centroid and sub f0.
+    The files are analysed in one engine run spread over ANALYZE_WORKERS
+    processes, on a lane of their own, so this never waits for (or holds)
+    a mastering worker. Uploads are discarded afterwards.
+    """
+    if not 1 <= len(files) <= settings.ANALYZE_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"Send 1 to {settings.ANALYZE_MAX_FILES} files")
+    for upload in files:
+        _validate_upload(upload, settings.MAX_UPLOAD_MB)
+    t0 = time.monotonic()
+    workdir = job_manager.data_dir / ANALYSIS_DIR / uuid.uuid4().hex
+    (workdir / "input").mkdir(parents=True)
+    try:
+        entries: List[Tuple[str, Path]] = []
+        for index, upload in enumerate(files):
+            path = workdir / "input" / f"{index:03d}{Path(upload.filename or '').suffix.lower()}"
+            await _store_upload(upload, path, "analysis")
+            entries.append((str(index), path))
+        future = job_manager.analysis_executor.submit(run_analysis, entries, workdir, settings.ANALYZE_WORKERS)
+        try:
+            records = await asyncio.wrap_future(future)
+        except AnalysisError as exc:
+            raise HTTPException(status_code=500, detail=f"Analysis failed: {exc}")
+    finally:
+        await run_in_threadpool(shutil.rmtree, workdir, True)
+    return AnalyzeResponse(
+        files=[
+            _analysis_response(upload.filename or f"file{index}", path, records[key], timeline)
+            for upload, (key, path) in zip(files, entries)
+        ],
+        runtime_seconds=round(time.monotonic() - t0, 3),
+    )
+
+
+def _reference_response(ref: Reference) -> ReferenceResponse:
+    profile = ref.profile
+    features = {k: float(v) for k, v in (profile.get("features") or {}).items() if isinstance(v, (int, float))}
+    return ReferenceResponse(
+        id=ref.id,
+        filename=ref.filename,
+        size_bytes=ref.size_bytes,
+        created_at=ref.created_at,
+        duration_s=profile.get("duration_s"),
+        source_sample_rate=profile.get("source_sr"),
+        lufs=features.get("lufs"),
+        f0_hz=profile.get("f0_hz"),
+        features=features,
     )
+
+
+@app.post(
+    "/api/references",
+    response_model=ReferenceResponse,
+    responses={400: {"model": ErrorResponse}, 422: {"model": ErrorResponse}},
+)
+async def create_reference(reference: UploadFile = File(...)) -> ReferenceResponse:
+    """
+    Store a reference and precompute its profile. Idempotent: the id is the
+    file's SHA-256, so re-uploading a stored reference returns it at once.
+    """
+    _validate_upload(reference, settings.MAX_UPLOAD_MB)
+    try:
+        digest, size, staged = await job_manager.references.stage_upload(reference, settings.MAX_UPLOAD_MB * 1024 * 1024)
+    except UploadTooLarge:
+        raise HTTPException(status_code=400, detail="Reference file exceeds maximum allowed size")
+    metrics.UPLOAD_BYTES.inc(size, kind="library_reference")
+    try:
+        ref = await run_in_threadpool(job_manager.references.add, digest, size, staged, reference.filename or "")
+    except ReferenceProfileError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return _reference_response(ref)
+
+
+@app.get("/api/references", response_model=ReferenceListResponse)
+async def list_references() -> ReferenceListResponse:
+    """List stored references."""
+    return ReferenceListResponse(references=[_reference_response(ref) for ref in job_manager.references.all()])
+
+
+@app.get(
+    "/api/references/{reference_id}",
+    response_model=ReferenceResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_reference(reference_id: str) -> ReferenceResponse:
+    """Retrieve a stored reference and its profile summary."""
+    ref = job_manager.references.get(reference_id)
+    if ref is None:
+        raise HTTPException(status_code=404, detail="Reference not found")
+    return _reference_response(ref)
+
+
+@app.delete(
+    "/api/references/{reference_id}",
+    status_code=204,
+    responses={404: {"model": ErrorResponse}},
+)
+async def delete_reference(reference_id: str) -> Response:
+    """Delete a stored reference; jobs already submitted against it are unaffected."""
+    if not await run_in_threadpool(job_manager.references.remove, reference_id):
+        raise HTTPException(status_code=404, detail="Reference not found")
+    return Response(status_code=204)
@@ -0,0 +1,237 @@
+"""
+In-process Prometheus metrics for the mastering service.
+
+A deliberately small subset of the Prometheus client model (counters,
+gauges and fixed-bucket histograms with labels) rendered in the text
+exposition format served at `/metrics`. Everything lives in memory, so a
+scrape never touches disk or an external service; values reset when the
+process restarts, which Prometheus' rate() handles natively.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Starlette appends "; charset=utf-8" to text/* media types.
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + float(amount)
+
+    def _samples(self) -> Iterable[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{self._labels(key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """Value that can go up and down; usually refreshed right before a scrape."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def _samples(self) -> Iterable[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{self._labels(key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """Cumulative fixed-bucket histogram with _bucket/_sum/_count series."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float],
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets)) + (math.inf,)
+        self._counts: Dict[LabelKey, List[int]] = {}
+        self._sums: Dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        value = float(value)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def _samples(self) -> Iterable[str]:
+        for key, counts in sorted(self._counts.items()):
+            running = 0
+            for bound, count in zip(self.buckets, counts):
+                running += count
+                yield f"{self.name}_bucket{self._labels(key, [('le', _format_value(bound))])} {running}"
+            yield f"{self.name}_sum{self._labels(key)} {_format_value(self._sums[key])}"
+            yield f"{self.name}_count{self._labels(key)} {running}"
+
+
+class Registry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+_DURATION_BUCKETS = (5, 10, 20, 30, 45, 60, 90, 120, 180, 300, 600, 1200, 3600)
+_STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 45, 90, 180, 600)
+
+JOBS_BY_STATUS = REGISTRY.register(
+    Gauge("auralmind_jobs", "Jobs currently known to this node, by status.", ["status"])
+)
+JOBS_FINISHED = REGISTRY.register(
+    Counter("auralmind_jobs_finished_total", "Jobs that reached a terminal status.", ["status", "preset", "stems"])
+)
+QUEUE_DEPTH = REGISTRY.register(
+    Gauge("auralmind_queue_depth", "Jobs waiting for a worker slot, by job class.", ["job_class"])
+)
+WORKERS_BUSY = REGISTRY.register(Gauge("auralmind_workers_busy", "Worker slots running a job."))
+WORKERS_TOTAL = REGISTRY.register(Gauge("auralmind_workers_total", "Configured worker slots."))
+QUEUE_WAIT = REGISTRY.register(
+    Histogram(
+        "auralmind_queue_wait_seconds",
+        "Time between submission and a worker picking the job up.",
+        (0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1800),
+        ["job_class"],
+    )
+)
+JOB_DURATION = REGISTRY.register(
+    Histogram(
+        "auralmind_job_duration_seconds",
+        "Engine wall time of finished jobs.",
+        _DURATION_BUCKETS,
+        ["preset", "stems"],
+    )
+)
+JOB_REALTIME_FACTOR = REGISTRY.register(
+    Histogram(
+        "auralmind_job_realtime_factor",
+        "Engine wall time divided by audio duration for completed jobs.",
+        (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 4),
+        ["stems"],
+    )
+)
+STAGE_DURATION = REGISTRY.register(
+    Histogram(
+        "auralmind_engine_stage_seconds",
+        "Per-stage engine wall time reported over the progress channel.",
+        _STAGE_BUCKETS,
+        ["stage"],
+    )
+)
+GOVERNOR_ITERATIONS = REGISTRY.register(
+    Histogram(
+        "auralmind_engine_governor_iterations",
+        "Loudness governor search iterations per job.",
+        (1, 2, 4, 6, 8, 10, 12, 16, 24),
+    )
+)
+JOB_CPU_SECONDS = REGISTRY.register(
+    Counter(
+        "auralmind_job_cpu_seconds_total",
+        "User plus system CPU time of finished engine processes.",
+        ["preset", "stems"],
+    )
+)
+UPLOAD_BYTES = REGISTRY.register(
+    Counter("auralmind_upload_bytes_total", "Bytes accepted from uploads.", ["kind"])
+)
+CACHE_REQUESTS = REGISTRY.register(
+    Counter(
+        "auralmind_cache_requests_total",
+        "Cache lookups by cache and result (engine filter/FIR caches and the API status cache).",
+        ["cache", "result"],
+    )
+)
+STORAGE_BYTES = REGISTRY.register(
+    Gauge("auralmind_storage_bytes", "Bytes under DATA_DIR, by artifact class (job directories and the blob store).", ["artifact"])
+)
+JANITOR_DELETED_BYTES = REGISTRY.register(
+    Counter("auralmind_janitor_deleted_bytes_total", "Bytes deleted by the janitor, by reason (ttl, quota).", ["reason"])
+)
@@ -0,0 +1,201 @@
+"""
+Library of reusable mastering references.
+
+A reference is uploaded once (`POST /api/references`) and analysed once:
+the engine's `--build-reference-profile` precomputes the average MID
+spectrum match EQ compares against, the loudness/crest/correlation
+features `--auto` reads and the sub f0, into a ~20 KB profile. Jobs name
+the reference by `reference_id` and the engine matches against the
+profile, so the reference is never decoded, resampled or analysed again.
+
+Entries live in `DATA_DIR/_references/<sha256>/`:
+
+    audio<ext>     hard link into the upload blob store (keeps the blob referenced)
+    profile.npz    engine profile
+    meta.json      upload name, size, creation time and the profile metadata
+
+The id is the content hash, so uploading the same file twice returns the
+existing entry.
+
+`index.npy`/`index.json` in the same directory hold the engine's
+nearest-neighbour index over all profiles (rebuilt by
+`--build-reference-index` whenever an entry is added or removed); jobs
+with `reference: "auto"` pass the directory as `--reference-index`.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .blobstore import BlobStore
+except ImportError:  # pragma: no cover - supports direct module execution
+    from blobstore import BlobStore
+
+logger = logging.getLogger("auralmind.references")
+
+
+class ReferenceProfileError(Exception):
+    """Raised when the engine could not build a profile for an upload."""
+
+
+@dataclass
+class Reference:
+    """A stored reference and its precomputed profile metadata."""
+
+    id: str
+    filename: str
+    size_bytes: int
+    created_at: dt.datetime
+    profile: Dict[str, Any] = field(default_factory=dict)
+    workdir: Path = field(default_factory=Path)
+
+    @property
+    def profile_path(self) -> Path:
+        return self.workdir / "profile.npz"
+
+    def to_meta(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "size_bytes": self.size_bytes,
+            "created_at": self.created_at.isoformat(),
+            "profile": self.profile,
+        }
+
+
+class ReferenceLibrary:
+    """Registry of references with profiles built by the engine script."""
+
+    def __init__(self, root: Path, blobs: BlobStore, script_path: str, timeout_sec: float) -> None:
+        self.root = Path(root)
+        self.staging = self.root / "staging"
+        self.staging.mkdir(parents=True, exist_ok=True)
+        self.blobs = blobs
+        self.script_path = script_path
+        self.timeout_sec = float(timeout_sec)
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self.references: Dict[str, Reference] = self._load()
+
+    def _load(self) -> Dict[str, Reference]:
+        found: Dict[str, Reference] = {}
+        for meta_path in self.root.glob("*/meta.json"):
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                ref = Reference(
+                    id=str(meta["id"]),
+                    filename=str(meta.get("filename") or ""),
+                    size_bytes=int(meta.get("size_bytes") or 0),
+                    created_at=dt.datetime.fromisoformat(meta["created_at"]),
+                    profile=dict(meta.get("profile") or {}),
+                    workdir=meta_path.parent,
+                )
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            if ref.profile_path.is_file():
+                found[ref.id] = ref
+        return found
+
+    def get(self, reference_id: str) -> Optional[Reference]:
+        return self.references.get(reference_id)
+
+    def all(self) -> List[Reference]:
+        return sorted(self.references.values(), key=lambda r: r.created_at)
+
+    async def stage_upload(self, upload: Any, max_bytes: int) -> Tuple[str, int, Path]:
+        """Hash the upload into the blob store; returns (digest, size, staged path)."""
+        ext = Path(upload.filename or "reference").suffix.lower() or ".wav"
+        staged = self.staging / f"{uuid.uuid4().hex}{ext}"
+        digest, size, _existed = await self.blobs.ingest(upload, staged, max_bytes)
+        return digest, size, staged
+
+    def add(self, digest: str, size: int, staged: Path, filename: str) -> Reference:
+        """
+        Build the profile for a staged upload and register it. Blocking (runs
+        the engine); call from a worker thread.
+        """
+        existing = self.references.get(digest)
+        if existing is not None:
+            staged.unlink(missing_ok=True)
+            return existing
+        workdir = self.root / digest
+        workdir.mkdir(exist_ok=True)
+        audio_path = workdir / f"audio{staged.suffix}"
+        os.replace(staged, audio_path)
+        ref = Reference(id=digest, filename=filename, size_bytes=size, created_at=dt.datetime.utcnow(), workdir=workdir)
+        try:
+            ref.profile = self._build_profile(audio_path, ref.profile_path)
+        except ReferenceProfileError:
+            shutil.rmtree(workdir, ignore_errors=True)
+            raise
+        tmp = workdir / "meta.json.tmp"
+        tmp.write_text(json.dumps(ref.to_meta(), indent=2), encoding="utf-8")
+        os.replace(tmp, workdir / "meta.json")
+        with self._lock:
+            self.references.setdefault(digest, ref)
+        self.rebuild_index()
+        return self.references[digest]
+
+    def _run_engine(self, *args: str) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [sys.executable, self.script_path, *args],
+            cwd=str(self.root),
+            capture_output=True,
+            text=True,
+            timeout=self.timeout_sec,
+            env=dict(os.environ, PYTHONUNBUFFERED="1"),
+        )
+
+    def _build_profile(self, audio_path: Path, profile_path: Path) -> Dict[str, Any]:
+        try:
+            proc = self._run_engine("--reference", str(audio_path), "--build-reference-profile", str(profile_path))
+        except subprocess.TimeoutExpired:
+            raise ReferenceProfileError("Reference analysis timed out")
+        if proc.returncode != 0 or not profile_path.is_file():
+            tail = (proc.stderr or proc.stdout or "").strip().splitlines()[-1:] or [""]
+            raise ReferenceProfileError(f"Reference analysis failed: {tail[0]}")
+        try:
+            return json.loads(proc.stdout)
+        except ValueError:
+            raise ReferenceProfileError("Reference analysis returned no profile metadata")
+
+    def has_index(self) -> bool:
+        return (self.root / "index.json").is_file()
+
+    def rebuild_index(self) -> bool:
+        """Re-index all profiles with the engine. Blocking; failures leave the old index in place."""
+        with self._index_lock:
+            try:
+                proc = self._run_engine("--build-reference-index", str(self.root))
+            except subprocess.TimeoutExpired:
+                logger.warning("Reference index rebuild timed out")
+                return False
+        if proc.returncode != 0:
+            logger.warning("Reference index rebuild failed: %s", (proc.stderr or "").strip()[-500:])
+            return False
+        return True
+
+    def remove(self, reference_id: str) -> bool:
+        """
+        Drop a reference. Jobs already submitted keep working: they hold
+        their own link to the profile. Blocking (re-indexes).
+        """
+        with self._lock:
+            ref = self.references.pop(reference_id, None)
+        if ref is None:
+            return False
+        shutil.rmtree(ref.workdir, ignore_errors=True)
+        self.rebuild_index()
+        return True
@@ -0,0 +1,124 @@
+"""
+Host and child-process resource probes, used for readiness checks and
+per-job resource accounting.
+
+Probes are best-effort and Linux-first: they read `/proc` and the cgroup
+filesystem directly so that no extra dependency is needed, and return
+`None` for values the platform cannot report.
+"""
+
+from __future__ import annotations
+
+import shutil
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+_CGROUP_V2 = Path("/sys/fs/cgroup")
+_CGROUP_V1_MEMORY = Path("/sys/fs/cgroup/memory")
+
+
+def _read_int(path: Path) -> Optional[int]:
+    try:
+        raw = path.read_text().strip()
+    except OSError:
+        return None
+    if not raw or raw == "max":
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        return None
+
+
+def _meminfo() -> Dict[str, int]:
+    """Parse /proc/meminfo into bytes."""
+    values: Dict[str, int] = {}
+    try:
+        with open("/proc/meminfo", "r", encoding="ascii") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                parts = rest.split()
+                if parts and parts[0].isdigit():
+                    values[key] = int(parts[0]) * 1024
+    except OSError:
+        pass
+    return values
+
+
+def _cgroup_memory() -> Optional[Dict[str, int]]:
+    """Container memory limit/usage (cgroup v2, then v1), if a limit is set."""
+    limit = _read_int(_CGROUP_V2 / "memory.max")
+    usage = _read_int(_CGROUP_V2 / "memory.current")
+    if limit is None or usage is None:
+        limit = _read_int(_CGROUP_V1_MEMORY / "memory.limit_in_bytes")
+        usage = _read_int(_CGROUP_V1_MEMORY / "memory.usage_in_bytes")
+    # v1 reports an enormous sentinel when unlimited.
+    if limit is None or usage is None or limit >= (1 << 60):
+        return None
+    return {"limit": limit, "usage": usage}
+
+
+def memory_snapshot() -> Dict[str, Optional[int]]:
+    """
+    Total and available memory in bytes. Availability is the tighter of the
+    host's MemAvailable and the container's remaining cgroup allowance.
+    """
+    info = _meminfo()
+    total = info.get("MemTotal")
+    available = info.get("MemAvailable")
+    cgroup = _cgroup_memory()
+    if cgroup is not None:
+        total = min(total, cgroup["limit"]) if total is not None else cgroup["limit"]
+        headroom = max(0, cgroup["limit"] - cgroup["usage"])
+        available = min(available, headroom) if available is not None else headroom
+    return {"total_bytes": total, "available_bytes": available}
+
+
+def disk_snapshot(path: Path) -> Dict[str, Optional[int]]:
+    """Total and free bytes on the filesystem holding `path`."""
+    try:
+        usage = shutil.disk_usage(str(path))
+    except OSError:
+        return {"total_bytes": None, "free_bytes": None}
+    return {"total_bytes": int(usage.total), "free_bytes": int(usage.free)}
+
+
+def _proc_fields(path: Path, keys: Dict[str, str], scale: int = 1) -> Dict[str, int]:
+    """Pick `key: value` lines from a /proc file, renaming via `keys`."""
+    found: Dict[str, int] = {}
+    try:
+        with open(path, "r", encoding="ascii") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in keys:
+                    parts = rest.split()
+                    if parts and parts[0].isdigit():
+                        found[keys[key]] = int(parts[0]) * scale
+    except OSError:
+        pass
+    return found
+
+
+def process_sample(pid: int) -> Dict[str, int]:
+    """
+    Point-in-time memory and I/O counters for a running child process:
+    rss_bytes, hwm_bytes (kernel high-water mark), io_read_bytes and
+    io_write_bytes. Missing on non-Linux hosts or once the process is reaped.
+    """
+    proc = Path("/proc") / str(int(pid))
+    sample = _proc_fields(proc / "status", {"VmRSS": "rss_bytes", "VmHWM": "hwm_bytes"}, scale=1024)
+    sample.update(_proc_fields(proc / "io", {"read_bytes": "io_read_bytes", "write_bytes": "io_write_bytes"}))
+    return sample
+
+
+def rusage_summary(usage: Any) -> Dict[str, float]:
+    """Normalize a `wait4` rusage record (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    maxrss = int(usage.ru_maxrss)
+    return {
+        "cpu_user_seconds": round(float(usage.ru_utime), 4),
+        "cpu_system_seconds": round(float(usage.ru_stime), 4),
+        "max_rss_bytes": maxrss if sys.platform == "darwin" else maxrss * 1024,
+        "block_input_ops": int(usage.ru_inblock),
+        "block_output_ops": int(usage.ru_oublock),
+    }
@@ -5,15 +5,57 @@ Pydantic models defining request and response shapes for the API.
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator
+
+# JobSettings fields a comparison variant may override; everything else is shared by the whole comparison.
+VARIANT_FIELDS = frozenset({
+    "preset", "enable_demucs", "mono_sub", "dynamic_eq", "truepeak_limiter", "target_lufs", "true_peak_ceiling",
+    "warmth", "section_aware_mastering", "section_lift_mix", "groove_transient_sculpting", "groove_transient_boost_db",
+})
+# Engine preset that only normalizes: safety HPF, loudness governor, true-peak limiter and export.
+NORMALIZE_PRESET = "normalize"
+# The engine's get_presets() names; the preset is also a metrics label, so it must stay a closed set.
+PresetName = Literal[
+    "hi_fi_streaming", "radio_loud", "cinematic", "club", "competitive_trap", "normalize", "club_clean",
+]
+
+
+class DeliveryTarget(BaseModel):
+    """An extra master rendered from the same job with its own loudness target."""
+
+    name: str = Field(
+        ...,
+        pattern=r"^[A-Za-z0-9][A-Za-z0-9_-]{0,31}$",
+        description="Variant name, used as the download ?variant= value (e.g. \"club\").",
+    )
+    target_lufs: float = Field(..., ge=-30.0, le=-5.0, description="Integrated loudness target for this master.")
+    true_peak_ceiling: float = Field(default=-1.0, ge=-6.0, le=0.0, description="Limiter output ceiling in dBTP.")
+    output_pcm_bits: Literal[16, 24] = Field(default=24, description="Output WAV PCM bit depth (16 or 24).")
+
+
+class ComparisonVariant(BaseModel):
+    """One side of an A/B comparison: a name plus the settings it changes."""
+
+    name: str = Field(
+        ...,
+        pattern=r"^[A-Za-z0-9][A-Za-z0-9_-]{0,31}$",
+        description="Variant name, used as the download ?variant= value.",
+    )
+    settings: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Overrides of the job's settings (preset, warmth, target_lufs, ...).",
+    )
 
 
 class JobSettings(BaseModel):
     """Settings controlling how the mastering job will run."""
 
-    preset: str = Field(default="hi_fi_streaming", description="Name of the mastering preset.")
+    preset: PresetName = Field(
+        default="hi_fi_streaming",
+        description='Name of the mastering preset. "normalize" only sets loudness and true peak, on its own fast lane.',
+    )
     enable_demucs: Optional[bool] = Field(default=None, description="Toggle stem separation (Demucs).")
     mono_sub: Optional[bool] = Field(default=None, description="Toggle mono-anchor low frequencies below ~120 Hz.")
     dynamic_eq: Optional[bool] = Field(default=None, description="Toggle masking-aware dynamic EQ in the 200-500 Hz band.")
@@ -45,6 +87,94 @@ class JobSettings(BaseModel):
         default=16,
         description="Output WAV PCM bit depth for device compatibility (16 or 24).",
     )
+    callback_url: Optional[str] = Field(
+        default=None,
+        max_length=2048,
+        description="HTTP(S) URL that receives a signed POST when the job finishes.",
+    )
+    profile: bool = Field(
+        default=False,
+        description="Admin only: profile every engine stage and keep the profiles with the job logs.",
+    )
+    preview: bool = Field(
+        default=False,
+        description="Render only a short excerpt around the hook (no stem separation) on the fast preview lane.",
+    )
+    deliverables: List[DeliveryTarget] = Field(
+        default_factory=list,
+        max_length=6,
+        description="Extra delivery masters (e.g. streaming -14, club -9). Only the final loudness stage runs per target.",
+    )
+    variants: List[ComparisonVariant] = Field(
+        default_factory=list,
+        max_length=4,
+        description="Render a comparison of 2-4 setting variants that share decode, stems and analysis.",
+    )
+    reference: Optional[Literal["auto"]] = Field(
+        default=None,
+        description='"auto" matches against the stored reference closest to the target (nearest-neighbour index).',
+    )
+    reference_id: Optional[str] = Field(
+        default=None,
+        pattern=r"^[0-9a-f]{64}$",
+        description="Stored reference (POST /api/references) to match against instead of uploading one.",
+    )
+
+    @field_validator("callback_url")
+    @classmethod
+    def _check_callback_url(cls, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        value = value.strip()
+        if not value.lower().startswith(("http://", "https://")):
+            raise ValueError("callback_url must be an http(s) URL")
+        return value
+
+    @model_validator(mode="after")
+    def _check_deliverables(self) -> "JobSettings":
+        names = [d.name for d in self.deliverables]
+        if len(set(names)) != len(names):
+            raise ValueError("deliverable names must be unique")
+        if self.deliverables and self.preview:
+            raise ValueError("deliverables cannot be combined with preview")
+        return self
+
+    @model_validator(mode="after")
+    def _check_variants(self) -> "JobSettings":
+        if not self.variants:
+            return self
+        if len(self.variants) < 2:
+            raise ValueError("a comparison needs at least two variants")
+        if self.preview or self.deliverables or self.profile:
+            raise ValueError("variants cannot be combined with preview, deliverables or profile")
+        names = [v.name for v in self.variants]
+        if len(set(names)) != len(names):
+            raise ValueError("variant names must be unique")
+        for variant in self.variants:
+            unknown = sorted(set(variant.settings) - VARIANT_FIELDS)
+            if unknown:
+                raise ValueError(f"variant {variant.name!r} cannot override {unknown}")
+        try:
+            self.variant_settings()
+        except ValidationError as exc:
+            raise ValueError(f"invalid variant settings: {exc}")
+        return self
+
+    @model_validator(mode="after")
+    def _check_normalize(self) -> "JobSettings":
+        if self.normalize and (self.preview or self.reference is not None or self.reference_id is not None):
+            raise ValueError(f"preset {NORMALIZE_PRESET!r} cannot be combined with preview or a reference")
+        return self
+
+    @property
+    def normalize(self) -> bool:
+        """Loudness normalization only (no tonal or stereo processing)."""
+        return self.preset == NORMALIZE_PRESET
+
+    def variant_settings(self) -> List[Tuple[str, "JobSettings"]]:
+        """Effective settings of each comparison variant: the job's settings with its overrides."""
+        base = self.model_dump(exclude={"variants"})
+        return [(v.name, JobSettings(**{**base, **v.settings})) for v in self.variants]
 
 
 class JobCreateResponse(BaseModel):
@@ -55,6 +185,23 @@ class JobCreateResponse(BaseModel):
     settings: JobSettings
 
 
+class JobResourceUsage(BaseModel):
+    """
+    Resource usage of the engine subprocess. CPU and block I/O come from
+    wait4 once the process exits; RSS and byte I/O are sampled from /proc
+    while it runs, so fields stay empty on hosts without those probes.
+    """
+
+    cpu_user_seconds: Optional[float] = None
+    cpu_system_seconds: Optional[float] = None
+    rss_bytes: Optional[int] = Field(default=None, description="Latest sampled RSS while running.")
+    max_rss_bytes: Optional[int] = None
+    io_read_bytes: Optional[int] = None
+    io_write_bytes: Optional[int] = None
+    block_input_ops: Optional[int] = None
+    block_output_ops: Optional[int] = None
+
+
 class JobStatusResponse(BaseModel):
     """Representation of a running or finished job."""
 
@@ -62,15 +209,180 @@ class JobStatusResponse(BaseModel):
     status: str
     progress: float = Field(..., ge=0.0, le=100.0)
     current_stage: Optional[str] = None
+    stage_key: Optional[str] = Field(default=None, description="Machine-readable engine stage name.")
     stage_detail: Optional[str] = None
     eta_seconds: Optional[int] = Field(default=None, ge=0)
     created_at: datetime
     started_at: Optional[datetime] = None
     finished_at: Optional[datetime] = None
     error: Optional[str] = None
+    stage_timings: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Wall-clock seconds per completed engine stage.",
+    )
+    callback_status: Optional[str] = Field(
+        default=None,
+        description="Completion webhook delivery state: pending, delivered or failed.",
+    )
+    resources: JobResourceUsage = Field(default_factory=JobResourceUsage)
+    version: int = Field(default=0, ge=0, description="Monotonic counter bumped on every visible change.")
+    settings: JobSettings
+
+
+class JobStatusBatchRequest(BaseModel):
+    """Batch status query for dashboards tracking many jobs."""
+
+    ids: List[str] = Field(..., min_length=1, max_length=500)
+    versions: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Last seen version per job id; jobs still at that version are reported as unchanged.",
+    )
+
+
+class JobStatusBatchResponse(BaseModel):
+    """Statuses for the requested jobs that changed since the caller's versions."""
+
+    jobs: List[JobStatusResponse]
+    unchanged: List[str] = Field(default_factory=list)
+    missing: List[str] = Field(default_factory=list)
+
+
+class ReadinessResponse(BaseModel):
+    """Node capacity snapshot used by load balancers to route new uploads."""
+
+    ready: bool
+    reasons: List[str] = Field(default_factory=list, description="Thresholds currently crossed.")
+    workers_total: int
+    workers_busy: int
+    workers_free: int
+    queue_depth: Dict[str, int] = Field(default_factory=dict, description="Queued jobs per job class.")
+    estimated_wait_seconds: float = Field(..., ge=0, description="Expected wait before a new job starts.")
+    disk_free_bytes: Optional[int] = None
+    disk_total_bytes: Optional[int] = None
+    memory_available_bytes: Optional[int] = None
+    memory_total_bytes: Optional[int] = None
+    next_job_peak_bytes: Optional[int] = Field(
+        None, description="Cost-model prediction of the next job's peak memory, used for admission."
+    )
+
+
+class ReferenceResponse(BaseModel):
+    """A stored reference and its precomputed profile."""
+
+    id: str = Field(..., description="SHA-256 of the uploaded file; pass as JobSettings.reference_id.")
+    filename: str
+    size_bytes: int
+    created_at: datetime
+    duration_s: Optional[float] = None
+    source_sample_rate: Optional[int] = None
+    lufs: Optional[float] = None
+    f0_hz: Optional[float] = Field(None, description="Estimated sub fundamental of the reference.")
+    features: Dict[str, float] = Field(default_factory=dict, description="Engine analysis used by --auto.")
+
+
+class ReferenceListResponse(BaseModel):
+    """All stored references, oldest first."""
+
+    references: List[ReferenceResponse]
+
+
+class AlbumTrackStatus(BaseModel):
+    """One track of an album: its job and its place in the album loudness plan."""
+
+    job_id: str = Field(..., description="Regular job id; status, report and downloads work per track too.")
+    filename: str
+    status: str
+    progress: float = Field(..., ge=0.0, le=100.0)
+    current_stage: Optional[str] = None
+    error: Optional[str] = None
+    duration_s: Optional[float] = None
+    source_lufs: Optional[float] = Field(None, description="Integrated loudness of the upload, from the album analysis.")
+    loudness_offset_db: float = Field(0.0, description="Shift applied to the track's loudness target.")
+
+
+class AlbumStatusResponse(BaseModel):
+    """Aggregated state of an album job."""
+
+    id: str
+    status: str = Field(..., description="analyzing, processing, completed, failed or cancelled.")
+    progress: float = Field(..., ge=0.0, le=100.0, description="Duration-weighted over the tracks.")
+    eta_seconds: Optional[int] = Field(default=None, ge=0)
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    loudness_spread: float
+    reference_id: Optional[str] = None
+    tracks: List[AlbumTrackStatus]
     settings: JobSettings
 
 
+class LoudnessTimeline(BaseModel):
+    """EBU R128 loudness summary of one file."""
+
+    integrated_lufs: float
+    momentary_max_lufs: Optional[float] = None
+    short_term_max_lufs: Optional[float] = None
+    loudness_range_lu: Optional[float] = Field(None, description="EBU Tech 3342 loudness range.")
+    timeline_hop_s: float
+    short_term_window_s: float
+    short_term_lufs: Optional[List[float]] = Field(
+        None, description="Short-term loudness every timeline_hop_s; omitted unless requested with timeline=true."
+    )
+
+
+class TrackAnalysisResponse(BaseModel):
+    """Analysis of one uploaded file; no audio is rendered."""
+
+    filename: str
+    status: str = Field(..., description="ok or failed.")
+    error: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    duration_s: Optional[float] = None
+    features: Dict[str, float] = Field(default_factory=dict, description="Same keys as the engine's mastering analysis.")
+    f0_hz: Optional[float] = Field(None, description="Dominant sub-bass fundamental (28-110 Hz).")
+    loudness: Optional[LoudnessTimeline] = None
+
+
+class AnalyzeResponse(BaseModel):
+    """Result of POST /api/analyze, in upload order."""
+
+    files: List[TrackAnalysisResponse]
+    runtime_seconds: float
+
+
+class StorageResponse(BaseModel):
+    """Job-directory disk usage as of the janitor's last sweep."""
+
+    usage_bytes: Dict[str, int] = Field(
+        ..., description="Bytes per artifact class: inputs, intermediates, outputs, logs, deduplicated upload blobs and engine stage checkpoints."
+    )
+    total_bytes: int
+    quota_bytes: Optional[int] = Field(None, description="STORAGE_QUOTA_MB in bytes; null when unlimited.")
+    ttl_seconds: Dict[str, int] = Field(default_factory=dict, description="Retention per artifact class; 0 keeps forever (0 disables checkpoints).")
+    job_dirs: int
+    blobs: int = Field(0, description="Distinct uploads held in the blob store.")
+    unreferenced_blob_bytes: int = Field(0, description="Blob bytes no job links to any more (collected after their TTL).")
+    pinned_jobs: int = Field(0, description="Finished jobs protected by an in-flight download.")
+    last_sweep_at: Optional[datetime] = None
+    last_sweep_seconds: Optional[float] = None
+    deleted_bytes_total: int = 0
+    evicted_jobs_total: int = 0
+    disk_free_bytes: Optional[int] = None
+    disk_total_bytes: Optional[int] = None
+
+
+class CostModelResponse(BaseModel):
+    """Fitted per-host cost model (admin only)."""
+
+    host: str
+    path: Optional[str] = None
+    observations: int
+    calibration_observations: int
+    runtime_coefficients: Dict[str, float] = Field(..., description="Seconds; *_per_second terms scale with audio duration.")
+    memory_coefficients: Dict[str, float] = Field(..., description="Bytes; *_per_second terms scale with audio duration.")
+    stage_seconds_per_audio_second: Dict[str, float] = Field(default_factory=dict)
+
+
 class JobReportResponse(BaseModel):
     """Response containing the mastering report generated by the script."""
 
@@ -25,14 +25,22 @@ def submit_job(target_path: str, preset: str = "hi_fi_streaming") -> str:
 
 
 def poll_job(job_id: str) -> dict:
+    # Long-poll: the server holds the request until the job's ETag changes.
+    etag = None
+    data: dict = {}
     while True:
-        res = requests.get(f"{API_BASE}/api/jobs/{job_id}", timeout=30)
+        headers = {"If-None-Match": etag} if etag else {}
+        res = requests.get(f"{API_BASE}/api/jobs/{job_id}", params={"wait": 30}, headers=headers, timeout=45)
+        if res.status_code == 304:
+            continue
         res.raise_for_status()
+        etag = res.headers.get("ETag")
         data = res.json()
         print(f"Status: {data['status']} Progress: {data['progress']}%")
         if data["status"] in {"completed", "failed", "cancelled"}:
             return data
-        time.sleep(5)
+        if not etag:
+            time.sleep(5)
 
 
 def download_output(job_id: str) -> None:
@@ -0,0 +1,341 @@
+"""
+Stand-in for auralmind_match_maestro_v7_3_expert1.py that does no DSP.
+
+Point the API at it to load-test the job manager, upload path and polling
+without burning CPU on mastering:
+
+    AURALMIND_SCRIPT_PATH=backend/stub_engine.py uvicorn main:app
+
+It accepts the engine's command line, prints the same `[master] ...` log
+lines, speaks the --progress-fd JSON-lines protocol, and writes the output
+WAV (the input re-encoded at the requested subtype) plus a report with the
+keys the backend reads. Runtime is simulated, controlled by environment
+variables inherited from the server process:
+
+    STUB_ENGINE_RTF           seconds of runtime per second of audio (default 0.2; a tenth of it for --preset normalize)
+    STUB_ENGINE_MIN_SECONDS   lower bound on simulated runtime (default 2)
+    STUB_ENGINE_JITTER        +/- relative runtime jitter (default 0.1)
+    STUB_ENGINE_FAIL_RATE     probability of exiting with code 1 (default 0)
+    STUB_ENGINE_SEED          seed for jitter/failure draws; every run then behaves the same (default: random)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+log = logging.getLogger("auralmind")
+
+# (stage, share of simulated runtime), in the engine's execution order.
+_STAGES: Tuple[Tuple[str, float], ...] = (
+    ("load", 0.06),
+    ("f0", 0.02),
+    ("mono_sub", 0.02),
+    ("match_eq", 0.10),
+    ("masking_eq", 0.10),
+    ("deess", 0.03),
+    ("glow", 0.01),
+    ("spatial", 0.02),
+    ("microshift", 0.02),
+    ("microdetail", 0.05),
+    ("movement", 0.03),
+    ("hooklift", 0.06),
+    ("transient", 0.05),
+    ("governor", 0.40),
+    ("deliver", 0.0),
+    ("write", 0.03),
+)
+# The normalize preset's streamed passes instead.
+_NORMALIZE_STAGES: Tuple[Tuple[str, float], ...] = (
+    ("normalize_scan", 0.3),
+    ("normalize_limit", 0.45),
+    ("normalize_write", 0.25),
+    ("deliver", 0.0),
+)
+_GOVERNOR_STEPS = 8
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class _Progress:
+    """Minimal writer for the engine's --progress-fd protocol."""
+
+    def __init__(self, fd: Optional[int]) -> None:
+        self._stream = os.fdopen(int(fd), "w", buffering=1, encoding="utf-8") if fd is not None else None
+        self._t0 = time.time()
+
+    def emit(self, event: str, **fields: Any) -> None:
+        if self._stream is None:
+            return
+        try:
+            self._stream.write(json.dumps({"event": event, "t": round(time.time() - self._t0, 4), **fields}) + "\n")
+        except (OSError, ValueError):
+            self._stream = None
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="AuralMind engine stub (no DSP) for load testing.")
+    p.add_argument("--target", default=None)
+    p.add_argument("--out", default=None)
+    p.add_argument("--reference", default=None)
+    p.add_argument("--build-reference-profile", default=None)
+    p.add_argument("--build-reference-index", default=None)
+    p.add_argument("--preset", default="hi_fi_streaming")
+    p.add_argument("--target-lufs", type=float, default=-12.0)
+    p.add_argument("--target-lufs-offset", type=float, default=0.0)
+    p.add_argument("--ceiling", type=float, default=-1.0)
+    p.add_argument("--out-subtype", default="PCM_24")
+    p.add_argument("--report", default=None)
+    p.add_argument("--progress-fd", type=int, default=None)
+    p.add_argument("--checkpoint-dir", default=None)
+    p.add_argument("--preview", type=float, default=None)
+    p.add_argument("--deliverable", action="append", default=[])
+    p.add_argument("--compare", default=None)
+    p.add_argument("--compare-jobs", type=int, default=1)
+    p.add_argument("--analyze", default=None)
+    p.add_argument("--batch", default=None)
+    return p
+
+
+def build_reference_profile(reference: str, out_path: str) -> Dict[str, Any]:
+    """Profile with the engine's file layout; the spectrum is flat and the features are placeholders."""
+    info = sf.info(reference)
+    meta = {
+        "version": 1,
+        "sr": 48000,
+        "source_sr": int(info.samplerate),
+        "duration_s": round(float(info.frames) / float(info.samplerate), 3),
+        "n_fft": 8192,
+        "hop": 2048,
+        "features": {"lufs": -10.0, "tp_dbfs": -1.0, "peak_dbfs": -1.0, "rms_dbfs": -9.0,
+                     "crest_db": 8.0, "corr_hi": 0.5, "corr_lo": 1.0, "centroid_hz": 2500.0},
+        "f0_hz": 55.0,
+    }
+    with open(out_path, "wb") as f:
+        np.savez(f, mid_mag=np.ones(8192 // 2 + 1, dtype=np.float32), meta=np.array(json.dumps(meta)))
+    return meta
+
+
+def build_reference_index(library_dir: str) -> Dict[str, Any]:
+    """Index file layout of the engine with one zero row per profile (no selection happens in the stub)."""
+    ids = sorted(p.parent.name for p in Path(library_dir).glob("*/profile.npz"))
+    with open(os.path.join(library_dir, "index.npy"), "wb") as f:
+        np.save(f, np.zeros((len(ids), 28), dtype=np.float32))
+    Path(library_dir, "index.json").write_text(
+        json.dumps({"version": 1, "dims": 28, "ids": ids, "profiles": [f"{i}/profile.npz" for i in ids]}),
+        encoding="utf-8",
+    )
+    return {"references": len(ids), "dims": 28}
+
+
+def _analysis(target: str) -> Dict[str, Any]:
+    """The engine's analysis record layout; only loudness (a plain RMS proxy) reflects the audio."""
+    info = sf.info(target)
+    y, sr = sf.read(target, dtype="float32", always_2d=True)
+    rms_db = float(20.0 * np.log10(np.sqrt(np.mean(np.square(y, dtype=np.float64))) + 1e-12))
+    lufs = rms_db - 3.0
+    duration_s = round(len(y) / float(sr), 3)
+    return {
+        "target": os.path.basename(target),
+        "sr": int(sr),
+        "channels": int(info.channels),
+        "format": info.format,
+        "subtype": info.subtype,
+        "duration_s": duration_s,
+        "features": {"lufs": lufs, "tp_dbfs": -1.0, "peak_dbfs": -1.0, "rms_dbfs": rms_db,
+                     "crest_db": 8.0, "corr_hi": 0.5, "corr_lo": 1.0, "centroid_hz": 2500.0},
+        "f0_hz": 55.0,
+        "loudness": {"integrated_lufs": lufs, "momentary_max_lufs": lufs, "short_term_max_lufs": lufs,
+                     "loudness_range_lu": 0.0, "timeline_hop_s": 1.0, "short_term_window_s": 3.0,
+                     "short_term_lufs": [round(lufs, 2)] * max(0, int(duration_s - 3.0) + 1)},
+        "analysis_seconds": 0.0,
+    }
+
+
+def analyze(target: str, out_path: str) -> Dict[str, Any]:
+    """--analyze on one --target."""
+    payload = _analysis(target)
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    Path(out_path).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return payload
+
+
+def analyze_manifest(manifest: str, out_path: str) -> Dict[str, Any]:
+    """--batch MANIFEST --analyze OUT: one JSON line per manifest entry (directory batches are not simulated)."""
+    counts = {"ok": 0, "failed": 0}
+    with open(manifest, encoding="utf-8") as src, open(out_path, "a", encoding="utf-8") as out:
+        for line in src:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            record: Dict[str, Any] = {"key": str(entry.get("id") or entry["target"]), "target": entry["target"]}
+            try:
+                record.update(status="ok", **_analysis(entry["target"]))
+                record["target"] = entry["target"]
+            except Exception as e:
+                record.update(status="failed", error=f"{type(e).__name__}: {e}")
+            counts[record["status"]] += 1
+            out.write(json.dumps(record) + "\n")
+    return {"mode": "analyze", **counts, "out": out_path, "stub": True}
+
+
+def run_compare(args: argparse.Namespace, progress: _Progress, runtime_s: float) -> Dict[str, Any]:
+    """--compare: each variant (and its loudness-matched copy) is the input re-encoded, one runtime per wave slot."""
+    variants = json.loads(Path(args.compare).read_text(encoding="utf-8"))["variants"]
+    y, sr = sf.read(args.target, dtype="float32", always_2d=True)
+    out = Path(args.out)
+    rows: List[Dict[str, Any]] = []
+    progress.emit("stage", stage="compare", fraction=0.0)
+    for i, variant in enumerate(variants):
+        time.sleep(runtime_s / max(1, args.compare_jobs))
+        for suffix in ("", ".matched"):
+            sf.write(out.with_name(f"{out.stem}.{variant['name']}{suffix}{out.suffix}"), y, sr, subtype=args.out_subtype)
+        rows.append({"name": variant["name"], "lufs_post": args.target_lufs, "matched_gain_db": 0.0})
+        progress.emit("stage", stage="compare", fraction=round((i + 1) / len(variants), 4),
+                      variants_done=i + 1, variants_total=len(variants), variant=variant["name"])
+    progress.emit("stage", stage="loudness_match", fraction=1.0)
+    return {"mode": "compare", "match_lufs": args.target_lufs, "variants": rows, "stub": True}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s  %(name)s  %(levelname)s  %(message)s",
+        datefmt="%H:%M:%S",
+    )
+    # Unknown engine flags (--stems, --warmth, ...) are accepted and ignored.
+    args, _ = build_arg_parser().parse_known_args(argv)
+    if args.build_reference_profile:
+        print(json.dumps(build_reference_profile(args.reference, args.build_reference_profile), indent=2))
+        return 0
+    if args.build_reference_index:
+        print(json.dumps(build_reference_index(args.build_reference_index), indent=2))
+        return 0
+    if args.analyze and args.batch:
+        summary = analyze_manifest(args.batch, args.analyze)
+        print(json.dumps(summary, indent=2))
+        return 1 if summary["failed"] else 0
+    if args.analyze:
+        print(json.dumps(analyze(args.target, args.analyze), indent=2))
+        return 0
+    args.target_lufs += args.target_lufs_offset
+
+    progress = _Progress(args.progress_fd)
+    rng = random.Random(os.environ.get("STUB_ENGINE_SEED") or None)
+    t0 = time.time()
+
+    info = sf.info(args.target)
+    duration_s = float(info.frames) / float(info.samplerate)
+    jitter = _env_float("STUB_ENGINE_JITTER", 0.1)
+    runtime_s = max(_env_float("STUB_ENGINE_MIN_SECONDS", 2.0), duration_s * _env_float("STUB_ENGINE_RTF", 0.2))
+    if args.preset == "normalize":
+        runtime_s /= 10.0
+    runtime_s *= 1.0 + rng.uniform(-jitter, jitter)
+    fail = rng.random() < _env_float("STUB_ENGINE_FAIL_RATE", 0.0)
+
+    if args.compare:
+        progress.emit("audio", sr=int(info.samplerate), duration_s=round(duration_s, 3))
+        result = run_compare(args, progress, runtime_s)
+        result["runtime_sec"] = float(time.time() - t0)
+        log.info("[compare] %d variants  workers=%d  (%.2fs)", len(result["variants"]), args.compare_jobs, result["runtime_sec"])
+        progress.emit("done", runtime_s=round(result["runtime_sec"], 4), stage_seconds={})
+        if args.report:
+            Path(args.report).write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(json.dumps(result, indent=2))
+        return 0
+
+    log.info("[master] preset=%s  target=%s  reference=%s", args.preset, args.target, args.reference)
+    stage_seconds: Dict[str, float] = {}
+    deliverables: List[Dict[str, Any]] = []
+    for stage, share in _NORMALIZE_STAGES if args.preset == "normalize" else _STAGES:
+        if stage == "deliver" and not args.deliverable:
+            continue
+        progress.emit("stage", stage=stage, fraction=0.0)
+        t_stage = time.time()
+        if stage == "governor":
+            for it in range(_GOVERNOR_STEPS):
+                time.sleep(runtime_s * share / _GOVERNOR_STEPS)
+                progress.emit("stage", stage=stage, fraction=round((it + 1) / _GOVERNOR_STEPS, 4),
+                              governor_iter=it + 1, governor_steps=_GOVERNOR_STEPS,
+                              target_lufs=round(args.target_lufs + 0.1 * it, 3))
+        elif stage == "deliver":
+            # NAME:LUFS:CEILING[:SUBTYPE] -> <out>.NAME<ext>, each taking a governor's share of the runtime.
+            y, sr = sf.read(args.target, dtype="float32", always_2d=True)
+            out = Path(args.out)
+            for spec in args.deliverable:
+                name, lufs, ceiling, *subtype = spec.split(":")
+                time.sleep(runtime_s * 0.25)
+                path = out.with_name(f"{out.stem}.{name}{out.suffix}")
+                sf.write(path, y, sr, subtype=(subtype or [args.out_subtype])[0])
+                deliverables.append({"name": name, "out_path": str(path),
+                                     "lufs_post": float(lufs) + args.target_lufs_offset,
+                                     "true_peak_dbfs": float(ceiling)})
+        elif stage in ("write", "normalize_write"):
+            y, sr = sf.read(args.target, dtype="float32", always_2d=True)
+            Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+            sf.write(args.out, y, sr, subtype=args.out_subtype)
+        else:
+            time.sleep(runtime_s * share)
+        stage_seconds[stage] = round(time.time() - t_stage, 4)
+        progress.emit("stage", stage=stage, fraction=1.0, stage_seconds=stage_seconds[stage])
+
+        if stage in ("load", "normalize_scan"):
+            log.info("[master] audio loaded  sr=%d  dur=%.1fs  (%.3fs)", info.samplerate, duration_s, stage_seconds[stage])
+            progress.emit("audio", sr=int(info.samplerate), duration_s=round(duration_s, 3))
+        elif stage == "match_eq":
+            log.info("[master] match-EQ + FIR convolution (stub)  (%.3fs)", stage_seconds[stage])
+        elif stage == "microshift":
+            log.info("[master] stereo enhancements  (%.3fs)", stage_seconds[stage])
+        elif stage == "microdetail":
+            log.info("[master] microdetail recovery  (%.3fs)", stage_seconds[stage])
+        elif stage == "transient":
+            log.info("[master] transient sculpt  enabled=True  (%.3fs)", stage_seconds[stage])
+        elif stage in ("governor", "normalize_limit") and fail:
+            log.error("[master] simulated failure (STUB_ENGINE_FAIL_RATE)")
+            return 1
+
+    log.info("[master] governor + limiter + write  LUFS=%.1f  TP=%.2f dBFS  GR=%.2f dB  (%.3fs)",
+             args.target_lufs, args.ceiling, -1.5, stage_seconds.get("write", stage_seconds.get("normalize_write", 0.0)))
+    runtime = time.time() - t0
+    log.info("[master] TOTAL runtime=%.2fs  out=%s", runtime, args.out)
+    progress.emit("done", runtime_s=round(runtime, 4), stage_seconds=stage_seconds)
+
+    result = {
+        "preset": args.preset,
+        "sr": int(info.samplerate),
+        "lufs_post": float(args.target_lufs),
+        "true_peak_dbfs": float(args.ceiling),
+        "governor_target_lufs": float(args.target_lufs),
+        "limiter_min_gain_db": -1.5,
+        "runtime_sec": float(runtime),
+        "deliverables": deliverables,
+        "stub": True,
+    }
+    if args.report:
+        Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+        if args.report.lower().endswith(".json"):
+            Path(args.report).write_text(json.dumps(result, indent=2), encoding="utf-8")
+        else:
+            Path(args.report).write_text("# AuralMind stub report\n\n```json\n" + json.dumps(result, indent=2) + "\n```\n",
+                                         encoding="utf-8")
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Signed job-completion callbacks.
+
+Pipeline services register a `callback_url` on a job instead of polling its
+status. When the job reaches a terminal state the job manager hands a JSON
+payload to the dispatcher, which POSTs it from a small private asyncio loop
+and retries transient failures with exponential backoff, so slow or flaky
+receivers never hold up a mastering worker.
+
+Each request carries `X-AuralMind-Timestamp` and `X-AuralMind-Signature:
+sha256=<hex>`, an HMAC-SHA256 over "<timestamp>.<body>" keyed with
+`WEBHOOK_SECRET` (omitted when no secret is configured).
+
+Callback URLs are supplied by job submitters, so the server must not be
+usable to reach its own network: `check_callback_url` rejects hosts that
+resolve to loopback, private, link-local or otherwise non-global addresses
+(or, with `CALLBACK_ALLOWED_HOSTS`, any host not listed). It runs when the
+job is submitted and again before delivery, and redirects are never followed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import socket
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger("auralmind.webhooks")
+
+# Client errors that are worth retrying; any other 4xx (and any 3xx, redirects are not followed) is final.
+_RETRYABLE_4XX = frozenset({408, 425, 429})
+
+
+def check_callback_url(url: str, allowed_hosts: Iterable[str] = ()) -> None:
+    """
+    Raise ValueError unless `url` is an http(s) URL the server may POST to:
+    a host in `allowed_hosts` when that list is non-empty, otherwise a host
+    whose every resolved address is globally routable.
+    """
+    try:
+        parts = urllib.parse.urlsplit(url)
+        port = parts.port
+    except ValueError:
+        raise ValueError("callback_url is not a valid URL")
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("callback_url must be an http(s) URL with a host")
+    host = parts.hostname.lower()
+    allowed = {h.lower() for h in allowed_hosts}
+    if allowed:
+        if host not in allowed:
+            raise ValueError(f"callback_url host {host!r} is not in CALLBACK_ALLOWED_HOSTS")
+        return
+    try:
+        infos = socket.getaddrinfo(host, port or (443 if scheme == "https" else 80), proto=socket.IPPROTO_TCP)
+    except (OSError, UnicodeError):
+        raise ValueError(f"callback_url host {host!r} does not resolve")
+    for info in infos:
+        address = ipaddress.ip_address(str(info[4][0]).split("%", 1)[0])
+        mapped = getattr(address, "ipv4_mapped", None)
+        if mapped is not None:
+            address = mapped
+        if not address.is_global or address.is_multicast:
+            raise ValueError(f"callback_url host {host!r} resolves to a non-public address")
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Surface 3xx responses as HTTPError instead of following them."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):  # noqa: D401 - urllib hook
+        return None
+
+
+def sign_payload(secret: str, timestamp: str, body: bytes) -> str:
+    """Return the hex HMAC-SHA256 signature for a callback body."""
+    message = timestamp.encode("utf-8") + b"." + body
+    return hmac.new(secret.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+class WebhookDispatcher:
+    """Deliver callbacks with retries on a background event loop."""
+
+    def __init__(
+        self,
+        secret: Optional[str] = None,
+        max_attempts: int = 5,
+        timeout_sec: float = 10.0,
+        backoff_sec: float = 2.0,
+        allowed_hosts: Iterable[str] = (),
+    ) -> None:
+        self.secret = secret
+        self.allowed_hosts = tuple(allowed_hosts)
+        self._opener = urllib.request.build_opener(_NoRedirect())
+        self.max_attempts = max(1, int(max_attempts))
+        self.timeout_sec = float(timeout_sec)
+        self.backoff_sec = max(0.0, float(backoff_sec))
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="webhook-dispatcher", daemon=True)
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+    def submit(self, url: str, payload: Dict[str, Any]) -> "Future[bool]":
+        """Queue a delivery; the returned future resolves to True once a 2xx was received."""
+        body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+        return asyncio.run_coroutine_threadsafe(self._deliver(url, body), self._ensure_loop())
+
+    def _headers(self, body: bytes) -> Dict[str, str]:
+        timestamp = str(int(time.time()))
+        headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "AuralMind-Webhook/1.0",
+            "X-AuralMind-Timestamp": timestamp,
+        }
+        if self.secret:
+            headers["X-AuralMind-Signature"] = f"sha256={sign_payload(self.secret, timestamp, body)}"
+        return headers
+
+    async def _deliver(self, url: str, body: bytes) -> bool:
+        loop = asyncio.get_running_loop()
+        try:
+            # Re-checked at delivery: the host may resolve differently than at submission.
+            await loop.run_in_executor(None, check_callback_url, url, self.allowed_hosts)
+        except ValueError as exc:
+            logger.warning("Webhook %s refused: %s", url, exc)
+            return False
+        for attempt in range(1, self.max_attempts + 1):
+            status, error = await loop.run_in_executor(None, self._post, url, body, self._headers(body))
+            if status is not None and 200 <= status < 300:
+                return True
+            if status is not None and 300 <= status < 500 and status not in _RETRYABLE_4XX:
+                logger.warning("Webhook %s rejected with HTTP %s; not retrying", url, status)
+                return False
+            logger.info("Webhook %s attempt %d/%d failed: %s", url, attempt, self.max_attempts, error or status)
+            if attempt < self.max_attempts:
+                await asyncio.sleep(self.backoff_sec * (2 ** (attempt - 1)))
+        logger.warning("Webhook %s gave up after %d attempts", url, self.max_attempts)
+        return False
+
+    def _post(self, url: str, body: bytes, headers: Dict[str, str]) -> Tuple[Optional[int], Optional[str]]:
+        request = urllib.request.Request(url, data=body, headers=headers, method="POST")
+        try:
+            with self._opener.open(request, timeout=self.timeout_sec) as response:
+                return int(response.status), None
+        except urllib.error.HTTPError as exc:
+            return int(exc.code), None
+        except (urllib.error.URLError, OSError) as exc:
+            return None, str(exc)
@@ -0,0 +1 @@
+"""Offline DSP benchmarks for the AuralMind engine (see run_benchmarks.py)."""
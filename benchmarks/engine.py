@@ -0,0 +1,40 @@
+"""
+Load the single-file mastering engine as a module.
+
+The engine is a script, not a package, so it is imported by path. The path
+defaults to the copy at the repository root and honours the same
+AURALMIND_SCRIPT_PATH override as the backend.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_ENGINE_PATH = REPO_ROOT / "auralmind_match_maestro_v7_3_expert1.py"
+
+_ENGINE: Optional[ModuleType] = None
+
+
+def engine_path() -> Path:
+    return Path(os.getenv("AURALMIND_SCRIPT_PATH", str(DEFAULT_ENGINE_PATH))).resolve()
+
+
+def load_engine() -> ModuleType:
+    """Import the engine once per process and return the module."""
+    global _ENGINE
+    if _ENGINE is None:
+        path = engine_path()
+        spec = importlib.util.spec_from_file_location("auralmind_engine", path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Cannot load engine from {path}")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module  # dataclasses resolve annotations through sys.modules
+        spec.loader.exec_module(module)
+        _ENGINE = module
+    return _ENGINE
@@ -0,0 +1,269 @@
+"""
+Golden-output equivalence harness for engine fast paths.
+
+Renders a fixed corpus of synthetic signals through `master()` (with a
+fixed dither seed) and through the individual audio stages, and reduces
+each output to a compact fingerprint: per-block RMS, integrated LUFS, true
+peak and log-spaced band energies for mid and side. Fingerprints are
+stored in golden/fingerprints.json instead of audio, so the corpus can be
+checked in and compared on any host within tolerances.
+
+    python -m benchmarks.golden record                      # (re)write the golden fingerprints
+    python -m benchmarks.golden check                       # compare the current engine with them
+    python -m benchmarks.golden check --override fir_streaming=on --only master,apply_fir
+
+`--override KEY=VALUE` toggles a code path: KEY names a Preset field, or
+else a module-level attribute of the engine. When overrides are given the
+default path is rendered in the same run as well, so the report also shows
+the exact max sample error between the two paths, not just fingerprint
+deltas. The exit status is 1 when any delta exceeds its tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import soundfile as sf
+
+try:
+    from .engine import load_engine
+    from .run_benchmarks import CASES, BenchInput
+    from .signals import synth_program
+except ImportError:  # pragma: no cover - supports `python benchmarks/golden.py`
+    from engine import load_engine
+    from run_benchmarks import CASES, BenchInput
+    from signals import synth_program
+
+GOLDEN_PATH = Path(__file__).resolve().parent / "golden" / "fingerprints.json"
+DEFAULT_PRESET = "hi_fi_streaming"
+DITHER_SEED = 1234
+BLOCK_S = 0.5
+N_BANDS = 24
+
+# Stage cases from the benchmark suite whose output is audio.
+AUDIO_STAGES = (
+    "mono_sub_v2",
+    "apply_fir",
+    "apply_fir_streaming_overlap_save",
+    "apply_warmth_tilt",
+    "dynamic_masking_eq",
+    "de_ess",
+    "harmonic_glow",
+    "spatial_realism_enhancer",
+    "microshift_widen_side",
+    "microdetail_recovery_side_high",
+    "movement_automation",
+    "hooklift",
+    "transient_sculpt",
+    "softclip_oversampled",
+    "true_peak_limiter_v2",
+    "peak_control_chain",
+)
+
+# Maximum tolerated |delta| per fingerprint field before `check` fails.
+TOLERANCES = {
+    "lufs": 0.05,            # LU
+    "true_peak_db": 0.10,    # dB
+    "block_rms_db": 0.10,    # dB, worst block
+    "band_db": 0.25,         # dB, worst band (mid or side)
+    "max_sample_error_db": -60.0,  # dBFS, only when both paths render in one run
+}
+
+
+def _impulses_and_sweep(duration_s: float, sr: int) -> np.ndarray:
+    """Log sweep in the left channel, sparse clicks in the right: edge cases for limiters and detectors."""
+    n = int(round(duration_s * sr))
+    t = np.arange(n) / sr
+    f0, f1 = 20.0, min(20000.0, 0.45 * sr)
+    k = np.log(f1 / f0) / duration_s
+    sweep = 0.5 * np.sin(2 * np.pi * f0 * (np.exp(k * t) - 1.0) / k)
+    clicks = np.zeros(n)
+    clicks[:: int(0.37 * sr)] = 0.9
+    return np.stack([sweep, clicks], axis=1).astype(np.float32)
+
+
+CORPUS: Dict[str, Tuple[Callable[[], np.ndarray], int]] = {
+    "program_48k": (lambda: synth_program(10.0, 48000, seed=11), 48000),
+    "program_44k": (lambda: synth_program(8.0, 44100, seed=12), 44100),
+    "sweep_clicks_48k": (lambda: _impulses_and_sweep(6.0, 48000), 48000),
+}
+
+
+def fingerprint(engine: Any, y: np.ndarray, sr: int) -> Dict[str, Any]:
+    """Compact, host-tolerant summary of a stereo render."""
+    y = engine.ensure_stereo(np.asarray(y, dtype=np.float32))
+    block = max(1, int(BLOCK_S * sr))
+    n_blocks = max(1, y.shape[0] // block)
+    trimmed = y[: n_blocks * block].reshape(n_blocks, block, 2).astype(np.float64)
+    block_rms_db = 10.0 * np.log10(np.mean(trimmed ** 2, axis=1) + 1e-20)
+
+    mid = 0.5 * (y[:, 0] + y[:, 1])
+    side = 0.5 * (y[:, 0] - y[:, 1])
+    edges = np.geomspace(30.0, 0.45 * sr, N_BANDS + 1)
+    freqs = np.fft.rfftfreq(mid.shape[0], 1.0 / sr)
+    bands = {}
+    for label, x in (("mid", mid), ("side", side)):
+        power = np.abs(np.fft.rfft(x.astype(np.float64))) ** 2
+        idx = np.digitize(freqs, edges) - 1
+        energy = np.bincount(idx[(idx >= 0) & (idx < N_BANDS)], weights=power[(idx >= 0) & (idx < N_BANDS)],
+                             minlength=N_BANDS)
+        bands[label] = np.round(10.0 * np.log10(energy + 1e-20), 3).tolist()
+
+    return {
+        "samples": int(y.shape[0]),
+        "sr": int(sr),
+        "lufs": round(float(engine.integrated_loudness_lufs(y, sr)), 4),
+        "true_peak_db": round(float(engine.lin_to_db(engine.true_peak_estimate(y, sr, oversample=4) + 1e-12)), 4),
+        "block_rms_db": np.round(block_rms_db, 3).tolist(),
+        "band_db": bands,
+    }
+
+
+def _max_abs_delta(a: Any, b: Any) -> float:
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    if a.shape != b.shape:
+        return float("inf")
+    # Silent blocks/bands sit at the -200 dB floor; differences there are meaningless.
+    audible = (a > -120.0) | (b > -120.0)
+    return float(np.max(np.abs(a - b)[audible])) if np.any(audible) else 0.0
+
+
+def compare_fingerprints(new: Dict[str, Any], old: Dict[str, Any]) -> Dict[str, float]:
+    if new["samples"] != old["samples"] or new["sr"] != old["sr"]:
+        return {"length_mismatch": float("inf")}
+    return {
+        "lufs": abs(new["lufs"] - old["lufs"]),
+        "true_peak_db": abs(new["true_peak_db"] - old["true_peak_db"]),
+        "block_rms_db": _max_abs_delta(new["block_rms_db"], old["block_rms_db"]),
+        "band_db": max(_max_abs_delta(new["band_db"][k], old["band_db"][k]) for k in ("mid", "side")),
+    }
+
+
+def _parse_override(text: str) -> Tuple[str, Any]:
+    key, sep, raw = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"Override must be KEY=VALUE, got {text!r}")
+    try:
+        value = json.loads(raw)
+    except json.JSONDecodeError:
+        value = raw
+    return key.strip(), value
+
+
+@contextmanager
+def applied(engine: Any, preset: Any, overrides: Sequence[Tuple[str, Any]]) -> Iterator[Any]:
+    """Yield the preset with overrides applied; module attributes are restored afterwards."""
+    preset_fields = {f.name for f in dataclasses.fields(preset)}
+    preset_updates = {k: v for k, v in overrides if k in preset_fields}
+    saved: Dict[str, Any] = {}
+    for key, value in overrides:
+        if key in preset_fields:
+            continue
+        if not hasattr(engine, key):
+            raise SystemExit(f"Override {key!r} is neither a Preset field nor an engine attribute")
+        saved[key] = getattr(engine, key)
+        setattr(engine, key, value)
+    try:
+        yield dataclasses.replace(preset, **preset_updates) if preset_updates else preset
+    finally:
+        for key, value in saved.items():
+            setattr(engine, key, value)
+
+
+def render_corpus(
+    engine: Any,
+    preset: Any,
+    only: Optional[set],
+    workdir: Path,
+) -> Dict[str, np.ndarray]:
+    """Render every (signal, stage) pair; keys are '<signal>/<stage>'."""
+    by_name = {c.name: c for c in CASES}
+    outputs: Dict[str, np.ndarray] = {}
+    for signal_name, (make, sr) in CORPUS.items():
+        y = make()
+        b = BenchInput(engine, preset, y, sr, y.shape[0] / sr, workdir)
+        for stage in AUDIO_STAGES:
+            if only is not None and stage not in only:
+                continue
+            out = by_name[stage].setup(b)()
+            outputs[f"{signal_name}/{stage}"] = np.asarray(out[0] if isinstance(out, tuple) else out, dtype=np.float32)
+        if only is None or "master" in only:
+            src = workdir / f"{signal_name}.wav"
+            dst = workdir / f"{signal_name}_master.wav"
+            sf.write(str(src), y, sr, subtype="FLOAT")
+            engine.master(str(src), str(dst), preset, report_path=None,
+                          out_subtype="PCM_24", dither=True, dither_seed=DITHER_SEED)
+            rendered, _ = sf.read(str(dst), dtype="float32", always_2d=True)
+            outputs[f"{signal_name}/master"] = rendered
+    return outputs
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Record or check golden fingerprints of engine renders.")
+    p.add_argument("command", choices=("record", "check"))
+    p.add_argument("--override", action="append", type=_parse_override, default=[], metavar="KEY=VALUE",
+                   help="Preset field or engine attribute to change for the candidate path (repeatable).")
+    p.add_argument("--only", default=None, help="Comma-separated stage names (and/or 'master') to render.")
+    p.add_argument("--preset", default=DEFAULT_PRESET)
+    p.add_argument("--golden", default=str(GOLDEN_PATH))
+    return p
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    only = {n.strip() for n in args.only.split(",")} if args.only else None
+    engine = load_engine()
+    base_preset = engine.get_presets()[args.preset]
+    golden_path = Path(args.golden)
+
+    with tempfile.TemporaryDirectory(prefix="auralmind-golden-") as tmp:
+        with applied(engine, base_preset, args.override) as preset:
+            candidate = render_corpus(engine, preset, only, Path(tmp))
+        reference = render_corpus(engine, base_preset, only, Path(tmp)) if args.override else {}
+
+    prints = {key: fingerprint(engine, y, CORPUS[key.split("/")[0]][1]) for key, y in candidate.items()}
+
+    if args.command == "record":
+        stored = json.loads(golden_path.read_text(encoding="utf-8")) if golden_path.is_file() else {}
+        stored.update(prints)
+        golden_path.parent.mkdir(parents=True, exist_ok=True)
+        golden_path.write_text(json.dumps(stored, sort_keys=True, separators=(",", ":")) + "\n", encoding="utf-8")
+        print(f"Recorded {len(prints)} fingerprints in {golden_path}")
+        return 0
+
+    if not golden_path.is_file():
+        print(f"No golden fingerprints at {golden_path}; run 'record' first.")
+        return 1
+    golden = json.loads(golden_path.read_text(encoding="utf-8"))
+    failures: List[str] = []
+    print(f"{'render':<50} {'dLUFS':>7} {'dTP':>7} {'dRMS':>7} {'dBand':>7} {'max err dBFS':>13}")
+    for key in sorted(prints):
+        if key not in golden:
+            print(f"{key:<50} (no golden entry)")
+            continue
+        deltas = compare_fingerprints(prints[key], golden[key])
+        if key in reference:
+            err = float(np.max(np.abs(candidate[key].astype(np.float64) - reference[key])))
+            deltas["max_sample_error_db"] = 20.0 * np.log10(err + 1e-12) if err > 0 else -240.0
+        err_col = f"{deltas['max_sample_error_db']:.1f}" if "max_sample_error_db" in deltas else "-"
+        print(f"{key:<50} {deltas.get('lufs', np.inf):>7.3f} {deltas.get('true_peak_db', np.inf):>7.3f} "
+              f"{deltas.get('block_rms_db', np.inf):>7.3f} {deltas.get('band_db', np.inf):>7.3f} {err_col:>13}")
+        for field, value in deltas.items():
+            if value > TOLERANCES.get(field, 0.0):
+                failures.append(f"{key}: {field} {value:.4f} exceeds {TOLERANCES.get(field, 0.0)}")
+    for line in failures:
+        print(f"MISMATCH {line}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
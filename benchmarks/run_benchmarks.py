@@ -0,0 +1,328 @@
+"""
+AuralMind DSP benchmark suite.
+
+Times each engine stage function and an end-to-end `master()` render on
+deterministic synthetic material (see signals.py), then compares the
+results with a stored baseline. Runs offline with only the engine's own
+dependencies.
+
+    python -m benchmarks.run_benchmarks                    # run and compare
+    python -m benchmarks.run_benchmarks --quick            # 5 s @ 48 kHz only
+    python -m benchmarks.run_benchmarks --only de_ess,master
+    python -m benchmarks.run_benchmarks --update-baseline  # record a new baseline
+
+Wall time is the median of `--repeat` runs. Memory is the peak traced
+allocation (tracemalloc, in a separate untimed run) for stage cases, and
+the peak RSS above the starting RSS for `master`, where tracemalloc's
+overhead on the per-sample limiter loop would make the run impractically
+slow. The exit status is 1 when any case regresses past `--threshold`
+(time) or `--memory-threshold` (memory) relative to the baseline.
+
+Baselines are machine-specific: record one per benchmark host and pass it
+with `--baseline`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import soundfile as sf
+
+try:
+    from .engine import engine_path, load_engine
+    from .signals import synth_program
+except ImportError:  # pragma: no cover - supports `python benchmarks/run_benchmarks.py`
+    from engine import engine_path, load_engine
+    from signals import synth_program
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+DEFAULT_BASELINE = BASELINE_DIR / "default.json"
+DEFAULT_PRESET = "hi_fi_streaming"
+# Timings below this many seconds are dominated by noise; never flag them.
+MIN_REGRESSION_DELTA_S = 0.02
+
+
+@dataclass
+class BenchInput:
+    """Everything a case needs, prepared outside the timed region."""
+
+    engine: Any
+    preset: Any
+    y: np.ndarray
+    sr: int
+    duration_s: float
+    workdir: Path
+
+    @property
+    def mono(self) -> np.ndarray:
+        return (0.5 * (self.y[:, 0] + self.y[:, 1])).astype(np.float32)
+
+    def fir(self) -> np.ndarray:
+        e, p = self.engine, self.preset
+        freqs, eq_db = e.match_eq_curve(
+            reference=None, target=self.y, sr=self.sr,
+            max_eq_db=p.max_eq_db, eq_smooth_hz=p.eq_smooth_hz,
+            match_strength=p.match_strength, hi_factor=p.hi_factor,
+        )
+        return e.design_fir_from_eq(freqs, eq_db, self.sr, p.fir_taps)
+
+
+# A case maps prepared input to the zero-argument callable that gets timed.
+Setup = Callable[[BenchInput], Callable[[], Any]]
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    setup: Setup
+    end_to_end: bool = False
+
+
+def _master_setup(b: BenchInput) -> Callable[[], Any]:
+    target = b.workdir / f"synth_{b.duration_s:g}s_{b.sr}.wav"
+    if not target.exists():
+        sf.write(str(target), b.y, b.sr, subtype="PCM_24")
+    out = b.workdir / "master_out.wav"
+    return lambda: b.engine.master(str(target), str(out), b.preset, report_path=None)
+
+
+def _fir_setup(apply: str) -> Setup:
+    def setup(b: BenchInput) -> Callable[[], Any]:
+        fir = b.fir()
+        if apply == "streaming":
+            return lambda: b.engine.apply_fir_streaming_overlap_save(b.y, fir, sr=b.sr, mode="same")
+        return lambda: b.engine.apply_fir(b.y, fir, b.sr, mode="same")
+    return setup
+
+
+def _mono_sub_setup(b: BenchInput) -> Callable[[], Any]:
+    f0 = b.engine.estimate_sub_fundamental_hz(b.y, b.sr)
+    return lambda: b.engine.mono_sub_v2(b.y, b.sr, f0, base_mix=b.preset.mono_sub_base_mix)
+
+
+CASES: Tuple[Case, ...] = (
+    Case("windowed_fft_mag", lambda b: (lambda m=b.mono: b.engine.windowed_fft_mag(m, 4096, 1024))),
+    Case("integrated_loudness_lufs", lambda b: (lambda: b.engine.integrated_loudness_lufs(b.y, b.sr))),
+    Case("true_peak_estimate", lambda b: (lambda: b.engine.true_peak_estimate(b.y, b.sr, oversample=4))),
+    Case("estimate_sub_fundamental_hz", lambda b: (lambda: b.engine.estimate_sub_fundamental_hz(b.y, b.sr))),
+    Case("mono_sub_v2", _mono_sub_setup),
+    Case("match_eq_curve", lambda b: (lambda: b.fir())),
+    Case("apply_fir", _fir_setup("auto")),
+    Case("apply_fir_streaming_overlap_save", _fir_setup("streaming")),
+    Case("apply_warmth_tilt", lambda b: (lambda: b.engine.apply_warmth_tilt(b.y, b.sr, amount=0.3))),
+    Case("dynamic_masking_eq", lambda b: (lambda: b.engine.dynamic_masking_eq(b.y, b.sr))),
+    Case("de_ess", lambda b: (lambda: b.engine.de_ess(b.y, b.sr))),
+    Case("harmonic_glow", lambda b: (lambda: b.engine.harmonic_glow(b.y, b.sr))),
+    Case("spatial_realism_enhancer", lambda b: (lambda: b.engine.spatial_realism_enhancer(b.y, b.sr))),
+    Case("microshift_widen_side", lambda b: (lambda: b.engine.microshift_widen_side(b.y, b.sr))),
+    Case("microdetail_recovery_side_high", lambda b: (lambda: b.engine.microdetail_recovery_side_high(b.y, b.sr))),
+    Case("movement_automation", lambda b: (lambda: b.engine.movement_automation(b.y, b.sr))),
+    Case("build_section_lift_mask", lambda b: (lambda: b.engine.build_section_lift_mask(b.y, b.sr))),
+    Case("hooklift", lambda b: (lambda: b.engine.hooklift(b.y, b.sr))),
+    Case("transient_sculpt", lambda b: (lambda: b.engine.transient_sculpt(b.y, b.sr))),
+    Case("softclip_oversampled", lambda b: (lambda: b.engine.softclip_oversampled(b.y, b.sr))),
+    Case("true_peak_limiter_v2", lambda b: (lambda: b.engine.true_peak_limiter_v2(b.y, b.sr))),
+    Case("peak_control_chain", lambda b: (lambda: b.engine.peak_control_chain(b.y, b.sr, b.preset))),
+    Case("master", _master_setup, end_to_end=True),
+)
+
+
+def case_key(name: str, duration_s: float, sr: int) -> str:
+    return f"{name}@{duration_s:g}s/{sr}"
+
+
+def _time_runs(fn: Callable[[], Any], repeat: int) -> List[float]:
+    runs = []
+    for _ in range(max(1, repeat)):
+        t = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t)
+    return runs
+
+
+def _traced_peak(fn: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return int(max(0, peak - base))
+
+
+def run_case(case: Case, b: BenchInput, repeat: int) -> Dict[str, Any]:
+    fn = case.setup(b)
+    if case.end_to_end:
+        sampler = b.engine.RssSampler()
+        sampler.start()
+        sampler.reset()
+        base = b.engine.current_rss_bytes() or 0
+        runs = _time_runs(fn, repeat)
+        peak = max(0, sampler.peak() - base)
+        sampler.stop()
+        method = "rss"
+    else:
+        fn()  # warm filter-design caches and lazy imports outside the timed runs
+        runs = _time_runs(fn, repeat)
+        peak = _traced_peak(fn)
+        method = "tracemalloc"
+    return {
+        "median_s": round(statistics.median(runs), 5),
+        "min_s": round(min(runs), 5),
+        "runs": len(runs),
+        "realtime_factor": round(statistics.median(runs) / b.duration_s, 5),
+        "peak_alloc_bytes": peak,
+        "memory_method": method,
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float,
+    memory_threshold: float,
+) -> List[str]:
+    """Return human-readable regressions of `results` against `baseline`."""
+    regressions = []
+    for key, res in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        slower = res["median_s"] - base["median_s"]
+        if slower > MIN_REGRESSION_DELTA_S and res["median_s"] > base["median_s"] * (1.0 + threshold):
+            regressions.append(
+                f"{key}: {res['median_s']:.4f}s vs baseline {base['median_s']:.4f}s "
+                f"(+{100.0 * slower / base['median_s']:.0f}%)"
+            )
+        base_mem = int(base.get("peak_alloc_bytes") or 0)
+        if base_mem and res["memory_method"] == base.get("memory_method") \
+                and res["peak_alloc_bytes"] > base_mem * (1.0 + memory_threshold):
+            regressions.append(
+                f"{key}: peak alloc {res['peak_alloc_bytes'] / 2**20:.1f} MiB vs baseline "
+                f"{base_mem / 2**20:.1f} MiB"
+            )
+    return regressions
+
+
+def host_info() -> Dict[str, Any]:
+    return {
+        "host": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or None,
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "engine": engine_path().name,
+        "recorded_at": dt.datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
+    }
+
+
+def _floats(text: str) -> List[float]:
+    return [float(v) for v in text.split(",") if v.strip()]
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Benchmark AuralMind engine stages on synthetic material.")
+    p.add_argument("--durations", default="10,30", help="Stage-case durations in seconds (comma separated).")
+    p.add_argument("--sample-rates", default="44100,48000", help="Stage-case sample rates (comma separated).")
+    p.add_argument("--e2e-durations", default="30", help="master() durations in seconds, rendered at 48 kHz.")
+    p.add_argument("--quick", action="store_true", help="Shortcut for --durations 5 --sample-rates 48000 --e2e-durations 5.")
+    p.add_argument("--only", default=None, help="Comma-separated case names to run.")
+    p.add_argument("--repeat", type=int, default=3, help="Timed runs per stage case (median is compared).")
+    p.add_argument("--e2e-repeat", type=int, default=1, help="Timed runs per master() case.")
+    p.add_argument("--preset", default=DEFAULT_PRESET)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON to compare with or update.")
+    p.add_argument("--update-baseline", action="store_true", help="Merge these results into the baseline file.")
+    p.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown (0.25 = 25%%).")
+    p.add_argument("--memory-threshold", type=float, default=0.25, help="Allowed relative growth in peak allocation.")
+    p.add_argument("--json", default=None, help="Also write this run's results to a JSON file.")
+    return p
+
+
+def _plan(args: argparse.Namespace) -> List[Tuple[Case, float, int]]:
+    if args.quick:
+        args.durations, args.sample_rates, args.e2e_durations = "5", "48000", "5"
+    wanted = {n.strip() for n in args.only.split(",")} if args.only else None
+    unknown = (wanted or set()) - {c.name for c in CASES}
+    if unknown:
+        raise SystemExit(f"Unknown case(s): {', '.join(sorted(unknown))}")
+    plan: List[Tuple[Case, float, int]] = []
+    for case in CASES:
+        if wanted is not None and case.name not in wanted:
+            continue
+        if case.end_to_end:
+            plan.extend((case, d, 48000) for d in _floats(args.e2e_durations))
+        else:
+            plan.extend((case, d, int(sr)) for d in _floats(args.durations) for sr in _floats(args.sample_rates))
+    return plan
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    plan = _plan(args)
+    engine = load_engine()
+    preset = engine.get_presets()[args.preset]
+
+    baseline_path = Path(args.baseline)
+    stored: Dict[str, Any] = {}
+    if baseline_path.is_file():
+        stored = json.loads(baseline_path.read_text(encoding="utf-8"))
+    baseline = stored.get("results", {})
+
+    results: Dict[str, Dict[str, Any]] = {}
+    signals: Dict[Tuple[float, int], np.ndarray] = {}
+    with tempfile.TemporaryDirectory(prefix="auralmind-bench-") as tmp:
+        print(f"{'case':<52} {'median s':>9} {'x RT':>7} {'peak MiB':>9} {'baseline':>9}")
+        for case, duration, sr in plan:
+            if (duration, sr) not in signals:
+                signals[(duration, sr)] = synth_program(duration, sr, seed=args.seed)
+            b = BenchInput(engine, preset, signals[(duration, sr)], sr, duration, Path(tmp))
+            repeat = args.e2e_repeat if case.end_to_end else args.repeat
+            key = case_key(case.name, duration, sr)
+            res = results[key] = run_case(case, b, repeat)
+            base = baseline.get(key, {}).get("median_s")
+            print(f"{key:<52} {res['median_s']:>9.4f} {res['realtime_factor']:>7.3f} "
+                  f"{res['peak_alloc_bytes'] / 2**20:>9.1f} {base if base is not None else '-':>9}", flush=True)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"meta": host_info(), "results": results}, indent=2), encoding="utf-8")
+
+    if args.update_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        merged = {"meta": host_info(), "results": {**baseline, **results}}
+        baseline_path.write_text(json.dumps(merged, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Baseline written to {baseline_path}")
+        return 0
+
+    if not baseline:
+        print(f"No baseline at {baseline_path}; run with --update-baseline to record one.")
+        return 0
+    if stored.get("meta", {}).get("host") not in (None, platform.node()):
+        print(f"Note: baseline was recorded on {stored['meta']['host']!r}, not this host.")
+    regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if regressions:
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%} time / {args.memory_threshold:.0%} memory.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -110,13 +110,41 @@ export async function fetchJobStatus(id, options = {}) {
   return await apiFetch(`/api/jobs/${id}`, options);
 }
 
+export async function fetchJobStatuses(ids, versions = {}, options = {}) {
+  return await apiFetch('/api/jobs/status', {
+    ...options,
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ ids, versions }),
+  });
+}
+
+export function subscribeJobEvents(id, { onStatus, onError } = {}) {
+  if (typeof EventSource === 'undefined') return null;
+  const source = new EventSource(buildApiUrl(`/api/jobs/${id}/events`));
+  source.addEventListener('status', (event) => {
+    try {
+      onStatus?.(JSON.parse(event.data));
+    } catch (_) {
+      // Ignore malformed frames; the next status event carries the full state.
+    }
+  });
+  // The server sends `end` once the job is terminal; closing stops auto-reconnect.
+  source.addEventListener('end', () => source.close());
+  source.onerror = (err) => onError?.(err);
+  return () => source.close();
+}
+
 export async function fetchReport(id) {
   return await apiFetch(`/api/jobs/${id}/report`);
 }
 
-export async function fetchLogs(id, lines = 50) {
-  const res = await apiFetch(`/api/jobs/${id}/logs?lines=${lines}`);
-  return await res.text();
+export async function fetchLogs(id, { lines = 50, since = null } = {}) {
+  const query = since === null ? `lines=${lines}` : `since=${since}`;
+  const res = await apiFetch(`/api/jobs/${id}/logs?${query}`);
+  const text = await res.text();
+  const offset = Number(res.headers.get('x-log-offset'));
+  return { text, offset: Number.isFinite(offset) ? offset : null };
 }
 
 export async function cancelJob(id) {
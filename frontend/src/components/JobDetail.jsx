@@ -6,6 +6,15 @@ function formatProgress(value) {
   return safe.toFixed(1);
 }
 
+const LOG_LINES = 80;
+
+function lastLines(text, count) {
+  const lines = text.split('\n');
+  const hasTrailingNewline = lines[lines.length - 1] === '';
+  const kept = lines.slice(-(count + (hasTrailingNewline ? 1 : 0)));
+  return kept.join('\n');
+}
+
 function formatEta(seconds) {
   if (!Number.isFinite(seconds) || seconds <= 0) return null;
   const total = Math.max(0, Math.round(seconds));
@@ -25,6 +34,8 @@ export default function JobDetail({ job }) {
   useEffect(() => {
     let cancelled = false;
     let inFlight = false;
+    // Byte offset for incremental log follow; null until the first tail read.
+    let logOffset = null;
 
     async function load({ initial = false } = {}) {
       if (inFlight) return;
@@ -36,11 +47,15 @@ export default function JobDetail({ job }) {
       try {
         const reportPromise =
           job.status === 'completed' ? fetchJobReport(job.id).catch(() => null) : Promise.resolve(null);
-        const logsPromise = fetchJobLogs(job.id, 80).catch(() => '');
+        const logsPromise = fetchJobLogs(job.id, { lines: LOG_LINES, since: logOffset }).catch(() => null);
         const [rep, log] = await Promise.all([reportPromise, logsPromise]);
         if (!cancelled) {
           setReport(rep?.report || null);
-          setLogs(log || '');
+          if (log) {
+            const following = logOffset !== null;
+            setLogs((prev) => (following ? lastLines(prev + log.text, LOG_LINES) : log.text));
+            logOffset = log.offset;
+          }
         }
       } catch (err) {
         if (!cancelled) setError(err.message || 'Failed to fetch details');
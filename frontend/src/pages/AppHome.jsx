@@ -1,7 +1,7 @@
 import React, { useEffect, useMemo, useState } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
 import { useAuth } from '../auth/AuthProvider.jsx';
-import { createJob, fetchJobStatus } from '../api.js';
+import { createJob, fetchJobStatuses, subscribeJobEvents } from '../api.js';
 import JobDetail from '../components/JobDetail.jsx';
 import JobList from '../components/JobList.jsx';
 import UploadPanel from '../components/UploadPanel.jsx';
@@ -30,47 +30,81 @@ export default function AppHome() {
 
   const pollingKey = useMemo(() => pollingIds.join('|'), [pollingIds]);
 
+  // Only the selected job streams over SSE: every EventSource pins one of the browser's
+  // ~6 connections per origin, which uploads and log/report fetches also need.
+  const streamId = useMemo(() => {
+    const selected = jobs.find((job) => job.id === selectedJobId);
+    return selected && ['queued', 'processing'].includes(selected.status) ? selected.id : null;
+  }, [jobs, selectedJobId]);
+
   useEffect(() => {
     if (pollingIds.length === 0) return undefined;
 
     let stopped = false;
-    let intervalId = null;
+    let timerId = null;
+    let pending = false;
     const controller = new AbortController();
+    const watched = new Set(pollingIds);
+    const versions = {};
+
+    function applyStatuses(statuses) {
+      const byId = new Map(statuses.map((job) => [job.id, job]));
+      setJobs((prevJobs) =>
+        prevJobs.map((job) => (byId.has(job.id) ? { ...job, ...byId.get(job.id) } : job))
+      );
+    }
 
     async function tick() {
-      if (stopped) return;
+      timerId = null;
+      if (stopped || watched.size === 0) return;
+      pending = true;
       try {
-        const statuses = await Promise.all(
-          pollingIds.map((jobId) => fetchJobStatus(jobId, { signal: controller.signal }))
-        );
+        // One batch request covers every other job; unchanged versions come back as ids only.
+        const batch = await fetchJobStatuses(Array.from(watched), versions, { signal: controller.signal });
         if (stopped) return;
-
-        const byId = new Map(statuses.map((job) => [job.id, job]));
-        setJobs((prevJobs) =>
-          prevJobs.map((job) => (byId.has(job.id) ? { ...job, ...byId.get(job.id) } : job))
-        );
-
-        const hasActive = statuses.some((job) => ['queued', 'processing'].includes(job.status));
-        if (!hasActive && intervalId) {
-          clearInterval(intervalId);
-          intervalId = null;
-        }
+        batch.jobs.forEach((job) => {
+          versions[job.id] = job.version;
+          if (!['queued', 'processing'].includes(job.status)) watched.delete(job.id);
+        });
+        batch.missing.forEach((jobId) => watched.delete(jobId));
+        applyStatuses(batch.jobs);
       } catch (pollError) {
         if (!stopped && pollError?.name !== 'AbortError') {
           console.error(pollError);
         }
+      } finally {
+        pending = false;
       }
+      if (!stopped && watched.size > 0) timerId = setTimeout(tick, 2000);
+    }
+
+    let unsubscribe = null;
+    if (streamId) {
+      unsubscribe = subscribeJobEvents(streamId, {
+        onStatus: (status) => applyStatuses([status]),
+        onError: () => {
+          // EventSource would retry forever; close it and poll the job with the others instead.
+          if (unsubscribe) unsubscribe();
+          unsubscribe = null;
+          if (stopped || watched.has(streamId)) return;
+          watched.add(streamId);
+          if (pending) return;
+          if (timerId) clearTimeout(timerId);
+          tick();
+        },
+      });
+      if (unsubscribe) watched.delete(streamId);
     }
 
     tick();
-    intervalId = setInterval(tick, 2000);
 
     return () => {
       stopped = true;
       controller.abort();
-      if (intervalId) clearInterval(intervalId);
+      if (timerId) clearTimeout(timerId);
+      if (unsubscribe) unsubscribe();
     };
-  }, [pollingKey]);
+  }, [pollingKey, streamId]);
 
   async function handleSubmit(formData, settings) {
     setJobSubmitting(true);